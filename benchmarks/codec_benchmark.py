@@ -0,0 +1,250 @@
+"""
+Image codec benchmark.
+
+Encodes a reference set of pages with every page encoder backend and
+setting (see src/core/image_codec.py) and reports, per codec and quality:
+
+1. Encode time (ms/page, median of the runs).
+2. Size (KB/page).
+3. SSIM of the decoded page against the source, as the adaptive quality
+   search measures it (mean and worst page). This is luma only.
+4. Chroma SSIM: the mean SSIM of the Cr and Cb planes of colour pages,
+   which is where chroma subsampling (4:2:0 vs 4:4:4) shows.
+
+The reference set is synthetic (dense text, sparse text, text over a
+colour illustration, grayscale text, a noisy photo-like page) plus, with
+--pages, real captured pages from a spool directory. PNG and lossless WebP
+are listed as lossless references; WebP cannot be embedded in a PDF, so it
+is not a page encoder.
+
+Usage:
+    python benchmarks/codec_benchmark.py [--pages SPOOL_DIR] [--limit 20]
+        [--quality 60 80 95] [--runs 3] [--min-ssim 0.98]
+
+For --min-ssim, the fastest and the smallest codec whose mean SSIM and
+chroma SSIM stay at or above it are printed; only codecs whose output can
+be embedded in a PDF are candidates. Exits with status 1 if no page could
+be loaded or a codec fails to encode.
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import cv2
+import numpy as np
+
+from src.core.adaptive_quality import SSIMReference
+from src.core.image_codec import encode_lossy
+from src.core.spool import load_spool
+from src.models.export import EncoderSettings
+
+PAGE_SIZE = (1200, 1600)  # Synthetic page size (width, height), a typical capture
+
+# Lossy page encoders: label -> settings
+LOSSY: Dict[str, EncoderSettings] = {
+    "opencv 4:2:0": EncoderSettings(),
+    "opencv 4:4:4": EncoderSettings(subsampling="444"),
+    "opencv progressive+optimize": EncoderSettings(progressive=True, optimize=True),
+    "pillow 4:2:0": EncoderSettings(codec="pillow"),
+    "pillow 4:4:4 optimize": EncoderSettings(codec="pillow", subsampling="444", optimize=True),
+    "jpeg2000": EncoderSettings(codec="jpeg2000"),
+}
+
+
+def _png(image: np.ndarray) -> Optional[bytes]:
+    ok, encoded = cv2.imencode('.png', image)
+    return encoded.tobytes() if ok else None
+
+
+def _webp_lossless(image: np.ndarray) -> Optional[bytes]:
+    ok, encoded = cv2.imencode('.webp', image, [cv2.IMWRITE_WEBP_QUALITY, 101])
+    return encoded.tobytes() if ok else None
+
+
+# Lossless references: label -> (encoder, whether PDF pages can embed its output)
+LOSSLESS: Dict[str, Tuple[Callable[[np.ndarray], Optional[bytes]], bool]] = {
+    "png (lossless)": (_png, True),
+    "webp lossless (not in PDF)": (_webp_lossless, False),
+}
+
+
+def _text(image: np.ndarray, lines: int, top: int, color=(25, 25, 25)):
+    """Draw lines of body text."""
+    for line in range(lines):
+        cv2.putText(image, f"Line {line} of body text over the page, lorem ipsum dolor sit",
+                    (80, top + line * 37), cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2, cv2.LINE_AA)
+
+
+def synthetic_pages() -> List[Tuple[str, np.ndarray]]:
+    """The synthetic part of the reference set."""
+    width, height = PAGE_SIZE
+    rng = np.random.default_rng(0)
+
+    dense = np.full((height, width, 3), 245, np.uint8)
+    _text(dense, 40, 80)
+
+    sparse = np.full((height, width, 3), 245, np.uint8)
+    cv2.putText(sparse, "Chapter One", (380, 700), cv2.FONT_HERSHEY_SIMPLEX, 2.0,
+                (25, 25, 25), 4, cv2.LINE_AA)
+
+    illustrated = np.full((height, width, 3), (236, 240, 244), np.uint8)
+    for _ in range(12):
+        center = (int(rng.integers(80, width - 80)), int(rng.integers(300, 1100)))
+        color = tuple(int(value) for value in rng.integers(0, 256, 3))
+        cv2.circle(illustrated, center, int(rng.integers(60, 260)), color, -1)
+    illustrated[300:1100] = cv2.GaussianBlur(illustrated[300:1100], (0, 0), 12)
+    cv2.putText(illustrated, "Chapter 7: The Heading", (80, 100), cv2.FONT_HERSHEY_DUPLEX,
+                1.6, (30, 30, 200), 3, cv2.LINE_AA)
+    _text(illustrated, 36, 160)
+
+    gray = np.full((height, width), 240, np.uint8)
+    _text(gray, 40, 80, color=20)
+
+    photo = cv2.GaussianBlur(rng.integers(0, 256, (height // 16, width // 16, 3), dtype=np.uint8),
+                             (0, 0), 1.5)
+    photo = cv2.resize(photo, PAGE_SIZE, interpolation=cv2.INTER_CUBIC)
+    photo = cv2.add(photo, rng.integers(0, 12, photo.shape, dtype=np.uint8))
+
+    return [("dense text", dense), ("sparse text", sparse), ("illustrated", illustrated),
+            ("grayscale text", gray), ("photo", photo)]
+
+
+def real_pages(spool: Path, limit: int) -> List[Tuple[str, np.ndarray]]:
+    """Captured pages from a spool directory (evenly sampled up to limit)."""
+    paths, _ = load_spool(spool)
+    if len(paths) > limit:
+        paths = [paths[index * len(paths) // limit] for index in range(limit)]
+    pages = []
+    for path in paths:
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if image is not None:
+            pages.append((path.name, image))
+    return pages
+
+
+class PreparedPage:
+    """A reference page with its luma and (for colour pages) chroma SSIM references."""
+
+    def __init__(self, name: str, image: np.ndarray):
+        self.name = name
+        self.image = image
+        if image.ndim == 2:
+            self.luma = SSIMReference(image)
+            self.chroma: List[SSIMReference] = []
+        else:
+            self.luma = SSIMReference(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+            ycrcb = cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)
+            self.chroma = [SSIMReference(np.ascontiguousarray(ycrcb[:, :, plane])) for plane in (1, 2)]
+
+    def chroma_ssim(self, decoded: np.ndarray) -> Optional[float]:
+        """Mean SSIM of the Cr and Cb planes, or None for a grayscale page."""
+        if not self.chroma:
+            return None
+        if decoded.ndim == 2:
+            decoded = cv2.cvtColor(decoded, cv2.COLOR_GRAY2BGR)  # The colour is lost entirely
+        ycrcb = cv2.cvtColor(decoded, cv2.COLOR_BGR2YCrCb)
+        return statistics.mean(reference.ssim(ycrcb[:, :, plane])
+                               for reference, plane in zip(self.chroma, (1, 2)))
+
+
+def measure(encode: Callable[[np.ndarray], Optional[bytes]],
+            pages: List[PreparedPage], runs: int) -> Optional[Dict[str, float]]:
+    """
+    Encode every page and measure time, size, SSIM and chroma SSIM.
+
+    Returns:
+        Figures per page, or None if an encode failed
+    """
+    times, sizes, scores, chroma_scores = [], [], [], []
+    for page in pages:
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            data = encode(page.image)
+            samples.append(time.perf_counter() - start)
+            if data is None:
+                return None
+        times.append(statistics.median(samples))
+        sizes.append(len(data))
+        decoded = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if decoded is None:
+            return None
+        chroma = page.chroma_ssim(decoded)
+        if chroma is not None:
+            chroma_scores.append(chroma)
+        if decoded.ndim == 3:
+            decoded = cv2.cvtColor(decoded, cv2.COLOR_BGR2GRAY)  # As the reference was converted
+        scores.append(page.luma.ssim(decoded))
+    return {"ms": statistics.mean(times) * 1000, "kb": statistics.mean(sizes) / 1024,
+            "ssim": statistics.mean(scores), "worst": min(scores),
+            "chroma": statistics.mean(chroma_scores) if chroma_scores else 1.0}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare page image encoders")
+    parser.add_argument("--pages", type=Path, help="Spool directory of real captured pages to add")
+    parser.add_argument("--limit", type=int, default=20, help="Real pages sampled from --pages")
+    parser.add_argument("--quality", type=int, nargs="+", default=[60, 80, 95],
+                        help="Qualities of the lossy codecs")
+    parser.add_argument("--runs", type=int, default=3, help="Encodes per page (median time)")
+    parser.add_argument("--min-ssim", type=float, default=0.98,
+                        help="Mean SSIM a codec must keep to be acceptable")
+    args = parser.parse_args()
+
+    pages = synthetic_pages()
+    if args.pages is not None:
+        pages += real_pages(args.pages, args.limit)
+    if not pages:
+        print("FAIL: no pages")
+        return 1
+    prepared = [PreparedPage(name, image) for name, image in pages]
+    print(f"Reference set: {len(pages)} pages ({', '.join(page.name for page in prepared[:5])}"
+          f"{', ...' if len(pages) > 5 else ''})\n")
+
+    # Rows of (label, figures, whether PDF pages can embed the encoder's output)
+    rows: List[Tuple[str, Dict[str, float], bool]] = []
+    failed = []
+    for label, settings in LOSSY.items():
+        for quality in args.quality:
+            result = measure(lambda image: encode_lossy(image, quality, settings), prepared, args.runs)
+            if result is None:
+                failed.append(f"{label} q{quality}")
+            else:
+                rows.append((f"{label} q{quality}", result, True))
+    for label, (encode, embeddable) in LOSSLESS.items():
+        result = measure(encode, prepared, args.runs)
+        if result is None:
+            failed.append(label)
+        else:
+            rows.append((label, result, embeddable))
+
+    print(f"{'codec':<36}{'ms/page':>9}{'KB/page':>10}{'SSIM':>8}{'worst':>8}{'chroma':>8}")
+    for label, result, _ in rows:
+        print(f"{label:<36}{result['ms']:9.1f}{result['kb']:10.1f}"
+              f"{result['ssim']:8.4f}{result['worst']:8.4f}{result['chroma']:8.4f}")
+
+    candidates = [(label, result) for label, result, encoder in rows if encoder]
+    acceptable = [(label, result) for label, result in candidates
+                  if result["ssim"] >= args.min_ssim and result["chroma"] >= args.min_ssim]
+    print(f"\nAcceptable PDF codecs (SSIM and chroma SSIM >= {args.min_ssim}): "
+          f"{len(acceptable)} of {len(candidates)}")
+    if acceptable:
+        fastest = min(acceptable, key=lambda row: row[1]["ms"])
+        smallest = min(acceptable, key=lambda row: row[1]["kb"])
+        print(f"  fastest:  {fastest[0]} ({fastest[1]['ms']:.1f} ms/page, {fastest[1]['kb']:.1f} KB/page)")
+        print(f"  smallest: {smallest[0]} ({smallest[1]['ms']:.1f} ms/page, {smallest[1]['kb']:.1f} KB/page)")
+
+    if failed:
+        print(f"FAIL: encoding failed: {', '.join(failed)}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+PDF structure benchmark.
+
+Writes the same synthetic book twice with PDFWriter: once with a classic
+cross-reference table, once with object streams and a cross-reference
+stream (PDF 1.5). Reports for each:
+
+1. File size, and the structural overhead (everything but image data).
+2. Open time: parsing the file and loading every page dictionary (page
+   count and page sizes, what a viewer needs to lay out its scroll bar),
+   with each PDF library that is installed (pikepdf, PyMuPDF, pypdf).
+
+The pages are tiny distinct grayscale images, so the PDF structure
+dominates, as it does relative to image data in the open path of a real
+book.
+
+Usage:
+    python benchmarks/pdf_structure_benchmark.py [--pages 5000] [--runs 3]
+
+Exits with status 1 if the object stream PDF is not smaller than the
+classic one.
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.pdf_writer import PDFImage, PDFWriter
+
+IMAGE_SIZE = (12, 16)  # Pixels per synthetic page (width, height)
+IMAGE_DPI = 2.0        # Makes the tiny images book-sized pages (432 x 576 pt)
+
+
+def synthetic_page(number: int) -> PDFImage:
+    """A small grayscale image unique to the page (so no images are shared)."""
+    width, height = IMAGE_SIZE
+    pixels = number.to_bytes(4, 'big') + bytes((number * 7 + i) % 256
+                                               for i in range(width * height - 4))
+    return PDFImage(data=zlib.compress(pixels), filter="FlateDecode",
+                    width=width, height=height, colorspace="DeviceGray")
+
+
+def write_book(path: Path, pages: int, object_streams: bool,
+               page_numbers: bool) -> Dict[str, float]:
+    """Write the synthetic book and return its size figures."""
+    start = time.perf_counter()
+    image_bytes = 0
+    with PDFWriter(path, title="Synthetic Book", dpi=IMAGE_DPI, page_numbers=page_numbers,
+                   page_labels=True, object_streams=object_streams) as writer:
+        for number in range(1, pages + 1):
+            image = synthetic_page(number)
+            image_bytes += len(image.data)
+            writer.add_page(image, number)
+    size = path.stat().st_size
+    return {"write_seconds": time.perf_counter() - start, "size": size,
+            "overhead": size - image_bytes}
+
+
+def _open_pikepdf(path: Path) -> int:
+    import pikepdf
+    with pikepdf.open(path) as pdf:
+        return sum(1 for page in pdf.pages if page.MediaBox)
+
+
+def _open_pymupdf(path: Path) -> int:
+    import fitz
+    with fitz.open(path) as pdf:
+        return sum(1 for page in pdf if page.rect)
+
+
+def _open_pypdf(path: Path) -> int:
+    import pypdf
+    reader = pypdf.PdfReader(path)
+    return sum(1 for page in reader.pages if page.mediabox)
+
+
+OPENERS: Dict[str, Callable[[Path], int]] = {
+    "pikepdf": _open_pikepdf,
+    "PyMuPDF": _open_pymupdf,
+    "pypdf": _open_pypdf,
+}
+
+
+def measure_open(opener: Callable[[Path], int], path: Path, pages: int,
+                 runs: int) -> Optional[float]:
+    """
+    Median time to open a PDF and load all its pages.
+
+    Returns:
+        Seconds, or None if the library is not installed
+
+    Raises:
+        RuntimeError: If the library sees the wrong number of pages
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            loaded = opener(path)
+        except ImportError:
+            return None
+        samples.append(time.perf_counter() - start)
+        if loaded != pages:
+            raise RuntimeError(f"{path.name}: loaded {loaded} of {pages} pages")
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare classic and object stream PDF structure")
+    parser.add_argument("--pages", type=int, default=5000, help="Pages in the synthetic book")
+    parser.add_argument("--runs", type=int, default=3, help="Opens per measurement (median)")
+    parser.add_argument("--page-numbers", action="store_true",
+                        help="Draw page numbers (adds a font and per-page text)")
+    args = parser.parse_args()
+
+    layouts = [("classic xref", False), ("object streams", True)]
+    results: List[Dict[str, float]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, object_streams in layouts:
+            path = Path(tmp) / f"book_{'objstm' if object_streams else 'classic'}.pdf"
+            result = write_book(path, args.pages, object_streams, args.page_numbers)
+            result["open"] = {name: measure_open(opener, path, args.pages, args.runs)
+                              for name, opener in OPENERS.items()}
+            results.append(result)
+
+    print(f"Synthetic book: {args.pages} pages")
+    for (label, _), result in zip(layouts, results):
+        print(f"\n{label}:")
+        print(f"  file size   {result['size'] / 1024:10.1f} KB")
+        print(f"  overhead    {result['overhead'] / 1024:10.1f} KB "
+              f"({result['overhead'] / args.pages:.0f} bytes/page)")
+        print(f"  write       {result['write_seconds'] * 1000:10.1f} ms")
+        for name, seconds in result["open"].items():
+            if seconds is None:
+                print(f"  open {name:<8} unavailable (not installed)")
+            else:
+                print(f"  open {name:<8}{seconds * 1000:9.1f} ms")
+
+    classic, compact = results
+    print(f"\nSize: {compact['size'] / classic['size']:.1%} of classic, "
+          f"overhead {compact['overhead'] / classic['overhead']:.1%}")
+    for name in OPENERS:
+        before, after = classic["open"][name], compact["open"][name]
+        if before is not None and after is not None:
+            print(f"Open time ({name}): {after / before:.1%} of classic")
+
+    if compact["size"] >= classic["size"]:
+        print("FAIL: object streams did not reduce the file size")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
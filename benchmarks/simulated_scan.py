@@ -0,0 +1,119 @@
+"""
+Simulated scan benchmark.
+
+Runs the real Scanner workflow against a simulated Kindle window and book,
+so no Windows, Kindle or display is needed.
+
+1. Throughput: a full auto-mode scan of a synthetic book on a VirtualClock.
+   Waits advance virtual time instantly, so the wall time measures only the
+   per-page processing cost. The scan must stop exactly at the last page.
+2. Stop latency: scans on the real clock are stopped during the countdown,
+   during a capture delay and during a settle probe. The time from
+   stop_scan() until the scan thread finishes is reported.
+
+Usage:
+    python benchmarks/simulated_scan.py [--pages 5000] [--max-stop-latency 0.1]
+
+Exits with status 1 if the page count is wrong or a stop takes longer than
+the allowed latency.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.scanner import Scanner
+from src.core.simulator import SimulatedBook, SimulatedWindowManager
+from src.models.config import Resolution, ScanConfig, ScanState
+from src.utils.clock import Clock, VirtualClock
+
+
+def make_scanner(workdir: Path, pages: int, clock, **config_overrides) -> Scanner:
+    """Build a scanner wired to a simulated book."""
+    book = SimulatedBook(pages, clock=clock)
+    config = ScanConfig(
+        resolution=Resolution.LOW,
+        output_path=workdir / "output",
+        temp_dir=workdir / "temp",
+        **config_overrides
+    )
+    return Scanner(config, window_manager=SimulatedWindowManager(book),
+                   capture_source=book, clock=clock)
+
+
+def run_throughput(pages: int, auto_tune: bool) -> bool:
+    """Scan a simulated book on virtual time and report throughput."""
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = VirtualClock()
+        scanner = make_scanner(Path(tmp), pages, clock, auto_tune_delay=auto_tune)
+
+        start = time.perf_counter()
+        scanner.start_scan()
+        scanner.scan_thread.join()
+        wall = time.perf_counter() - start
+
+        session = scanner.session
+        status = scanner.get_status()
+        label = "auto-tuned delay" if auto_tune else f"fixed {scanner.config.capture_speed}s delay"
+        print(f"Throughput ({label}):")
+        print(f"  state:            {session.state.value}")
+        print(f"  pages captured:   {session.pages_captured} / {pages}")
+        print(f"  no-op turns:      {session.noop_turns}")
+        print(f"  recaptures:       {session.recaptures}")
+        print(f"  wall time:        {wall:.2f} s ({wall / max(pages, 1) * 1000:.2f} ms/page)")
+        print(f"  simulated time:   {clock.now() / 60:.1f} min "
+              f"({status['pages_per_minute'] or 0:.1f} pages/min simulated)")
+        print(f"  capture delay:    {status['capture_delay']:.3f} s")
+
+        return session.state == ScanState.COMPLETE and session.pages_captured == pages
+
+
+def measure_stop_latency(stop_after: float, **config_overrides) -> float:
+    """Start a real-time scan, stop it after a delay and time the shutdown."""
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = Clock()
+        scanner = make_scanner(Path(tmp), 1000, clock, **config_overrides)
+        scanner.start_scan()
+
+        time.sleep(stop_after)
+        start = time.perf_counter()
+        scanner.stop_scan()
+        scanner.scan_thread.join(timeout=30)
+        latency = time.perf_counter() - start
+
+        if scanner.scan_thread.is_alive():
+            return float('inf')
+        return latency
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the scan workflow on a simulated book")
+    parser.add_argument("--pages", type=int, default=5000, help="Pages in the simulated book")
+    parser.add_argument("--max-stop-latency", type=float, default=0.1,
+                        help="Allowed seconds from stop_scan() to thread exit (default: 0.1)")
+    args = parser.parse_args()
+
+    ok = run_throughput(args.pages, auto_tune=False)
+    ok = run_throughput(args.pages, auto_tune=True) and ok
+
+    print("\nStop latency:")
+    scenarios = [
+        ("during countdown", 0.5, {}),
+        ("during capture delay", 6.6, {"capture_speed": 2.0}),
+        ("during settle probes", 6.6, {"auto_tune_delay": True}),
+    ]
+    for name, stop_after, overrides in scenarios:
+        latency = measure_stop_latency(stop_after, **overrides)
+        passed = latency <= args.max_stop_latency
+        ok = ok and passed
+        print(f"  {name:<22} {latency * 1000:8.1f} ms {'OK' if passed else 'FAIL'}")
+
+    print("\nOK" if ok else "\nFAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Startup benchmark for the AK Auto-Scanner GUI.
+
+Reports the cold import cost of each application and dependency module and
+the time from interpreter start to the first drawn main window. Every
+measurement runs in a fresh interpreter so module caches do not hide cost.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--budget 1.0] [--runs 3]
+
+Exits with status 1 if time-to-first-window exceeds the budget or if a heavy
+dependency was imported before the first scan.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Modules whose import cost is reported
+MODULES = [
+    "src.utils.logger",
+    "src.models.config",
+    "src.core.scanner",
+    "src.gui.main_window",
+    "tkinter",
+    "PIL.Image",
+    "numpy",
+    "cv2",
+    "skimage.metrics",
+    "pyautogui",
+    "pynput.keyboard",
+    "win32gui",
+]
+
+# Dependencies that must stay unloaded until a scan starts
+HEAVY_MODULES = ["cv2", "numpy", "skimage", "pyautogui", "pynput", "win32gui", "PIL"]
+
+IMPORT_SNIPPET = """
+import importlib, json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+try:
+    importlib.import_module({module!r})
+    print(json.dumps({{"seconds": time.perf_counter() - start}}))
+except Exception as e:
+    print(json.dumps({{"error": f"{{type(e).__name__}}: {{e}}"}}))
+"""
+
+WINDOW_SNIPPET = """
+import time
+start = time.perf_counter()
+import json, sys
+sys.path.insert(0, {root!r})
+from src.gui.main_window import MainWindow
+app = MainWindow()
+app.root.update()
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+app.root.destroy()
+print(json.dumps({{"seconds": elapsed, "heavy_loaded": heavy}}))
+"""
+
+
+def _run_snippet(code: str) -> dict:
+    """Run a snippet in a fresh interpreter and parse its JSON output."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, cwd=PROJECT_ROOT
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        error = result.stderr.strip().splitlines()
+        return {"error": error[-1] if error else f"exit code {result.returncode}"}
+    return json.loads(lines[-1])
+
+
+def measure_import(module: str, runs: int) -> dict:
+    """Measure the median cold import time of a module."""
+    samples = []
+    for _ in range(runs):
+        result = _run_snippet(IMPORT_SNIPPET.format(root=str(PROJECT_ROOT), module=module))
+        if "error" in result:
+            return result
+        samples.append(result["seconds"])
+    return {"seconds": statistics.median(samples)}
+
+
+def measure_first_window(runs: int) -> dict:
+    """Measure the median time-to-first-window of the main GUI."""
+    samples = []
+    heavy_loaded = []
+    for _ in range(runs):
+        result = _run_snippet(WINDOW_SNIPPET.format(root=str(PROJECT_ROOT), heavy=HEAVY_MODULES))
+        if "error" in result:
+            return result
+        samples.append(result["seconds"])
+        heavy_loaded = result["heavy_loaded"]
+    return {"seconds": statistics.median(samples), "heavy_loaded": heavy_loaded}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure GUI startup cost")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="Time-to-first-window budget in seconds (default: 1.0)")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Fresh interpreters per measurement (default: 3)")
+    args = parser.parse_args()
+
+    print("Import cost per module (cold, median):")
+    for module in MODULES:
+        result = measure_import(module, args.runs)
+        if "error" in result:
+            print(f"  {module:<24} unavailable ({result['error']})")
+        else:
+            print(f"  {module:<24} {result['seconds'] * 1000:8.1f} ms")
+
+    window = measure_first_window(args.runs)
+    if "error" in window:
+        print(f"\nTime to first window: unavailable ({window['error']})")
+        return 1
+
+    print(f"\nTime to first window: {window['seconds'] * 1000:.1f} ms "
+          f"(budget {args.budget * 1000:.0f} ms)")
+
+    ok = True
+    if window["heavy_loaded"]:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(window['heavy_loaded'])}")
+        ok = False
+    if window["seconds"] > args.budget:
+        print("FAIL: startup budget exceeded")
+        ok = False
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
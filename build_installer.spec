@@ -19,6 +19,7 @@ a = Analysis(
         'pynput.mouse',
         'cv2',
         'skimage',
+        'skimage.metrics',
         'win32gui',
         'win32con',
         'win32api',
@@ -0,0 +1,192 @@
+"""
+Scan a queue of books back to back.
+
+Usage:
+    python -m src.cli.batch batch.json [--workers 4] [--simulate PAGES]
+
+The batch file is a JSON object:
+
+    {
+      "workspace": "batch",              # Batch directory (default: batch)
+      "title_timeout": 600,              # Seconds to wait for each book (optional)
+      "defaults": {"resolution": "medium", "max_pages": 10000},
+      "jobs": [
+        {"name": "Book One", "book_title": "Book One", "config": {"direction": "japanese"}},
+        {"name": "Book Two"}
+      ]
+    }
+
+Job configs are ScanConfig options merged over the defaults. A job with a
+book_title waits until a Kindle window with that title is open. Progress
+is written to stdout as NDJSON: "progress" events tagged with the job name,
+a "job" record for every job state change, and a final "summary". Logs go
+to stderr.
+
+Exit codes:
+    0    all jobs complete
+    1    at least one job failed
+    2    invalid arguments or batch file
+    130  batch cancelled (Ctrl+C)
+"""
+import argparse
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from ..core.batch import BatchScheduler
+from ..models.batch import BatchJob, JobState
+from ..models.config import ScanConfig
+from ..utils.logger import logger, setup_logger
+from .scan import EXIT_CANCELLED, EXIT_COMPLETE, EXIT_CONFIG, EXIT_ERROR, emit
+
+
+def load_batch(path: Path) -> dict:
+    """
+    Read and validate a batch file.
+
+    Args:
+        path: Batch JSON file
+
+    Returns:
+        Dictionary with 'workspace', 'title_timeout' and 'jobs' (BatchJob list)
+
+    Raises:
+        ValueError: If the file or a job is invalid
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read batch file {path}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get('jobs'), list) or not data['jobs']:
+        raise ValueError("Batch file must be a JSON object with a non-empty 'jobs' list")
+
+    defaults = data.get('defaults', {})
+    jobs = []
+    for index, entry in enumerate(data['jobs'], start=1):
+        if not isinstance(entry, dict) or not entry.get('name'):
+            raise ValueError(f"Job {index} needs a 'name'")
+        try:
+            config = ScanConfig.from_dict({**defaults, **entry.get('config', {})})
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Job '{entry['name']}': {e}")
+        errors = config.validate()
+        if errors:
+            raise ValueError(f"Job '{entry['name']}': {'; '.join(errors)}")
+        jobs.append(BatchJob(name=entry['name'], config=config, book_title=entry.get('book_title')))
+
+    return {
+        'workspace': Path(data.get('workspace', 'batch')),
+        'title_timeout': data.get('title_timeout'),
+        'jobs': jobs,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.batch",
+        description="Scan a queue of books back to back, building PDFs while the next book captures"
+    )
+    parser.add_argument("batch_file", type=Path, help="Batch JSON file")
+    parser.add_argument("--workers", type=int, help="Encoder threads per PDF build (default: CPU count, max 8)")
+    parser.add_argument("--simulate", type=int, metavar="PAGES",
+                        help="Scan simulated books of PAGES pages on virtual time (no Kindle needed)")
+    return parser
+
+
+def create_scheduler(batch: dict, workers: Optional[int], simulate: Optional[int]) -> BatchScheduler:
+    """
+    Create the scheduler for real Kindle scans or simulated books.
+
+    Args:
+        batch: Loaded batch file
+        workers: Encoder threads per PDF build
+        simulate: Page count of each simulated book (None scans Kindle)
+
+    Returns:
+        Scheduler with all jobs queued
+    """
+    if simulate is None:
+        scheduler = BatchScheduler(batch['workspace'], build_workers=workers,
+                                   title_timeout=batch['title_timeout'])
+    else:
+        from ..core.scanner import Scanner
+        from ..core.simulator import SimulatedBook, SimulatedWindowManager
+        from ..utils.clock import VirtualClock
+
+        clock = VirtualClock()
+
+        def simulated_scanner(job, config):
+            book = SimulatedBook(simulate, clock=clock, direction=config.direction)
+            window_manager = SimulatedWindowManager(book, title=job.book_title or job.name)
+            return Scanner(config, window_manager=window_manager, capture_source=book, clock=clock)
+
+        scheduler = BatchScheduler(batch['workspace'], scanner_factory=simulated_scanner,
+                                   build_workers=workers, title_timeout=batch['title_timeout'],
+                                   clock=clock)
+
+    for job in batch['jobs']:
+        scheduler.add_job(job)
+    return scheduler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Batch entry point.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Exit status (see module docstring)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.simulate is not None and args.simulate < 1:
+        parser.error("--simulate must be at least 1")
+
+    setup_logger(console_stream=sys.stderr)
+
+    try:
+        batch = load_batch(args.batch_file)
+        scheduler = create_scheduler(batch, args.workers, args.simulate)
+    except ValueError as e:
+        logger.error(f"Invalid batch: {e}")
+        return EXIT_CONFIG
+
+    scheduler.progress_callback = lambda job, event: emit(
+        {"type": "progress", "job": job.name, **event.to_dict()}
+    )
+    scheduler.job_callback = lambda result: emit({"type": "job", **result.to_dict()})
+
+    # Run in a worker thread so Ctrl+C can stop the batch gracefully
+    finished = threading.Event()
+    runner = threading.Thread(target=lambda: (scheduler.run(), finished.set()), daemon=True)
+    runner.start()
+    while not finished.is_set() and runner.is_alive():
+        try:
+            finished.wait(timeout=0.5)
+        except KeyboardInterrupt:
+            logger.info("Interrupted - stopping batch")
+            scheduler.stop()
+    runner.join()
+
+    states = [result.state for result in scheduler.results]
+    if scheduler.cancel_token.is_cancelled:
+        exit_code = EXIT_CANCELLED
+    elif all(state == JobState.COMPLETE for state in states):
+        exit_code = EXIT_COMPLETE
+    else:
+        exit_code = EXIT_ERROR
+
+    emit({"type": "summary", "exit_code": exit_code, **scheduler.report.get('summary', {})})
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Rebuild PDFs from a kept page spool without rescanning.
+
+Usage:
+    python -m src.cli.rebuild SPOOL [-o OUTPUT] [--quality 80] [--crop auto]
+                              [--grayscale] [--split 200] [--workers 4]
+                              [--processes 4] [--profile NAME:OPTIONS ...]
+
+SPOOL is a session spool directory (temp/session_*) or its journal.json.
+Runs headless: no Windows, Kindle or display is needed.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..core.auto_crop import AutoCropper
+from ..core.pdf_generator import PDFGenerator
+from ..core.spool import load_spool
+from ..models.export import CHROMA_SUBSAMPLING, CODECS, EncoderSettings, ExportProfile
+from ..utils.lazy_import import lazy_import
+from ..utils.logger import logger, setup_logger
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+def parse_crop(value: str):
+    """
+    Parse the --crop argument.
+
+    Args:
+        value: "auto", "none" or "TOP,BOTTOM,LEFT,RIGHT" pixel bounds
+
+    Returns:
+        "auto", None or a (top, bottom, left, right) tuple
+    """
+    if value in ("auto", "none"):
+        return None if value == "none" else value
+    try:
+        top, bottom, left, right = (int(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected auto, none or TOP,BOTTOM,LEFT,RIGHT")
+    if not (0 <= top < bottom and 0 <= left < right):
+        raise argparse.ArgumentTypeError("crop bounds must satisfy 0 <= TOP < BOTTOM and 0 <= LEFT < RIGHT")
+    return top, bottom, left, right
+
+
+def parse_profile(value: str) -> ExportProfile:
+    """
+    Parse a --profile argument.
+
+    Args:
+        value: Profile spec, e.g. "mobile:quality=60,dpi=72,grayscale,split_pages=300"
+
+    Returns:
+        Export profile
+    """
+    try:
+        profile = ExportProfile.from_spec(value)
+    except (TypeError, ValueError) as e:
+        raise argparse.ArgumentTypeError(str(e))
+    errors = profile.validate()
+    if errors:
+        raise argparse.ArgumentTypeError("; ".join(errors))
+    return profile
+
+
+def measure_crop(pages: List[Path], sample_pages: int, padding: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Find a crop rectangle from the content of the first pages.
+
+    Args:
+        pages: Spooled pages in order
+        sample_pages: Pages to measure
+        padding: Pixels kept around the detected content
+
+    Returns:
+        Crop rectangle (top, bottom, left, right), or None if no content was found
+    """
+    samples = pages[:sample_pages]
+    cropper = AutoCropper(sample_pages=len(samples), padding=padding)
+    for page in samples:
+        gray = cv2.imdecode(np.fromfile(str(page), dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is not None:
+            cropper.observe(gray, page)
+    return cropper.rect
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.rebuild",
+        description="Rebuild PDFs from a kept page spool without rescanning"
+    )
+    parser.add_argument("spool", type=Path, help="Spool directory or its journal.json")
+    parser.add_argument("-o", "--output", type=Path,
+                        help="Output PDF (default: output/<spool name>.pdf)")
+    parser.add_argument("--title", help="PDF title (default: book title from the journal)")
+    parser.add_argument("--quality", type=int, default=95, help="JPEG quality 1-100 (default: 95)")
+    parser.add_argument("--crop", type=parse_crop, default=None,
+                        help="auto, none (default) or TOP,BOTTOM,LEFT,RIGHT pixel bounds")
+    parser.add_argument("--crop-samples", type=int, default=5,
+                        help="Pages measured by --crop auto (default: 5)")
+    parser.add_argument("--crop-padding", type=int, default=16,
+                        help="Pixels kept around content with --crop auto (default: 16)")
+    parser.add_argument("--lossless", action="store_true",
+                        help="Embed pages losslessly instead of as JPEG (--quality is ignored)")
+    parser.add_argument("--codec", choices=CODECS, default="opencv",
+                        help="Lossy encoder: OpenCV or Pillow JPEG, or JPEG 2000 (default: opencv)")
+    parser.add_argument("--subsampling", choices=CHROMA_SUBSAMPLING, default="420",
+                        help="JPEG chroma subsampling of colour pages (default: 420)")
+    parser.add_argument("--progressive", action="store_true", help="Write progressive JPEGs")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Optimize JPEG Huffman tables (a few percent smaller, slower)")
+    parser.add_argument("--ssim-floor", type=float, default=0.0, metavar="SSIM",
+                        help="Encode each page at the lowest JPEG quality (up to --quality) whose "
+                             "SSIM stays at or above SSIM, e.g. 0.98 (default: 0, off)")
+    parser.add_argument("--mrc", action="store_true",
+                        help="Encode pages with text as a sharp text mask over a "
+                             "low-resolution background (much smaller than plain JPEG)")
+    parser.add_argument("--linearize", action="store_true",
+                        help="Write linearized PDFs (fast web view)")
+    parser.add_argument("--object-streams", action="store_true",
+                        help="Write PDF 1.5 object streams and a compressed cross-reference "
+                             "stream (smaller and faster to open; not with --linearize)")
+    parser.add_argument("--page-numbers", action="store_true",
+                        help="Draw page numbers at the bottom of the pages")
+    parser.add_argument("--page-labels", action="store_true",
+                        help="Record page numbers as PDF page labels")
+    parser.add_argument("--keep-blank-images", action="store_true",
+                        help="Keep the image of blank pages instead of writing empty pages")
+    parser.add_argument("--grayscale", action="store_true", help="Encode pages in grayscale")
+    parser.add_argument("--split", type=int, metavar="PAGES",
+                        help="Write volumes of at most PAGES pages")
+    parser.add_argument("--workers", type=int, help="Parallel encoder threads (default: CPU count, max 8)")
+    parser.add_argument("--profile", type=parse_profile, action="append", dest="profiles",
+                        metavar="NAME:OPTIONS",
+                        help="Write one PDF per profile from a single decode pass, e.g. "
+                             "archive:quality=95 mobile:quality=60,dpi=72,grayscale "
+                             "(options: quality, grayscale, lossless, mrc, ssim_floor, codec, "
+                             "subsampling, progressive, optimize, dpi, split_pages)")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="Build PDF chunks (or --split volumes) in this many worker processes")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Rebuild entry point.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Exit status (0 = success, 1 = rebuild failed, 2 = invalid arguments)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.quality <= 100:
+        parser.error("--quality must be between 1 and 100")
+    if not 0 <= args.ssim_floor < 1:
+        parser.error("--ssim-floor must be at least 0 and below 1")
+    if args.split is not None and args.split < 1:
+        parser.error("--split must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.processes < 0:
+        parser.error("--processes must not be negative")
+    if args.lossless and args.mrc:
+        parser.error("--mrc cannot be combined with --lossless")
+    if args.linearize and args.object_streams:
+        parser.error("--object-streams cannot be combined with --linearize")
+    if not args.spool.exists():
+        parser.error(f"spool not found: {args.spool}")
+
+    setup_logger(console_stream=sys.stderr)
+
+    pages, journal = load_spool(args.spool)
+    if not pages:
+        logger.error(f"No pages found in {args.spool}")
+        return 1
+    logger.info(f"Rebuilding from {len(pages)} spooled pages")
+
+    crop = args.crop
+    if crop == "auto":
+        crop = measure_crop(pages, args.crop_samples, args.crop_padding)
+
+    spool_dir = args.spool if args.spool.is_dir() else args.spool.parent
+    output = args.output or Path("output") / f"{spool_dir.name}.pdf"
+    title = args.title or journal.get('title') or spool_dir.name
+
+    generator = PDFGenerator(quality=args.quality, grayscale=args.grayscale,
+                             crop=crop, workers=args.workers, processes=args.processes,
+                             lossless=args.lossless, blank_pages=not args.keep_blank_images,
+                             page_numbers=args.page_numbers, page_labels=args.page_labels,
+                             linearize=args.linearize, object_streams=args.object_streams,
+                             mrc=args.mrc, ssim_floor=args.ssim_floor,
+                             encoder=EncoderSettings(codec=args.codec, subsampling=args.subsampling,
+                                                     progressive=args.progressive,
+                                                     optimize=args.optimize))
+    if args.profiles:
+        exported = generator.export(pages, args.profiles, output.parent, output.stem, title)
+        outputs = [pdf_path for paths in exported.values() for pdf_path in paths]
+    elif args.split:
+        outputs = generator.split_pdf(pages, output.parent, pages_per_pdf=args.split,
+                                      name=output.stem, title=title)
+    else:
+        pdf_path = generator.create_pdf(pages, output, title=title)
+        outputs = [pdf_path] if pdf_path else []
+
+    if not outputs:
+        logger.error("Rebuild failed")
+        return 1
+
+    for pdf_path in outputs:
+        print(pdf_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+Headless scan runner with a newline-delimited JSON progress stream.
+
+Usage:
+    python -m src.cli.scan [--config scan.json] [--direction japanese]
+                           [--resolution medium] [--pages 0] [...]
+
+Every progress event is written to stdout as one JSON object per line
+({"type": "progress", ...}), followed by a final {"type": "summary", ...}
+line with the session statistics. Logs go to stderr.
+
+Exit codes:
+    0    scan complete
+    1    scan failed
+    2    invalid arguments or configuration
+    130  scan cancelled (Ctrl+C)
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from ..core.scanner import Scanner
+from ..models.config import ScanConfig, ScanState
+from ..models.export import CODECS
+from ..utils.logger import logger, setup_logger
+
+EXIT_COMPLETE = 0
+EXIT_ERROR = 1
+EXIT_CONFIG = 2
+EXIT_CANCELLED = 130
+
+EXIT_CODES = {
+    ScanState.COMPLETE: EXIT_COMPLETE,
+    ScanState.CANCELLED: EXIT_CANCELLED,
+}
+
+# max_pages used for "all pages" (same as the GUI)
+ALL_PAGES = 10000
+
+
+def emit(record: dict):
+    """Write one NDJSON record to stdout."""
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli.scan",
+        description="Run a scan without the GUI and stream progress as NDJSON"
+    )
+    parser.add_argument("--config", type=Path,
+                        help="JSON file of ScanConfig options (flags override it)")
+    parser.add_argument("--direction", choices=["japanese", "western"])
+    parser.add_argument("--resolution", choices=["low", "medium", "high"])
+    parser.add_argument("--speed", type=float, dest="capture_speed",
+                        help="Seconds to wait after each page turn")
+    parser.add_argument("--auto-tune", action="store_const", const=True, dest="auto_tune_delay",
+                        help="Learn the capture delay from observed settle times")
+    parser.add_argument("--pages", type=int,
+                        help="Pages to scan (0 = whole book, auto-detect the end)")
+    parser.add_argument("--quality", type=int, dest="pdf_quality", help="JPEG quality 1-100")
+    parser.add_argument("--codec", choices=CODECS, dest="pdf_codec",
+                        help="Lossy page encoder (opencv, pillow or jpeg2000)")
+    parser.add_argument("--ssim-floor", type=float, dest="pdf_ssim_floor",
+                        help="Per-page JPEG quality: the lowest (up to --quality) keeping this SSIM")
+    parser.add_argument("--lossless", action="store_const", const=True, dest="pdf_lossless",
+                        help="Embed pages losslessly instead of as JPEG")
+    parser.add_argument("--mrc", action="store_const", const=True, dest="pdf_mrc",
+                        help="Encode pages with text as a text mask over a low-resolution background")
+    parser.add_argument("--page-numbers", action="store_const", const=True, dest="pdf_page_numbers",
+                        help="Draw page numbers on the PDF pages")
+    parser.add_argument("--auto-crop", action="store_const", const=True, dest="auto_crop",
+                        help="Crop page margins automatically")
+    parser.add_argument("--keep-spool", action="store_const", const=True, dest="keep_spool",
+                        help="Keep captured pages for offline rebuilds")
+    parser.add_argument("--output-dir", type=Path, dest="output_path", help="PDF output directory")
+    parser.add_argument("--temp-dir", type=Path, dest="temp_dir", help="Screenshot spool directory")
+    parser.add_argument("--simulate", type=int, metavar="PAGES",
+                        help="Scan a simulated book of PAGES pages on virtual time (no Kindle needed)")
+    return parser
+
+
+def load_config(args: argparse.Namespace) -> ScanConfig:
+    """
+    Build the scan configuration from the config file and flags.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Scan configuration
+
+    Raises:
+        ValueError: If the config file or an option is invalid
+    """
+    data = {}
+    if args.config is not None:
+        try:
+            with open(args.config, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"Cannot read config file {args.config}: {e}")
+        if not isinstance(data, dict):
+            raise ValueError(f"Config file {args.config} must contain a JSON object")
+
+    options = ["direction", "resolution", "capture_speed", "auto_tune_delay", "pdf_quality",
+               "pdf_codec", "pdf_ssim_floor", "pdf_lossless", "pdf_mrc", "pdf_page_numbers", "auto_crop", "keep_spool", "output_path", "temp_dir"]
+    for name in options:
+        value = getattr(args, name)
+        if value is not None:
+            data[name] = value
+    if args.pages is not None:
+        data["max_pages"] = args.pages if args.pages > 0 else ALL_PAGES
+
+    return ScanConfig.from_dict(data)
+
+
+def create_scanner(config: ScanConfig, simulate: Optional[int] = None) -> Scanner:
+    """
+    Create a scanner for the real Kindle window or a simulated book.
+
+    Args:
+        config: Scan configuration
+        simulate: Page count of a simulated book (None scans Kindle)
+
+    Returns:
+        Scanner
+    """
+    if simulate is None:
+        return Scanner(config)
+
+    from ..core.simulator import SimulatedBook, SimulatedWindowManager
+    from ..utils.clock import VirtualClock
+
+    clock = VirtualClock()
+    book = SimulatedBook(simulate, clock=clock, direction=config.direction)
+    return Scanner(config, window_manager=SimulatedWindowManager(book),
+                   capture_source=book, clock=clock)
+
+
+def run_scan(scanner: Scanner) -> int:
+    """
+    Run a scan to completion, streaming its progress events.
+
+    Events are written from the scan thread's progress callback, so none
+    are coalesced away. Ctrl+C stops the scan gracefully; the stream
+    continues until the session ends.
+
+    Args:
+        scanner: Configured scanner
+
+    Returns:
+        Exit code for the session outcome
+    """
+    wall_start = time.perf_counter()
+    finished = threading.Event()
+
+    def on_progress(event):
+        record = {"type": "progress", **event.to_dict()}
+        record["elapsed"] = round(time.perf_counter() - wall_start, 3)
+        emit(record)
+        if event.is_terminal:
+            finished.set()
+
+    if not scanner.start_scan(on_progress):
+        emit({"type": "error", "message": "Scan could not be started"})
+        return EXIT_ERROR
+
+    # Event.wait (unlike Thread.join) can be interrupted by Ctrl+C safely
+    while not finished.is_set() and scanner.scan_thread.is_alive():
+        try:
+            finished.wait(timeout=0.5)
+        except KeyboardInterrupt:
+            logger.info("Interrupted - stopping scan")
+            scanner.stop_scan()
+    scanner.scan_thread.join()
+
+    status = scanner.get_status()
+    exit_code = EXIT_CODES.get(scanner.session.state, EXIT_ERROR)
+    emit({
+        "type": "summary",
+        "exit_code": exit_code,
+        "wall_seconds": round(time.perf_counter() - wall_start, 3),
+        **status
+    })
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Headless scan entry point.
+
+    Args:
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Exit status (see module docstring)
+    """
+    args = build_parser().parse_args(argv)
+    setup_logger(console_stream=sys.stderr)
+
+    try:
+        config = load_config(args)
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid configuration: {e}")
+        return EXIT_CONFIG
+
+    errors = config.validate()
+    if args.simulate is not None and args.simulate < 1:
+        errors.append("Simulated book must have at least 1 page")
+    if errors:
+        logger.error(f"Invalid configuration: {'; '.join(errors)}")
+        return EXIT_CONFIG
+
+    return run_scan(create_scanner(config, args.simulate))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
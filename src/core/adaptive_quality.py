@@ -0,0 +1,235 @@
+"""
+Per-page JPEG quality chosen to keep a structural similarity (SSIM) floor.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from ..models.export import EncoderSettings
+from ..utils.lazy_import import lazy_import
+from .image_codec import encode_lossy
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+ADAPTIVE_MIN_QUALITY = 20      # Lowest JPEG quality tried
+SSIM_WINDOW = 7                # Local statistics window (pixels), as skimage's default
+SSIM_CONTENT_VARIANCE = 16.0   # Windows flatter than this (blank paper) are not scored
+CLASS_REDUCE = 8               # Page classification works on a 1/8 scale copy
+CLASS_INK_BUCKETS = (0.01, 0.05, 0.15)      # Fraction of dark pixels
+CLASS_MIDTONE_BUCKETS = (0.02, 0.1, 0.3)    # Fraction of mid-tone pixels (pictures, shading)
+PROBE_EVERY = 4                # Every 4th page passing at its class's quality also tries lower
+PROBE_STEP = 5                 # Quality step of that try
+
+
+class SSIMReference:
+    """
+    A source page prepared for SSIM comparisons.
+
+    The source's local means and variances are computed once and reused
+    for every candidate encoding. The score is the mean SSIM over the
+    windows with content: on a page that is mostly blank paper, a whole
+    page mean would hide damaged text.
+    """
+
+    C1 = (0.01 * 255) ** 2
+    C2 = (0.03 * 255) ** 2
+
+    def __init__(self, gray: "np.ndarray"):
+        """
+        Args:
+            gray: Grayscale source page
+        """
+        self.source = gray.astype(np.float32)
+        self.mean = self._window(self.source)
+        self.variance = self._window(self.source * self.source) - self.mean * self.mean
+        self.content = self.variance > SSIM_CONTENT_VARIANCE
+        if not self.content.any():
+            self.content = None  # Nothing but paper: score the whole page
+
+    @staticmethod
+    def _window(image: "np.ndarray") -> "np.ndarray":
+        """Local mean over the SSIM window."""
+        return cv2.blur(image, (SSIM_WINDOW, SSIM_WINDOW))
+
+    def ssim(self, decoded: "np.ndarray") -> float:
+        """
+        Mean SSIM of a decoded candidate against the source.
+
+        Args:
+            decoded: Grayscale decoded page (same size as the source)
+
+        Returns:
+            SSIM (1.0 = identical)
+        """
+        other = decoded.astype(np.float32)
+        mean = self._window(other)
+        variance = self._window(other * other) - mean * mean
+        covariance = self._window(self.source * other) - self.mean * mean
+        score = (((2 * self.mean * mean + self.C1) * (2 * covariance + self.C2))
+                 / ((self.mean * self.mean + mean * mean + self.C1)
+                    * (self.variance + variance + self.C2)))
+        return float(score[self.content].mean() if self.content is not None else score.mean())
+
+
+def page_class(image: "np.ndarray") -> Tuple:
+    """
+    Coarse page class: pages of one class tend to need the same quality.
+
+    Args:
+        image: BGR or grayscale page image
+
+    Returns:
+        Hashable class key (size, colour, ink and mid-tone buckets)
+    """
+    height, width = image.shape[:2]
+    small = cv2.resize(image, (max(width // CLASS_REDUCE, 1), max(height // CLASS_REDUCE, 1)),
+                       interpolation=cv2.INTER_AREA)
+    gray = small if small.ndim == 2 else cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    ink = float(np.count_nonzero(gray < 96)) / gray.size
+    midtone = float(np.count_nonzero((gray >= 96) & (gray < 208))) / gray.size
+    return (width, height, image.ndim,
+            sum(ink > edge for edge in CLASS_INK_BUCKETS),
+            sum(midtone > edge for edge in CLASS_MIDTONE_BUCKETS))
+
+
+class QualityCache:
+    """
+    Quality chosen per page class, shared by the encoder threads of one build.
+
+    The first page of a class is searched; later pages of the class are
+    encoded once at the cached quality and only searched (from there
+    upwards) if that misses the floor, which raises the class's quality.
+    Every PROBE_EVERY-th page that passes also tries PROBE_STEP lower, so
+    one hard page does not keep the class's quality up for the rest of
+    the book.
+    """
+
+    def __init__(self):
+        self._qualities: Dict[Tuple, int] = {}
+        self._hits: Dict[Tuple, int] = {}
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.searches = 0
+        self.probes = 0
+        self.quality_sum = 0
+
+    def get(self, key: Tuple) -> Optional[int]:
+        """Cached quality of a page class."""
+        with self._lock:
+            return self._qualities.get(key)
+
+    def probe_due(self, key: Tuple) -> bool:
+        """
+        Count a page of a class that passed at the cached quality.
+
+        Args:
+            key: Page class
+
+        Returns:
+            True if the page should also try a lower quality
+        """
+        with self._lock:
+            hits = self._hits.get(key, 0) + 1
+            self._hits[key] = hits
+            if hits % PROBE_EVERY:
+                return False
+            self.probes += 1
+            return True
+
+    def record(self, key: Tuple, quality: int, searched: bool):
+        """
+        Record the quality a page was encoded at.
+
+        The quality becomes the class's cached quality: higher after a
+        search from a missed cached quality, lower after a successful probe.
+
+        Args:
+            key: Page class
+            quality: Chosen quality
+            searched: Whether the page needed a search
+        """
+        with self._lock:
+            self.pages += 1
+            self.quality_sum += quality
+            if searched:
+                self.searches += 1
+            self._qualities[key] = quality
+
+    def summary(self) -> str:
+        """One-line statistics for the log."""
+        with self._lock:
+            if not self.pages:
+                return "no pages"
+            return (f"{self.pages} pages, mean quality {self.quality_sum / self.pages:.0f}, "
+                    f"{len(self._qualities)} page classes, {self.searches} searches, "
+                    f"{self.probes} probes")
+
+
+def adaptive_jpeg(image: "np.ndarray", max_quality: int, floor: float,
+                  cache: Optional[QualityCache] = None,
+                  settings: Optional[EncoderSettings] = None) -> Optional[bytes]:
+    """
+    Encode a page at the lowest JPEG quality whose SSIM stays at or above a floor.
+
+    The quality search works the same with the other lossy codecs (see
+    encode_lossy()).
+
+    Binary search over qualities from ADAPTIVE_MIN_QUALITY to max_quality
+    (SSIM grows with quality). With a cache, a page whose class already
+    has a quality is tried at that quality first (and now and then one
+    step lower, see QualityCache).
+
+    Args:
+        image: BGR or grayscale page image
+        max_quality: Highest quality allowed (used if no quality reaches the floor)
+        floor: Minimum SSIM of the decoded page (0-1)
+        cache: Quality per page class, shared across pages
+        settings: Lossy encoder (default: OpenCV JPEG)
+
+    Returns:
+        Encoded data, or None if encoding failed
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    reference = SSIMReference(gray)
+    encoded: Dict[int, bytes] = {}
+
+    def passes(quality: int) -> bool:
+        data = encode_lossy(image, quality, settings)
+        if data is None:
+            raise ValueError(f"Encoding failed at quality {quality}")
+        encoded[quality] = data
+        decoded = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if decoded is None:
+            raise ValueError(f"Encoded page at quality {quality} cannot be decoded")
+        return reference.ssim(decoded) >= floor
+
+    try:
+        low = ADAPTIVE_MIN_QUALITY
+        key = page_class(image) if cache is not None else None
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None and cached <= max_quality:
+            if passes(cached):
+                quality = cached
+                lower = max(cached - PROBE_STEP, ADAPTIVE_MIN_QUALITY)
+                if lower < cached and cache.probe_due(key) and passes(lower):
+                    quality = lower
+                cache.record(key, quality, searched=False)
+                return encoded[quality]
+            low = cached + 1
+
+        high = max_quality
+        while low < high:
+            middle = (low + high) // 2
+            if passes(middle):
+                high = middle
+            else:
+                low = middle + 1
+        if high not in encoded:
+            passes(high)
+
+        if cache is not None:
+            cache.record(key, high, searched=True)
+        return encoded[high]
+
+    except ValueError:
+        return None
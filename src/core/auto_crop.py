@@ -0,0 +1,202 @@
+"""
+Content-aware auto-crop learned from the first pages of a scan.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.lazy_import import lazy_import
+from ..utils.logger import logger
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+class AutoCropper:
+    """
+    Finds the text area of the book and crops every page to it.
+
+    The content bounding box is measured on the first sample pages with
+    row/column projections: pixels that differ from the page background
+    are counted per row and per column, and the outermost rows/columns with
+    content bound the box. The union over all samples (plus padding) is
+    locked for the rest of the session, so every page gets the same size
+    and cropping is a plain array slice with no copy.
+    """
+
+    CONTENT_THRESHOLD = 40   # Difference from background (0-255) counted as content
+    MIN_CONTENT_PIXELS = 2   # Rows/columns with fewer content pixels are noise
+
+    def __init__(self, sample_pages: int = 5, padding: int = 16):
+        """
+        Initialize auto-cropper.
+
+        Args:
+            sample_pages: Pages measured before the crop rectangle is locked
+            padding: Pixels kept around the detected content
+        """
+        self.sample_pages = sample_pages
+        self.padding = padding
+
+        # Crop rectangle (top, bottom, left, right) in captured-frame pixels
+        self.rect: Optional[Tuple[int, int, int, int]] = None
+        self.locked = False
+
+        self._frame_shape: Optional[Tuple[int, int]] = None
+        self._scaled_rects: Dict[float, Tuple[int, int, int, int]] = {}
+        self._bbox: Optional[Tuple[int, int, int, int]] = None
+        self._samples_seen = 0
+        self._sample_paths: List[Path] = []
+
+    @property
+    def sampling(self) -> bool:
+        """Whether pages are still being measured."""
+        return not self.locked
+
+    @property
+    def frame_shape(self) -> Optional[Tuple[int, int]]:
+        """Size (height, width) of the frames the crop rectangle was measured on."""
+        return self._frame_shape
+
+    def content_bbox(self, gray: "np.ndarray") -> Optional[Tuple[int, int, int, int]]:
+        """
+        Find the bounding box of page content.
+
+        The background level is taken from the frame border, so light,
+        sepia and dark reading themes all work.
+
+        Args:
+            gray: Grayscale frame
+
+        Returns:
+            Tuple of (top, bottom, left, right) (bottom/right exclusive),
+            or None if the frame is blank
+        """
+        border = np.concatenate((gray[0], gray[-1], gray[:, 0], gray[:, -1]))
+        background = int(np.median(border))
+
+        mask = cv2.absdiff(gray, np.full_like(gray, background)) > self.CONTENT_THRESHOLD
+        rows = np.flatnonzero(np.count_nonzero(mask, axis=1) >= self.MIN_CONTENT_PIXELS)
+        cols = np.flatnonzero(np.count_nonzero(mask, axis=0) >= self.MIN_CONTENT_PIXELS)
+        if rows.size == 0 or cols.size == 0:
+            return None
+
+        return int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1
+
+    def observe(self, gray: "np.ndarray", image_path: Path) -> bool:
+        """
+        Measure a sample page and lock the crop once enough pages were seen.
+
+        Args:
+            gray: Grayscale version of the captured (unscaled) frame
+            image_path: Spool file the page was saved to (re-cropped on lock)
+
+        Returns:
+            True if this page locked the crop rectangle
+        """
+        if self.locked:
+            return False
+
+        height, width = gray.shape[:2]
+        if self._frame_shape != (height, width):
+            # Window size changed: earlier measurements no longer apply
+            self._frame_shape = (height, width)
+            self._bbox = None
+
+        bbox = self.content_bbox(gray)
+        if bbox is not None:
+            if self._bbox is None:
+                self._bbox = bbox
+            else:
+                top, bottom, left, right = self._bbox
+                self._bbox = (min(top, bbox[0]), max(bottom, bbox[1]),
+                              min(left, bbox[2]), max(right, bbox[3]))
+
+        self._samples_seen += 1
+        self._sample_paths.append(image_path)
+
+        if self._samples_seen < self.sample_pages:
+            return False
+
+        self.locked = True
+        if self._bbox is not None:
+            top, bottom, left, right = self._bbox
+            pad = self.padding
+            self.rect = (max(top - pad, 0), min(bottom + pad, height),
+                         max(left - pad, 0), min(right + pad, width))
+            saved = 1 - ((self.rect[1] - self.rect[0]) * (self.rect[3] - self.rect[2])) / (height * width)
+            logger.info(f"Auto-crop locked: rows {self.rect[0]}-{self.rect[1]}, "
+                       f"cols {self.rect[2]}-{self.rect[3]} of {width}x{height} "
+                       f"({saved:.0%} of pixels removed)")
+        else:
+            logger.info("Auto-crop found no content on sample pages - cropping disabled")
+        return True
+
+    def crop(self, frame: "np.ndarray", scale: float = 1.0) -> "np.ndarray":
+        """
+        Crop a frame to the locked rectangle.
+
+        Args:
+            frame: Frame to crop
+            scale: Size of the frame relative to the measured frame
+
+        Returns:
+            View of the cropped area (the frame itself if no crop is locked)
+        """
+        if self.rect is None:
+            return frame
+        top, bottom, left, right = self.scaled_rect(scale)
+        return frame[top:bottom, left:right]
+
+    def scaled_rect(self, scale: float = 1.0) -> Optional[Tuple[int, int, int, int]]:
+        """
+        The locked rectangle in a frame scaled by scale.
+
+        Offsets and sizes are truncated as the resolution scaling truncates
+        frame sizes, so a page cropped and then scaled has the same size as
+        a scaled page cropped with the scaled rectangle. Computed once per
+        scale.
+
+        Args:
+            scale: Size of the frame relative to the measured frame
+
+        Returns:
+            Tuple of (top, bottom, left, right), or None if no crop is locked
+        """
+        if self.rect is None:
+            return None
+        rect = self._scaled_rects.get(scale)
+        if rect is None:
+            top, bottom, left, right = self.rect
+            scaled_top, scaled_left = int(top * scale), int(left * scale)
+            rect = (scaled_top, scaled_top + int((bottom - top) * scale),
+                    scaled_left, scaled_left + int((right - left) * scale))
+            self._scaled_rects[scale] = rect
+        return rect
+
+    def recrop_samples(self, scale: float = 1.0) -> int:
+        """
+        Crop the sample pages already written to the spool.
+
+        Args:
+            scale: Size of the saved pages relative to the measured frame
+
+        Returns:
+            Number of files rewritten
+        """
+        rewritten = 0
+        if self.rect is not None:
+            for path in self._sample_paths:
+                try:
+                    if not path.exists():
+                        continue  # Removed as a duplicate
+                    image = cv2.imdecode(np.fromfile(str(path), dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+                    if image is None:
+                        continue
+                    ok, encoded = cv2.imencode(path.suffix, self.crop(image, scale))
+                    if ok:
+                        encoded.tofile(str(path))
+                        rewritten += 1
+                except Exception as e:
+                    logger.error(f"Error re-cropping sample page {path}: {e}")
+        self._sample_paths.clear()
+        return rewritten
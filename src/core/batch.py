@@ -0,0 +1,278 @@
+"""
+Queued multi-book scanning with overlapped PDF builds.
+"""
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from ..models.batch import BatchJob, JobResult, JobState
+from ..models.config import ScanConfig, ScanState
+from ..models.progress import ProgressEvent
+from ..utils.cancellation import CancellationToken
+from ..utils.clock import Clock
+from ..utils.json_store import JsonStore
+from ..utils.logger import logger
+from .pdf_generator import PDFGenerator
+from .scanner import Scanner
+
+
+class BatchScheduler:
+    """
+    Runs scan jobs back to back, keeping the capture device busy.
+
+    Each job gets its own workspace (root/<job>/spool and root/<job>/output)
+    and its own ScanConfig. Jobs capture with build_pdf off, so a scan ends
+    as soon as the last page is spooled; the PDF is then built on a
+    background thread while the next job is already capturing. Learned
+    delay profiles and scan history are shared across jobs in root.
+
+    Per-job timings and throughput are written to root/batch_report.json
+    after every state change.
+    """
+
+    TITLE_POLL_INTERVAL = 1.0  # Seconds between checks for the next book
+
+    def __init__(self, root: Path,
+                 scanner_factory: Optional[Callable[[BatchJob, ScanConfig], Scanner]] = None,
+                 build_workers: Optional[int] = None,
+                 title_timeout: Optional[float] = None,
+                 clock: Optional[Clock] = None):
+        """
+        Initialize batch scheduler.
+
+        Args:
+            root: Batch directory holding the job workspaces and report
+            scanner_factory: Creates the scanner for a job (default: Scanner(config))
+            build_workers: Encoder threads per PDF build (default: CPU count, max 8)
+            title_timeout: Seconds to wait for a job's book to be opened (None waits forever)
+            clock: Clock for waits and timings (real time if None)
+        """
+        self.root = Path(root)
+        self.scanner_factory = scanner_factory or (lambda job, config: Scanner(config))
+        self.build_workers = build_workers
+        self.title_timeout = title_timeout
+        self.clock = clock or Clock()
+        self.cancel_token = CancellationToken(self.clock)
+
+        self.jobs: List[BatchJob] = []
+        self.results: List[JobResult] = []
+        self.current_scanner: Optional[Scanner] = None
+
+        # Callbacks: progress events of the capturing job, and job state changes
+        self.progress_callback: Optional[Callable[[BatchJob, ProgressEvent], None]] = None
+        self.job_callback: Optional[Callable[[JobResult], None]] = None
+
+        self.report = JsonStore(self.root / "batch_report.json")
+        self._report_lock = threading.Lock()
+        self._started_at: Optional[float] = None
+
+    def add_job(self, job: BatchJob) -> JobResult:
+        """
+        Queue a job.
+
+        Args:
+            job: Job to run after the already queued ones
+
+        Returns:
+            Result record of the job (updated as it runs)
+        """
+        if any(existing.slug == job.slug for existing in self.jobs):
+            raise ValueError(f"Duplicate job name: {job.name}")
+        result = JobResult(name=job.name, workspace=self.root / job.slug)
+        self.jobs.append(job)
+        self.results.append(result)
+        return result
+
+    def stop(self):
+        """Stop the capturing job and skip the remaining ones (running builds finish)."""
+        self.cancel_token.cancel()
+        scanner = self.current_scanner
+        if scanner is not None:
+            scanner.stop_scan()
+
+    def run(self) -> List[JobResult]:
+        """
+        Run all queued jobs.
+
+        Returns:
+            Results of all jobs, in queue order
+        """
+        self.cancel_token.reset()
+        self._started_at = self.clock.now()
+        logger.info(f"Batch started: {len(self.jobs)} jobs in {self.root}")
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-build") as builder:
+            for job, result in zip(self.jobs, self.results):
+                if self.cancel_token.is_cancelled:
+                    self._update(result, JobState.SKIPPED)
+                    continue
+
+                pages = self._capture(job, result)
+                if pages:
+                    self._update(result, JobState.BUILDING)
+                    builder.submit(self._build, job, result, pages)
+
+        self._save_report()
+        logger.info(f"Batch finished: {self._summary()}")
+        return self.results
+
+    def _job_config(self, job: BatchJob, workspace: Path) -> ScanConfig:
+        """Derive the capture configuration of a job in its workspace."""
+        return replace(
+            job.config,
+            output_path=workspace / "output",
+            temp_dir=workspace / "spool",
+            state_dir=self.root,
+            keep_spool=True,
+            build_pdf=False
+        )
+
+    def _capture(self, job: BatchJob, result: JobResult) -> Optional[List[Path]]:
+        """
+        Capture a job's book.
+
+        Args:
+            job: Job to capture
+            result: Result record to update
+
+        Returns:
+            Spooled pages in order, or None if the capture did not complete
+        """
+        scanner = self.scanner_factory(job, self._job_config(job, result.workspace))
+        self.current_scanner = scanner
+        try:
+            if job.book_title and not self._wait_for_book(scanner, job, result):
+                return None
+
+            self._update(result, JobState.CAPTURING)
+            start = scanner.clock.now()
+            callback = None
+            if self.progress_callback is not None:
+                callback = lambda event: self.progress_callback(job, event)
+            if not scanner.start_scan(callback):
+                self._update(result, JobState.ERROR, "Scan could not be started")
+                return None
+            scanner.scan_thread.join()
+
+            session = scanner.session
+            result.capture_seconds = scanner.clock.now() - start
+            result.pages = session.pages_captured
+
+            if session.state == ScanState.COMPLETE:
+                logger.info(f"Job '{job.name}' captured {result.pages} pages "
+                           f"in {result.capture_seconds:.1f}s")
+                return list(session.captured_images)
+            if session.state == ScanState.CANCELLED:
+                self._update(result, JobState.CANCELLED)
+                self.stop()
+                return None
+
+            self._update(result, JobState.ERROR, session.error_message)
+            return None
+
+        finally:
+            self.current_scanner = None
+
+    def _wait_for_book(self, scanner: Scanner, job: BatchJob, result: JobResult) -> bool:
+        """
+        Wait until the job's book is open in Kindle.
+
+        Args:
+            scanner: Scanner of the job (its window manager is polled)
+            job: Job whose book_title is awaited
+            result: Result record to update
+
+        Returns:
+            True once the book is open, False on timeout or stop
+        """
+        self._update(result, JobState.WAITING)
+        logger.info(f"Waiting for '{job.book_title}' to be opened in Kindle")
+        start = self.clock.now()
+        wanted = job.book_title.lower()
+
+        while True:
+            window_manager = scanner.window_manager
+            if window_manager.find_kindle_window() and wanted in (window_manager.kindle_title or "").lower():
+                result.wait_seconds = self.clock.now() - start
+                return True
+
+            if self.title_timeout is not None and self.clock.now() - start >= self.title_timeout:
+                result.wait_seconds = self.clock.now() - start
+                self._update(result, JobState.ERROR, f"Book '{job.book_title}' was not opened in time")
+                return False
+
+            if self.cancel_token.sleep(self.TITLE_POLL_INTERVAL):
+                self._update(result, JobState.SKIPPED)
+                return False
+
+    def _build(self, job: BatchJob, result: JobResult, pages: List[Path]):
+        """
+        Build a job's PDF from its spool (runs on the build thread).
+
+        Args:
+            job: Captured job
+            result: Result record to update
+            pages: Spooled pages in order
+        """
+        try:
+            start = time.perf_counter()
+            generator = PDFGenerator.from_config(job.config, workers=self.build_workers)
+            output_path = result.workspace / "output" / f"{job.slug}.pdf"
+            title = job.book_title or job.name
+            if job.config.export_profiles:
+                outputs = generator.export(pages, job.config.export_profiles, output_path.parent,
+                                           job.slug, title)
+                first = outputs.get(job.config.export_profiles[0].name) if outputs else None
+                pdf_path = first[0] if first else None
+            else:
+                pdf_path = generator.create_pdf(pages, output_path, title=title)
+            result.build_seconds = time.perf_counter() - start
+
+            if pdf_path is None:
+                self._update(result, JobState.ERROR, "Failed to create PDF")
+                return
+
+            result.output_pdf = pdf_path
+            if not job.config.keep_spool and pages:
+                shutil.rmtree(pages[0].parent, ignore_errors=True)
+            logger.info(f"Job '{job.name}' built in {result.build_seconds:.1f}s: {pdf_path}")
+            self._update(result, JobState.COMPLETE)
+
+        except Exception as e:
+            logger.exception(f"PDF build of job '{job.name}' failed")
+            self._update(result, JobState.ERROR, str(e))
+
+    def _update(self, result: JobResult, state: JobState, error_message: Optional[str] = None):
+        """Change a job's state, persist the report and notify listeners."""
+        result.state = state
+        if error_message:
+            result.error_message = error_message
+            logger.error(f"Job '{result.name}': {error_message}")
+        self._save_report()
+        if self.job_callback is not None:
+            self.job_callback(result)
+
+    def _summary(self) -> dict:
+        """Batch totals for the report."""
+        capture_seconds = sum(result.capture_seconds for result in self.results)
+        elapsed = self.clock.now() - self._started_at if self._started_at is not None else 0.0
+        return {
+            'jobs': len(self.results),
+            'complete': sum(result.state == JobState.COMPLETE for result in self.results),
+            'pages': sum(result.pages for result in self.results),
+            'capture_seconds': capture_seconds,
+            'elapsed_seconds': elapsed,
+            # Share of the batch time the capture device was busy
+            'capture_utilization': capture_seconds / elapsed if elapsed > 0 else None,
+        }
+
+    def _save_report(self):
+        """Write the batch report."""
+        with self._report_lock:
+            self.report.set('jobs', [result.to_dict() for result in self.results])
+            self.report.set('summary', self._summary())
+            self.report.save()
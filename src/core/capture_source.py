@@ -0,0 +1,211 @@
+"""
+Screen capture and input backends used by the page capturer.
+"""
+import ctypes
+import sys
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+from ..utils.lazy_import import lazy_import
+from .frame_pool import FramePool
+
+pyautogui = lazy_import("pyautogui")
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+
+class CaptureSource(ABC):
+    """Grabs screen regions and sends input to the foreground window."""
+
+    @abstractmethod
+    def screenshot(self, region: Tuple[int, int, int, int]) -> "Image.Image":
+        """
+        Grab a region of the screen.
+
+        Args:
+            region: Tuple of (left, top, width, height)
+
+        Returns:
+            RGB PIL image of the region
+        """
+
+    def grab_into(self, region: Tuple[int, int, int, int], pool: FramePool) -> "np.ndarray":
+        """
+        Grab a region of the screen into the pool's 'raw' buffer.
+
+        The default implementation converts a PIL screenshot; backends that
+        can write pixels directly into the buffer override this.
+
+        Args:
+            region: Tuple of (left, top, width, height)
+            pool: Frame pool providing the destination buffer
+
+        Returns:
+            BGR view (height, width, 3) of pooled memory, valid until the next grab
+        """
+        left, top, width, height = region
+        image = self.screenshot(region)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        out = pool.get('raw', (height, width, 3))
+        out[...] = np.asarray(image)[..., ::-1]
+        return out
+
+    @abstractmethod
+    def press(self, key: str):
+        """
+        Press and release a key.
+
+        Args:
+            key: Key name (pyautogui naming, e.g. 'left', 'pagedown')
+        """
+
+    @abstractmethod
+    def click(self, x: int, y: int):
+        """
+        Click at a screen position.
+
+        Args:
+            x: Screen x coordinate
+            y: Screen y coordinate
+        """
+
+
+class PyAutoGUISource(CaptureSource):
+    """Real screen and keyboard through PyAutoGUI."""
+
+    def __init__(self):
+        """Initialize PyAutoGUI backend."""
+        # Disable PyAutoGUI failsafe (no abort on mouse corner)
+        pyautogui.FAILSAFE = False
+
+    def screenshot(self, region: Tuple[int, int, int, int]) -> "Image.Image":
+        return pyautogui.screenshot(region=region)
+
+    def press(self, key: str):
+        pyautogui.press(key)
+
+    def click(self, x: int, y: int):
+        pyautogui.click(x, y)
+
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    """GDI bitmap header (wingdi.h)."""
+    _fields_ = [
+        ('biSize', ctypes.c_uint32),
+        ('biWidth', ctypes.c_int32),
+        ('biHeight', ctypes.c_int32),
+        ('biPlanes', ctypes.c_uint16),
+        ('biBitCount', ctypes.c_uint16),
+        ('biCompression', ctypes.c_uint32),
+        ('biSizeImage', ctypes.c_uint32),
+        ('biXPelsPerMeter', ctypes.c_int32),
+        ('biYPelsPerMeter', ctypes.c_int32),
+        ('biClrUsed', ctypes.c_uint32),
+        ('biClrImportant', ctypes.c_uint32),
+    ]
+
+
+class GdiCaptureSource(PyAutoGUISource):
+    """
+    Windows capture with GDI BitBlt straight into pooled NumPy memory.
+
+    The screen is blitted into a cached memory bitmap and GetDIBits copies
+    the 24-bit BGR rows directly into the pool buffer, so a grab allocates
+    nothing. Keyboard and mouse input still go through PyAutoGUI.
+    """
+
+    SRCCOPY = 0x00CC0020
+    CAPTUREBLT = 0x40000000
+    DIB_RGB_COLORS = 0
+    BI_RGB = 0
+
+    def __init__(self):
+        """Initialize GDI backend."""
+        super().__init__()
+        self._user32 = ctypes.windll.user32
+        self._gdi32 = ctypes.windll.gdi32
+        # Handles are pointer-sized: declare signatures so they are not truncated
+        self._user32.GetDC.restype = ctypes.c_void_p
+        self._gdi32.CreateCompatibleDC.restype = ctypes.c_void_p
+        self._gdi32.CreateCompatibleBitmap.restype = ctypes.c_void_p
+        self._gdi32.SelectObject.restype = ctypes.c_void_p
+        self._user32.GetDC.argtypes = [ctypes.c_void_p]
+        self._gdi32.CreateCompatibleDC.argtypes = [ctypes.c_void_p]
+        self._gdi32.CreateCompatibleBitmap.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        self._gdi32.SelectObject.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        self._gdi32.BitBlt.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                       ctypes.c_int, ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+                                       ctypes.c_uint32]
+        self._gdi32.GetDIBits.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint,
+                                          ctypes.c_uint, ctypes.c_void_p, ctypes.c_void_p,
+                                          ctypes.c_uint]
+        self._gdi32.DeleteObject.argtypes = [ctypes.c_void_p]
+        self._gdi32.DeleteDC.argtypes = [ctypes.c_void_p]
+        self._user32.ReleaseDC.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+
+        self._screen_dc = self._user32.GetDC(None)
+        self._mem_dc = self._gdi32.CreateCompatibleDC(self._screen_dc)
+        self._bitmap: Optional[int] = None
+        self._bitmap_size: Optional[Tuple[int, int]] = None
+        self._header = BITMAPINFOHEADER()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether GDI capture can be used on this platform."""
+        return sys.platform == "win32"
+
+    def _ensure_bitmap(self, width: int, height: int):
+        """(Re)create the memory bitmap when the capture size changes."""
+        if self._bitmap_size == (width, height):
+            return
+        if self._bitmap is not None:
+            self._gdi32.DeleteObject(self._bitmap)
+        self._bitmap = self._gdi32.CreateCompatibleBitmap(self._screen_dc, width, height)
+        self._gdi32.SelectObject(self._mem_dc, self._bitmap)
+        self._bitmap_size = (width, height)
+
+        header = self._header
+        header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+        header.biWidth = width
+        header.biHeight = -height  # Negative height: top-down rows
+        header.biPlanes = 1
+        header.biBitCount = 24
+        header.biCompression = self.BI_RGB
+
+    def grab_into(self, region: Tuple[int, int, int, int], pool: FramePool) -> "np.ndarray":
+        left, top, width, height = region
+        self._ensure_bitmap(width, height)
+
+        if not self._gdi32.BitBlt(self._mem_dc, 0, 0, width, height, self._screen_dc,
+                                  left, top, self.SRCCOPY | self.CAPTUREBLT):
+            raise OSError("BitBlt failed")
+
+        # DIB rows are padded to a multiple of 4 bytes
+        stride = (width * 3 + 3) & ~3
+        buffer = pool.get('raw', (height, stride))
+        lines = self._gdi32.GetDIBits(self._mem_dc, self._bitmap, 0, height,
+                                      buffer.ctypes.data, ctypes.byref(self._header),
+                                      self.DIB_RGB_COLORS)
+        if lines != height:
+            raise OSError("GetDIBits failed")
+
+        return buffer[:, :width * 3].reshape(height, width, 3)
+
+    def close(self):
+        """Release GDI resources."""
+        if self._bitmap is not None:
+            self._gdi32.DeleteObject(self._bitmap)
+            self._bitmap = None
+        if self._mem_dc:
+            self._gdi32.DeleteDC(self._mem_dc)
+            self._mem_dc = None
+        if self._screen_dc:
+            self._user32.ReleaseDC(None, self._screen_dc)
+            self._screen_dc = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,137 @@
+"""
+Self-tuning capture delay learned from observed page settle times.
+"""
+import platform
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from ..models.config import Resolution
+from ..utils.json_store import JsonStore
+from ..utils.logger import logger
+
+
+class DelayTuner:
+    """
+    Learns the smallest safe delay between a page turn and the screenshot.
+
+    Every page reports how long the screen kept changing after the turn.
+    The delay tracks a high percentile of those settle times plus a safety
+    margin: it grows immediately when a page needs longer, shrinks gradually
+    when pages settle faster, and doubles at once when a torn (still
+    rendering) or duplicate (turn not yet shown) frame is detected. The
+    scanner reports only the first duplicate of a run, so the duplicates
+    at the end of a book back off once, not once per page.
+    """
+
+    MIN_DELAY = 0.15        # Never capture sooner than this after a turn
+    MAX_DELAY = 3.0         # Upper bound, also the limit for back-off
+    SAFETY_MARGIN = 1.3     # Multiplier applied to the settle percentile
+    SAFETY_PAD = 0.05       # Fixed seconds added on top of the margin
+    SETTLE_PERCENTILE = 0.9
+    SHRINK_RATE = 0.25      # Fraction of the gap closed per page when shrinking
+    BACKOFF_FACTOR = 2.0
+    WINDOW = 30             # Settle observations kept
+
+    def __init__(self, initial_delay: float, profile_store: Optional[JsonStore] = None,
+                 profile_key: Optional[str] = None):
+        """
+        Initialize delay tuner.
+
+        Args:
+            initial_delay: Delay used when no learned profile exists (seconds)
+            profile_store: Store holding learned profiles (None disables persistence)
+            profile_key: Key of this machine's profile in the store
+        """
+        self.profile_store = profile_store
+        self.profile_key = profile_key
+        self.settle_times: deque = deque(maxlen=self.WINDOW)
+        self.bad_frames = 0
+
+        profile = profile_store.get(profile_key) if profile_store and profile_key else None
+        if profile and 'delay' in profile:
+            self.delay = self._clamp(profile['delay'])
+            logger.info(f"DelayTuner loaded profile {profile_key}: delay={self.delay:.2f}s")
+        else:
+            self.delay = self._clamp(initial_delay)
+            logger.info(f"DelayTuner starting untuned: delay={self.delay:.2f}s")
+
+    @staticmethod
+    def profile_key_for(resolution: Resolution) -> str:
+        """
+        Build the profile key for this machine and resolution mode.
+
+        Args:
+            resolution: Screenshot resolution mode (window size affects render time)
+
+        Returns:
+            Profile key string
+        """
+        return f"{platform.node() or 'unknown'}:{resolution.value}"
+
+    def _clamp(self, delay: float) -> float:
+        """Clamp a delay to the allowed range."""
+        return min(max(delay, self.MIN_DELAY), self.MAX_DELAY)
+
+    @property
+    def target_delay(self) -> Optional[float]:
+        """Delay implied by the observed settle times (None without observations)."""
+        if not self.settle_times:
+            return None
+        ordered = sorted(self.settle_times)
+        index = min(int(len(ordered) * self.SETTLE_PERCENTILE), len(ordered) - 1)
+        return self._clamp(ordered[index] * self.SAFETY_MARGIN + self.SAFETY_PAD)
+
+    def record_settle(self, settle_seconds: float):
+        """
+        Record how long the screen kept changing after a page turn.
+
+        Args:
+            settle_seconds: Seconds from the turn until the last observed change
+        """
+        self.settle_times.append(settle_seconds)
+        target = self.target_delay
+
+        if target > self.delay:
+            self.delay = target
+        else:
+            self.delay = self._clamp(self.delay - (self.delay - target) * self.SHRINK_RATE)
+
+        logger.debug(f"Settle {settle_seconds:.3f}s -> delay {self.delay:.3f}s")
+
+    def record_bad_frame(self, reason: str):
+        """
+        Back off immediately after a torn or duplicate frame.
+
+        Args:
+            reason: Short description for the log
+        """
+        self.bad_frames += 1
+        self.delay = self._clamp(self.delay * self.BACKOFF_FACTOR)
+        logger.info(f"Capture delay backed off to {self.delay:.2f}s ({reason})")
+
+    def save(self) -> bool:
+        """
+        Persist the learned delay for the next scan on this machine.
+
+        The saved value is derived from settle observations only, so the
+        temporary back-off at the end of a book is not carried over.
+
+        Returns:
+            True if saved, False if nothing was learned or saving failed
+        """
+        if self.profile_store is None or self.profile_key is None:
+            return False
+
+        target = self.target_delay
+        if target is None:
+            return False
+
+        self.profile_store.set(self.profile_key, {
+            'delay': round(target, 3),
+            'samples': len(self.settle_times),
+            'bad_frames': self.bad_frames,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        })
+        logger.info(f"Saved capture delay profile {self.profile_key}: {target:.2f}s")
+        return self.profile_store.save()
@@ -0,0 +1,211 @@
+"""
+Fan-out export: several PDF profiles from one decode pass.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..models.export import ExportProfile
+from ..utils.lazy_import import lazy_import
+from ..utils.logger import logger
+from .adaptive_quality import QualityCache
+from .page_encoder import (EncodeOptions, default_workers, encode_image, is_blank,
+                           load_page, ordered_map, passthrough_png)
+from .pdf_linearize import linearize_pdf
+from .pdf_writer import PageImage, PDFWriter
+
+np = lazy_import("numpy")
+
+
+@dataclass
+class _ProfileOutput:
+    """Writer state of one profile (rolls over to a new file per volume)."""
+
+    profile: ExportProfile
+    options: EncodeOptions
+    cache: Optional[QualityCache] = None
+    writer: Optional[PDFWriter] = None
+    part: int = 0
+    paths: List[Path] = field(default_factory=list)
+
+
+class FanOutExporter:
+    """
+    Writes several PDFs (e.g. archival and mobile) from one pass over the pages.
+
+    Each page is read and decoded once; every profile's image is derived
+    from that decoded page (grayscale, downsampled to the profile's DPI)
+    and encoded on the same worker thread, with pages processed in
+    parallel. Each profile is written by its own streaming PDFWriter, so
+    memory stays bounded and the outputs finish together. Profiles with
+    an SSIM floor share the quality chosen per page class across pages.
+    """
+
+    def __init__(self, profiles: List[ExportProfile],
+                 crop: Optional[Tuple[int, int, int, int]] = None,
+                 workers: Optional[int] = None, blank_pages: bool = True,
+                 page_numbers: bool = False, page_labels: bool = False,
+                 linearize: bool = False, object_streams: bool = False):
+        """
+        Initialize fan-out exporter.
+
+        Args:
+            profiles: Output profiles (names must be unique)
+            crop: Crop rectangle (top, bottom, left, right) applied to every page
+            workers: Parallel page threads (default: CPU count, max 8)
+            blank_pages: Write blank pages as empty pages without an image
+            page_numbers: Draw page numbers on the pages
+            page_labels: Record page numbers as page labels
+            linearize: Linearize every PDF once it is complete
+            object_streams: Write PDF 1.5 object streams (ignored when linearizing)
+        """
+        names = [profile.name for profile in profiles]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Export profile names must be unique: {', '.join(names)}")
+
+        self.profiles = profiles
+        self.crop = crop
+        self.workers = workers or default_workers()
+        self.blank_pages = blank_pages
+        self.page_numbers = page_numbers
+        self.page_labels = page_labels
+        self.linearize = linearize
+        self.object_streams = object_streams and not linearize
+
+        # Decode straight to grayscale when no profile needs colour
+        self.decode_options = EncodeOptions(
+            grayscale=all(profile.grayscale for profile in profiles), crop=crop
+        )
+
+    def _options(self, profile: ExportProfile) -> EncodeOptions:
+        """Encoding options of a profile."""
+        return EncodeOptions(quality=profile.quality, grayscale=profile.grayscale,
+                             crop=self.crop, lossless=profile.lossless,
+                             blank_pages=self.blank_pages, scale=profile.scale, mrc=profile.mrc,
+                             ssim_floor=profile.ssim_floor, encoder=profile.encoder)
+
+    def _encode(self, image_path: Path,
+                outputs: List[_ProfileOutput]) -> Optional[List[Optional[PageImage]]]:
+        """
+        Decode one page and encode it for every profile.
+
+        Args:
+            image_path: Page image
+            outputs: Profile outputs (encoding options and quality cache)
+
+        Returns:
+            Encoded image per profile, or None if the page could not be read
+        """
+        try:
+            data = np.fromfile(str(image_path), dtype=np.uint8)
+            pixels = None
+            blank = None
+            images = []
+            for output in outputs:
+                profile_options = output.options
+                image = None
+                if profile_options.lossless:
+                    image = passthrough_png(data.tobytes(), profile_options)
+                if image is None:
+                    if pixels is None:
+                        pixels = load_page(data, self.decode_options)
+                        if pixels is None:
+                            logger.warning(f"Failed to load image {image_path}")
+                            return None
+                        blank = is_blank(pixels) if self.blank_pages else False
+                    image = encode_image(pixels, profile_options, blank, output.cache)
+                    if image is None:
+                        logger.warning(f"Failed to encode image {image_path}")
+                images.append(image)
+            return images
+
+        except Exception as e:
+            logger.warning(f"Failed to encode image {image_path}: {e}")
+            return None
+
+    def _next_writer(self, output: _ProfileOutput, output_dir: Path, name: str, title: str):
+        """Close the profile's current volume (if any) and open the next one."""
+        if output.writer is not None:
+            output.paths.append(output.writer.close())
+
+        output.part += 1
+        stem = f"{name}_{output.profile.name}"
+        volume_title = title
+        if output.profile.split_pages:
+            stem += f"_part{output.part}"
+            volume_title = f"{title} Part {output.part}"
+        output.writer = PDFWriter(output_dir / f"{stem}.pdf", title=volume_title,
+                                  dpi=output.profile.dpi, page_numbers=self.page_numbers,
+                                  page_labels=self.page_labels,
+                                  object_streams=self.object_streams)
+
+    def export(self, image_paths: List[Path], output_dir: Path, name: str,
+               title: str) -> Dict[str, List[Path]]:
+        """
+        Write every profile's PDF.
+
+        Files are named <name>_<profile>.pdf, or <name>_<profile>_partN.pdf
+        for profiles with split_pages. Page numbers follow the position in
+        image_paths and continue across volumes.
+
+        Args:
+            image_paths: Page images in order
+            output_dir: Output directory
+            name: File name prefix
+            title: PDF title metadata
+
+        Returns:
+            Created PDFs per profile name (empty if the export failed)
+        """
+        if not image_paths or not self.profiles:
+            logger.error("No images or profiles provided for export")
+            return {}
+
+        outputs = [_ProfileOutput(profile, self._options(profile),
+                                  QualityCache() if profile.ssim_floor > 0 else None)
+                   for profile in self.profiles]
+        logger.info(f"Exporting {len(image_paths)} pages to profiles: "
+                    f"{', '.join(profile.name for profile in self.profiles)}")
+
+        try:
+            for number, (img_path, images) in enumerate(
+                    ordered_map(lambda path: self._encode(path, outputs), image_paths, self.workers),
+                    start=1):
+                if images is None:
+                    continue
+                for output, image in zip(outputs, images):
+                    if image is None:
+                        continue
+                    split = output.profile.split_pages
+                    if output.writer is None or (split and output.writer.page_count >= split):
+                        self._next_writer(output, output_dir, name, title)
+                    output.writer.add_page(image, number)
+                logger.debug(f"Exported page: {img_path.name}")
+
+            for output in outputs:
+                if output.writer is not None:
+                    output.paths.append(output.writer.close())
+                    output.writer = None
+
+        except BaseException as e:
+            for output in outputs:
+                if output.writer is not None:
+                    output.writer.abort()
+            if not isinstance(e, Exception):
+                raise
+            logger.error(f"Error exporting PDFs: {e}")
+            return {}
+
+        if self.linearize:
+            for output in outputs:
+                for path in output.paths:
+                    linearize_pdf(path)
+
+        results = {output.profile.name: output.paths for output in outputs}
+        for profile_name, paths in results.items():
+            size = sum(path.stat().st_size for path in paths) / 1024 / 1024
+            logger.info(f"Profile '{profile_name}': {len(paths)} PDF(s), {size:.2f} MB")
+        for output in outputs:
+            if output.cache is not None:
+                logger.info(f"Profile '{output.profile.name}' adaptive quality: {output.cache.summary()}")
+        return results
@@ -0,0 +1,206 @@
+"""
+Event-driven tracking of Kindle window focus during a scan.
+
+On Windows a WinEvent hook reports foreground changes and window
+destruction as they happen, so the scanner only re-activates Kindle when
+focus was actually lost. Elsewhere (and for window managers without hook
+support, such as simulated ones) the foreground window is polled.
+"""
+import ctypes
+import sys
+import threading
+from typing import Optional
+
+from ..utils.logger import logger
+
+# WinEvent constants (winuser.h)
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_SYSTEM_MINIMIZESTART = 0x0016
+EVENT_OBJECT_DESTROY = 0x8001
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WM_QUIT = 0x0012
+
+
+class FocusMonitor:
+    """Tracks whether the Kindle window still has focus and still exists."""
+
+    POLL_INTERVAL = 0.25  # Seconds between checks in polling mode
+
+    def __init__(self, window_manager, hwnd: int):
+        """
+        Initialize focus monitor.
+
+        Args:
+            window_manager: Window manager providing get_foreground_window()
+                and is_window_valid(); a WinEvent hook is tried first when its
+                supports_win_events attribute is true
+            hwnd: Kindle window handle
+        """
+        self.window_manager = window_manager
+        self.hwnd = hwnd
+        self.use_hook = (getattr(window_manager, 'supports_win_events', False)
+                         and sys.platform == "win32")
+
+        self._focus_lost = threading.Event()
+        self._window_closed = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._hook_thread_id: Optional[int] = None
+        self._hook_ready = threading.Event()
+        self._hook_ok = False
+
+        # Number of focus losses observed
+        self.focus_losses = 0
+
+    @property
+    def focus_lost(self) -> bool:
+        """Whether the Kindle window lost focus since the last acknowledge()."""
+        return self._focus_lost.is_set()
+
+    @property
+    def window_closed(self) -> bool:
+        """Whether the Kindle window was closed."""
+        return self._window_closed.is_set()
+
+    @property
+    def mode(self) -> str:
+        """Tracking mode: 'hook', 'polling' or 'stopped'."""
+        if self._thread is None:
+            return "stopped"
+        return "hook" if self._hook_ok else "polling"
+
+    def start(self):
+        """Start tracking focus in a background thread."""
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._focus_lost.clear()
+
+        if self.use_hook:
+            self._thread = threading.Thread(target=self._run_hook, daemon=True)
+            self._thread.start()
+            self._hook_ready.wait(timeout=1.0)
+            if self._hook_ok:
+                self._check_foreground()
+                logger.info("Focus monitor started (WinEvent hook)")
+                return
+
+            logger.warning("WinEvent hook unavailable, falling back to polling")
+            self._thread.join(timeout=1.0)
+
+        self._check_foreground()
+        self._thread = threading.Thread(target=self._run_polling, daemon=True)
+        self._thread.start()
+        logger.info("Focus monitor started (polling)")
+
+    def stop(self):
+        """Stop tracking focus."""
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        if self._hook_ok and self._hook_thread_id is not None:
+            ctypes.windll.user32.PostThreadMessageW(self._hook_thread_id, WM_QUIT, 0, 0)
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        self._hook_ok = False
+        logger.info(f"Focus monitor stopped ({self.focus_losses} focus losses)")
+
+    def acknowledge(self):
+        """
+        Clear the focus-lost flag after the window was re-activated.
+
+        The foreground window is re-checked so a failed re-activation is
+        reported again on the next check.
+        """
+        self._focus_lost.clear()
+        self._check_foreground()
+
+    def _mark_focus_lost(self):
+        """Record a focus loss."""
+        if not self._focus_lost.is_set():
+            self.focus_losses += 1
+            self._focus_lost.set()
+            logger.debug("Kindle window lost focus")
+
+    def _check_foreground(self):
+        """Compare the current foreground window with the Kindle window."""
+        try:
+            foreground = self.window_manager.get_foreground_window()
+        except Exception as e:
+            logger.debug(f"Foreground check failed: {e}")
+            return
+
+        if foreground != self.hwnd:
+            self._mark_focus_lost()
+        else:
+            self._focus_lost.clear()
+
+    def _run_polling(self):
+        """Polling loop (fallback when no WinEvent hook is available)."""
+        while not self._stop.wait(self.POLL_INTERVAL):
+            if not self.window_manager.is_window_valid(self.hwnd):
+                logger.error("Kindle window closed")
+                self._window_closed.set()
+                return
+            self._check_foreground()
+
+    def _run_hook(self):
+        """Install WinEvent hooks and pump messages until stopped."""
+        try:
+            from ctypes import wintypes
+
+            user32 = ctypes.windll.user32
+            WinEventProc = ctypes.WINFUNCTYPE(
+                None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+            )
+
+            def callback(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+                if event == EVENT_OBJECT_DESTROY:
+                    if hwnd == self.hwnd and id_object == OBJID_WINDOW and id_child == CHILDID_SELF:
+                        logger.error("Kindle window closed")
+                        self._window_closed.set()
+                        self._mark_focus_lost()
+                elif event == EVENT_SYSTEM_FOREGROUND:
+                    if hwnd == self.hwnd:
+                        self._focus_lost.clear()
+                    else:
+                        self._mark_focus_lost()
+                elif event == EVENT_SYSTEM_MINIMIZESTART and hwnd == self.hwnd:
+                    self._mark_focus_lost()
+
+            # Keep a reference so the callback is not garbage collected
+            self._callback = WinEventProc(callback)
+            user32.SetWinEventHook.restype = wintypes.HANDLE
+            hooks = [
+                user32.SetWinEventHook(first, last, 0, self._callback, 0, 0, WINEVENT_OUTOFCONTEXT)
+                for first, last in [
+                    (EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+                    (EVENT_SYSTEM_MINIMIZESTART, EVENT_SYSTEM_MINIMIZESTART),
+                    (EVENT_OBJECT_DESTROY, EVENT_OBJECT_DESTROY),
+                ]
+            ]
+            if not all(hooks):
+                raise OSError("SetWinEventHook failed")
+
+            self._hook_thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+            self._hook_ok = True
+            self._hook_ready.set()
+
+            # Events are only delivered while this thread pumps messages
+            msg = wintypes.MSG()
+            while not self._stop.is_set() and user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+
+            for hook in hooks:
+                user32.UnhookWinEvent(hook)
+
+        except Exception as e:
+            logger.debug(f"WinEvent hook failed: {e}")
+            self._hook_ok = False
+            self._hook_ready.set()
@@ -0,0 +1,57 @@
+"""
+Pool of preallocated, reusable NumPy frame buffers.
+"""
+from typing import Dict, Tuple
+
+from ..utils.lazy_import import lazy_import
+from ..utils.logger import logger
+
+np = lazy_import("numpy")
+
+
+class FramePool:
+    """
+    Named fixed-shape buffers reused across pages.
+
+    Every capture stage (raw grab, scaled frame, grayscale analysis frame)
+    owns a named slot. A slot is allocated the first time it is requested
+    with a given shape and handed out again on every later request, so
+    steady-state capture performs no large allocations and does not
+    fragment the heap on long runs.
+    """
+
+    def __init__(self):
+        """Initialize empty pool."""
+        self._buffers: Dict[str, "np.ndarray"] = {}
+
+        # Number of buffers allocated (stays constant once capture is steady)
+        self.allocations = 0
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype: str = "uint8") -> "np.ndarray":
+        """
+        Get the buffer for a slot, allocating it if missing or reshaped.
+
+        Args:
+            name: Slot name
+            shape: Required buffer shape
+            dtype: Required element type
+
+        Returns:
+            Buffer (contents are whatever the previous user left in it)
+        """
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != np.dtype(dtype):
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+            self.allocations += 1
+            logger.debug(f"FramePool allocated '{name}' {tuple(shape)} {dtype}")
+        return buffer
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held by the pool."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def clear(self):
+        """Release all buffers."""
+        self._buffers.clear()
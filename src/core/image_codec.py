@@ -0,0 +1,98 @@
+"""
+Lossy encoder backends for page images: OpenCV or Pillow JPEG, JPEG 2000.
+"""
+import io
+from typing import Optional
+
+from ..models.export import EncoderSettings
+from ..utils.lazy_import import lazy_import
+from .pdf_writer import PDFImage
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+# Pillow's subsampling option per chroma subsampling mode
+PILLOW_SUBSAMPLING = {"444": 0, "422": 1, "420": 2}
+
+# JPEG 2000 is rate controlled: OpenCV's compression value is the output
+# size in thousandths of the raw pixel data. Quality maps onto it so that
+# sizes roughly follow JPEG's (1% of raw at quality 20, doubling every 22.5).
+JPEG2000_BASE_RATE = 10
+JPEG2000_DOUBLING = 22.5
+
+# PDF filter of each codec's output
+CODEC_FILTERS = {"opencv": "DCTDecode", "pillow": "DCTDecode", "jpeg2000": "JPXDecode"}
+
+
+def _opencv_jpeg(image: "np.ndarray", quality: int, settings: EncoderSettings) -> Optional[bytes]:
+    """Encode a JPEG with OpenCV (libjpeg-turbo)."""
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality,
+              cv2.IMWRITE_JPEG_SAMPLING_FACTOR,
+              getattr(cv2, f"IMWRITE_JPEG_SAMPLING_FACTOR_{settings.subsampling}")]
+    if settings.progressive:
+        params += [cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+    if settings.optimize:
+        params += [cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+    ok, encoded = cv2.imencode('.jpg', image, params)
+    return encoded.tobytes() if ok else None
+
+
+def _pillow_jpeg(image: "np.ndarray", quality: int, settings: EncoderSettings) -> Optional[bytes]:
+    """Encode a JPEG with Pillow."""
+    pixels = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    output = io.BytesIO()
+    Image.fromarray(pixels).save(output, format="JPEG", quality=quality,
+                                 subsampling=PILLOW_SUBSAMPLING[settings.subsampling],
+                                 progressive=settings.progressive, optimize=settings.optimize)
+    return output.getvalue()
+
+
+def _jpeg2000(image: "np.ndarray", quality: int, settings: EncoderSettings) -> Optional[bytes]:
+    """Encode a JPEG 2000 (JP2) image with OpenCV; quality maps to the output rate."""
+    rate = round(JPEG2000_BASE_RATE * 2 ** ((quality - 20) / JPEG2000_DOUBLING))
+    ok, encoded = cv2.imencode('.jp2', image,
+                               [cv2.IMWRITE_JPEG2000_COMPRESSION_X1000, min(max(rate, 1), 1000)])
+    return encoded.tobytes() if ok else None
+
+
+ENCODERS = {"opencv": _opencv_jpeg, "pillow": _pillow_jpeg, "jpeg2000": _jpeg2000}
+
+
+def encode_lossy(image: "np.ndarray", quality: int,
+                 settings: Optional[EncoderSettings] = None) -> Optional[bytes]:
+    """
+    Encode a page image with a lossy codec.
+
+    Args:
+        image: BGR or grayscale image
+        quality: Quality (1-100)
+        settings: Encoder backend and settings (default: OpenCV JPEG)
+
+    Returns:
+        Encoded data (decodable with cv2.imdecode), or None if encoding failed
+    """
+    settings = settings or EncoderSettings()
+    try:
+        return ENCODERS[settings.codec](image, quality, settings)
+    except (OSError, ValueError, cv2.error):
+        return None
+
+
+def pdf_image(data: bytes, image: "np.ndarray",
+              settings: Optional[EncoderSettings] = None) -> PDFImage:
+    """
+    Wrap encode_lossy() output as a PDF image stream.
+
+    Args:
+        data: Encoded image
+        image: The image that was encoded (for size and colour space)
+        settings: Encoder settings it was encoded with
+
+    Returns:
+        Image stream
+    """
+    settings = settings or EncoderSettings()
+    height, width = image.shape[:2]
+    return PDFImage(data=data, filter=CODEC_FILTERS[settings.codec], width=width, height=height,
+                    colorspace="DeviceGray" if image.ndim == 2 else "DeviceRGB")
@@ -1,31 +1,43 @@
 """
-Image processing and duplicate detection using SSIM.
+Image processing and duplicate detection using SSIM or a tile change map.
 """
-import cv2
-import numpy as np
 from pathlib import Path
 from typing import Optional, List, Tuple
-from skimage.metrics import structural_similarity as ssim
 
+from ..utils.lazy_import import lazy_import
 from ..utils.logger import logger
+from .change_map import ChangeMap
+
+cv2 = lazy_import("cv2")
+skimage_metrics = lazy_import("skimage.metrics")
 
 
 class ImageProcessor:
     """Handles image comparison and duplicate detection."""
 
-    def __init__(self, similarity_threshold: float = 0.95):
+    def __init__(self, similarity_threshold: float = 0.95, change_map: Optional[ChangeMap] = None,
+                 max_changed_fraction: float = 0.01):
         """
         Initialize image processor.
 
         Args:
             similarity_threshold: SSIM threshold for considering images as duplicates (0.0-1.0)
+            change_map: Tile change map used for frame comparison instead of SSIM
+            max_changed_fraction: Changed tile fraction still considered a duplicate
+                (change map only)
         """
         self.similarity_threshold = similarity_threshold
-        logger.info(f"ImageProcessor initialized with threshold: {similarity_threshold}")
+        self.change_map = change_map
+        self.max_changed_fraction = max_changed_fraction
+        if change_map is not None:
+            logger.info(f"ImageProcessor initialized with tile change map "
+                       f"(max changed: {max_changed_fraction:.1%})")
+        else:
+            logger.info(f"ImageProcessor initialized with threshold: {similarity_threshold}")
 
     def compare_images(self, img1_path: Path, img2_path: Path) -> Tuple[bool, float]:
         """
-        Compare two images using SSIM algorithm.
+        Compare two images (SSIM, or the tile change map if configured).
 
         Args:
             img1_path: Path to first image
@@ -43,13 +55,45 @@ class ImageProcessor:
                 logger.error(f"Failed to load images: {img1_path} or {img2_path}")
                 return False, 0.0
 
+            return self.compare_frames(img1, img2)
+
+        except Exception as e:
+            logger.error(f"Error comparing images: {e}")
+            return False, 0.0
+
+    def compare_frames(self, gray1: "np.ndarray", gray2: "np.ndarray") -> Tuple[bool, float]:
+        """
+        Compare two grayscale frames already in memory.
+
+        Uses the tile change map if configured (similarity is the fraction of
+        unchanged tiles), SSIM otherwise.
+
+        Args:
+            gray1: First grayscale frame
+            gray2: Second grayscale frame
+
+        Returns:
+            Tuple of (is_duplicate, similarity_score)
+        """
+        try:
+            if self.change_map is not None:
+                changed = self.change_map.changed_fraction(
+                    self.change_map.fingerprint(gray1), self.change_map.fingerprint(gray2)
+                )
+                is_duplicate = bool(changed <= self.max_changed_fraction)
+
+                logger.debug(f"Changed tiles: {changed:.1%} (max: {self.max_changed_fraction:.1%}) "
+                            f"-> {'DUPLICATE' if is_duplicate else 'DIFFERENT'}")
+
+                return is_duplicate, float(1.0 - changed)
+
             # Resize to same dimensions if needed
-            if img1.shape != img2.shape:
-                logger.debug(f"Resizing images: {img1.shape} -> {img2.shape}")
-                img2 = cv2.resize(img2, (img1.shape[1], img1.shape[0]))
+            if gray1.shape != gray2.shape:
+                logger.debug(f"Resizing images: {gray1.shape} -> {gray2.shape}")
+                gray2 = cv2.resize(gray2, (gray1.shape[1], gray1.shape[0]))
 
             # Calculate SSIM
-            score = ssim(img1, img2)
+            score = skimage_metrics.structural_similarity(gray1, gray2)
 
             is_duplicate = score >= self.similarity_threshold
 
@@ -59,7 +103,7 @@ class ImageProcessor:
             return is_duplicate, score
 
         except Exception as e:
-            logger.error(f"Error comparing images: {e}")
+            logger.error(f"Error comparing frames: {e}")
             return False, 0.0
 
     def is_duplicate(self, img1_path: Path, img2_path: Path) -> bool:
@@ -0,0 +1,184 @@
+"""
+Mixed raster content (MRC) encoding of pages with text over pictures.
+"""
+import zlib
+from typing import Optional, Tuple
+
+from ..models.export import EncoderSettings
+from ..utils.lazy_import import lazy_import
+from .image_codec import encode_lossy, pdf_image
+from .pdf_writer import MRCImage, PDFImage
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+# Segmentation
+MRC_BACKGROUND_KERNEL = 15     # Max filter estimating the paper or picture behind strokes (pixels)
+MRC_TEXT_CONTRAST = 60         # Darker than the local background by this much (0-255) = text
+MRC_MIN_GLYPH_AREA = 4         # Smaller components are noise (pixels)
+MRC_MAX_GLYPH_HEIGHT = 0.08    # Taller components are pictures, not text (fraction of page height)
+MRC_MAX_TEXT_FRACTION = 0.3    # Pages with more "text" than this are not segmented well
+MRC_HALO = 5                   # Mask dilation removing anti-aliased edges from the background
+
+# Layers
+MRC_BACKGROUND_REDUCE = 3      # Background resolution divisor
+MRC_FOREGROUND_REDUCE = 8      # Foreground colour resolution divisor
+MRC_FOREGROUND_QUALITY = 75    # JPEG quality of the foreground colour layer
+MRC_UNIFORM_TOLERANCE = 24.0   # Text colour spread (standard deviation) painted as one colour
+
+
+def segment_text(image: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Find text pixels: dark strokes forming glyph-sized components.
+
+    Everything is done with whole-image OpenCV/NumPy operations: a max
+    filter estimates the local background, pixels much darker than it
+    are stroke candidates, and connected components too large to be
+    glyphs (picture edges, shading) are dropped through a lookup table.
+
+    Args:
+        image: BGR or grayscale page image
+
+    Returns:
+        Tuple of (text mask as bool array, contrast of every pixel against
+        its local background)
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (MRC_BACKGROUND_KERNEL,) * 2)
+    contrast = cv2.subtract(cv2.dilate(gray, kernel), gray)
+    strokes = (contrast > MRC_TEXT_CONTRAST).astype(np.uint8)
+
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(strokes, connectivity=8)
+    max_height = max(int(image.shape[0] * MRC_MAX_GLYPH_HEIGHT), 1)
+    keep = ((stats[:, cv2.CC_STAT_AREA] >= MRC_MIN_GLYPH_AREA)
+            & (stats[:, cv2.CC_STAT_HEIGHT] <= max_height)
+            & (stats[:, cv2.CC_STAT_WIDTH] <= max_height * 4))
+    keep[0] = False  # Label 0 is everything that is not a stroke
+    return keep[labels], contrast
+
+
+def _lossy(image: "np.ndarray", quality: int,
+           settings: Optional[EncoderSettings]) -> Optional[PDFImage]:
+    """Encode a layer as a lossy (JPEG by default) image stream."""
+    data = encode_lossy(image, quality, settings)
+    return pdf_image(data, image, settings) if data is not None else None
+
+
+def _spread(weights: "np.ndarray", image: "np.ndarray") -> "np.ndarray":
+    """Broadcast per-pixel weights over the channels of image."""
+    return weights[..., None] if image.ndim == 3 else weights
+
+
+def _fill(image: "np.ndarray", known: "np.ndarray", size: int) -> "np.ndarray":
+    """
+    Replace unknown pixels by the mean of the known pixels around them.
+
+    Normalized box filter: the blurred image divided by the blurred
+    weights, so only known pixels contribute. The box grows until every
+    unknown pixel has known pixels in reach.
+
+    Args:
+        image: Image (any channel count)
+        known: True for the pixels to keep
+        size: Initial box filter size
+
+    Returns:
+        Float32 image (unchanged where known)
+    """
+    values = image.astype(np.float32)
+    weight = known.astype(np.float32)
+    filled = values.copy()
+    missing = ~known
+    while missing.any() and known.any():
+        count = cv2.blur(weight, (size, size))
+        total = cv2.blur(values * _spread(weight, values), (size, size))
+        reached = missing & (count > 0)
+        filled[reached] = (total / _spread(np.maximum(count, 1e-6), values))[reached]
+        missing &= ~reached
+        size *= 2
+    return filled
+
+
+def _reduce(image: "np.ndarray", factor: int) -> "np.ndarray":
+    """Downsample by an integer factor (area averaging)."""
+    height, width = image.shape[:2]
+    size = (max(-(-width // factor), 1), max(-(-height // factor), 1))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def _masked_reduce(image: "np.ndarray", weight: "np.ndarray", factor: int) -> "np.ndarray":
+    """
+    Downsample with a weighted mean per cell, ignoring pixels of weight 0.
+
+    Cells without any weighted pixel take the colour of the nearest ones,
+    so the layer stays smooth for JPEG.
+
+    Args:
+        image: BGR or grayscale image
+        weight: Weight per pixel (float32)
+        factor: Resolution divisor
+
+    Returns:
+        Downsampled uint8 image
+    """
+    cell_weight = _reduce(weight, factor)
+    cells = _reduce(image.astype(np.float32) * _spread(weight, image), factor)
+    cells /= _spread(np.maximum(cell_weight, 1e-6), image)
+    cells = _fill(cells, cell_weight > 0, 3)
+    return np.clip(cells, 0, 255).astype(np.uint8)
+
+
+def encode_mrc(image: "np.ndarray", quality: int,
+               settings: Optional[EncoderSettings] = None) -> Optional[MRCImage]:
+    """
+    Split a page into a text mask, a background and a text colour layer.
+
+    The mask keeps the text at full resolution (1 bit per pixel, Flate
+    compressed). The background is downsampled to a third of the
+    resolution from the non-text pixels only, so the text leaves no
+    ghost behind and the background compresses well as a JPEG. Text
+    colour comes from a coarse foreground image, or is a single fill
+    colour when all text has nearly the same colour.
+
+    Args:
+        image: BGR or grayscale page image
+        quality: JPEG quality of the background (1-100)
+        settings: Lossy encoder of the background and foreground layers
+
+    Returns:
+        MRC layers, or None if the page has no text (or could not be
+        segmented) and is better encoded as one image
+    """
+    mask, contrast = segment_text(image)
+    text_pixels = int(np.count_nonzero(mask))
+    if text_pixels == 0 or text_pixels > mask.size * MRC_MAX_TEXT_FRACTION:
+        return None
+    height, width = mask.shape
+
+    halo = cv2.dilate(mask.astype(np.uint8), np.ones((MRC_HALO, MRC_HALO), np.uint8)).astype(bool)
+    back = _lossy(_masked_reduce(image, (~halo).astype(np.float32), MRC_BACKGROUND_REDUCE),
+                  quality, settings)
+    if back is None:
+        return None
+
+    bits = np.packbits(mask, axis=1)  # Rows padded to whole bytes, 1 = text
+    mask_image = PDFImage(data=zlib.compress(bits.tobytes(), 9), filter="FlateDecode",
+                          width=width, height=height, bpc=1, image_mask=True)
+
+    # Colour spread of the stroke centres (anti-aliased edges blend with the background)
+    core = mask & (contrast >= np.median(contrast[mask]))
+    colors = image[core].reshape(-1, 1 if image.ndim == 2 else image.shape[2]).astype(np.float32)
+    color = np.median(colors, axis=0)
+    if float(colors.std(axis=0).max()) <= MRC_UNIFORM_TOLERANCE:
+        rgb = color[::-1] if image.ndim == 3 else color  # BGR -> RGB
+        return MRCImage(background=back, mask=mask_image,
+                        color=tuple(round(float(value) / 255, 3) for value in rgb))
+
+    # Text colour per coarse cell, weighted towards stroke centres (the
+    # highest contrast) over anti-aliased edges
+    weight = np.where(mask, contrast, 0).astype(np.float32)
+    fore = _lossy(_masked_reduce(image, weight, MRC_FOREGROUND_REDUCE), MRC_FOREGROUND_QUALITY,
+                  settings)
+    if fore is None:
+        return None
+    return MRCImage(background=back, mask=mask_image, foreground=fore)
@@ -1,15 +1,24 @@
 """
 Page capture and navigation for Kindle books.
 """
-import pyautogui
-import time
 from pathlib import Path
 from typing import Optional, Tuple
 from datetime import datetime
-from PIL import Image
 
 from ..models.config import Direction, Resolution
+from ..utils.cancellation import CancellationToken
+from ..utils.clock import Clock
+from ..utils.lazy_import import lazy_import
 from ..utils.logger import logger
+from .auto_crop import AutoCropper
+from .capture_source import CaptureSource, GdiCaptureSource, PyAutoGUISource
+from .change_map import ChangeMap
+from .delay_tuner import DelayTuner
+from .frame_pool import FramePool
+from .quality_gate import QualityGate
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
 
 
 class PageCapturer:
@@ -27,7 +36,30 @@ class PageCapturer:
         Direction.WESTERN: 'pagedown',
     }
 
-    def __init__(self, direction: Direction, resolution: Resolution, capture_speed: float):
+    # Settle detection for the self-tuning delay
+    PROBE_INTERVAL = 0.05      # Seconds between probe screenshots
+    PROBE_REDUCE = 8           # Probe downscale factor
+    PROBE_DIFF_THRESHOLD = 1.0  # Mean absolute difference (0-255) counted as a change
+
+    # Spool PNG compression (0-9): pages are temporary, favour speed
+    PNG_COMPRESSION = 3
+
+    # Upscale factor for Resolution.MEDIUM
+    MEDIUM_SCALE = 1.5
+
+    # Pause before grabbing again when the quality gate rejects a frame
+    RECAPTURE_DELAY = 0.25
+
+    def __init__(self, direction: Direction, resolution: Resolution, capture_speed: float,
+                 delay_tuner: Optional[DelayTuner] = None,
+                 cancel_token: Optional[CancellationToken] = None,
+                 capture_source: Optional[CaptureSource] = None,
+                 clock: Optional[Clock] = None,
+                 auto_cropper: Optional[AutoCropper] = None,
+                 change_map: Optional[ChangeMap] = None,
+                 page_change_map: Optional[ChangeMap] = None,
+                 quality_gate: Optional[QualityGate] = None,
+                 max_recaptures: int = 2):
         """
         Initialize page capturer.
 
@@ -35,31 +67,68 @@ class PageCapturer:
             direction: Page turn direction
             resolution: Screenshot resolution mode
             capture_speed: Delay after page turn (seconds)
+            delay_tuner: Self-tuning delay (overrides capture_speed if given)
+            cancel_token: Token that interrupts waits when the scan is stopped
+            capture_source: Screen capture/input backend (GDI on Windows,
+                PyAutoGUI elsewhere, if None)
+            clock: Clock for timing measurements (real time if None)
+            auto_cropper: Content-aware crop applied to every page (None disables)
+            change_map: Tile change map for probe comparison (mean pixel
+                difference if None)
+            page_change_map: Tile change map for comparing captured pages;
+                its volatile regions follow the auto-crop once it locks
+            quality_gate: Checks each frame for partial renders (None disables)
+            max_recaptures: Recaptures per page before a rejected frame is kept
         """
         self.direction = direction
         self.resolution = resolution
         self.capture_speed = capture_speed
-
-        # Disable PyAutoGUI failsafe (no abort on mouse corner)
-        pyautogui.FAILSAFE = False
+        self.delay_tuner = delay_tuner
+        self.clock = clock or Clock()
+        self.cancel_token = cancel_token or CancellationToken(self.clock)
+        if capture_source is None:
+            capture_source = GdiCaptureSource() if GdiCaptureSource.is_available() else PyAutoGUISource()
+        self.capture_source = capture_source
+        self.auto_cropper = auto_cropper
+        self.change_map = change_map
+        self.page_change_map = page_change_map
+        self.quality_gate = quality_gate
+        self.max_recaptures = max_recaptures
+
+        # Recaptures needed for the most recent page
+        self.last_recaptures = 0
+
+        # Reused capture buffers; grayscale frames alternate between two slots
+        # so the previous page stays valid for comparison
+        self.frame_pool = FramePool()
+        self.last_gray: Optional["np.ndarray"] = None
+        self.previous_gray: Optional["np.ndarray"] = None
+        self._gray_slot = 0
 
         logger.info(f"PageCapturer initialized: direction={direction.value}, "
-                   f"resolution={resolution.value}, speed={capture_speed}s")
+                   f"resolution={resolution.value}, speed={capture_speed}s"
+                   f"{' (auto-tuned)' if delay_tuner is not None else ''}")
 
-    def capture_page(self, region: Tuple[int, int, int, int], output_path: Path) -> Optional[Path]:
+    def capture_page(self, region: Tuple[int, int, int, int], output_path: Path,
+                     wait: bool = True) -> Optional[Path]:
         """
         Capture a screenshot of the specified region.
 
         Args:
             region: Tuple of (left, top, right, bottom) coordinates
             output_path: Path to save the screenshot
+            wait: Whether to wait for the page to stabilize first (False if
+                the caller already waited, e.g. after a checked page turn)
 
         Returns:
             Path to saved screenshot, or None if failed
         """
+        self.last_recaptures = 0
         try:
             # Wait for page to stabilize
-            time.sleep(self.capture_speed)
+            if wait and self.wait_for_page(region):
+                logger.debug("Capture cancelled while waiting for page")
+                return None
 
             # Calculate region dimensions
             left, top, right, bottom = region
@@ -69,15 +138,55 @@ class PageCapturer:
             logger.debug(f"Capturing region: ({left}, {top}, {right}, {bottom}) "
                         f"[{width}x{height}]")
 
-            # Take screenshot
-            screenshot = pyautogui.screenshot(region=(left, top, width, height))
+            while True:
+                # Take screenshot into the pooled raw buffer
+                frame = self.capture_source.grab_into((left, top, width, height), self.frame_pool)
+
+                # Auto-crop: measure early pages, then slice every page to the locked rectangle
+                sample_gray = None
+                if self.auto_cropper is not None:
+                    if self.auto_cropper.sampling:
+                        sample_gray = self.frame_pool.get('crop_sample', frame.shape[:2])
+                        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=sample_gray)
+                    else:
+                        frame = self.auto_cropper.crop(frame)
+
+                # Apply resolution scaling (into the pooled scaled buffer)
+                frame = self._apply_resolution_scaling(frame)
+
+                # Grayscale analysis frame (next pooled gray slot)
+                gray = self._next_gray(frame)
+
+                # Quality gate: grab again right away instead of saving a partial render
+                reason = self.quality_gate.check(gray) if self.quality_gate is not None else None
+                if reason is None:
+                    if self.quality_gate is not None:
+                        self.quality_gate.accept()
+                    break
+                if self.last_recaptures >= self.max_recaptures:
+                    logger.warning(f"Keeping frame after {self.last_recaptures} recaptures: {reason}")
+                    break
+
+                self.last_recaptures += 1
+                logger.info(f"Recapturing page ({reason})")
+                # A blank frame is as likely a blank page as an early grab
+                if self.delay_tuner is not None and reason != QualityGate.BLANK_FRAME:
+                    self.delay_tuner.record_bad_frame(reason)
+                if self.cancel_token.sleep(self.RECAPTURE_DELAY):
+                    logger.debug("Capture cancelled while waiting to recapture")
+                    return None
+
+            # Save screenshot (imencode + tofile also handles non-ASCII paths)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            ok, encoded = cv2.imencode('.png', frame, [cv2.IMWRITE_PNG_COMPRESSION, self.PNG_COMPRESSION])
+            if not ok:
+                raise ValueError("PNG encoding failed")
+            encoded.tofile(str(output_path))
 
-            # Apply resolution scaling
-            screenshot = self._apply_resolution_scaling(screenshot)
+            self._commit_gray(gray)
 
-            # Save screenshot
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            screenshot.save(str(output_path), 'PNG', optimize=False)
+            if sample_gray is not None and self.auto_cropper.observe(sample_gray, output_path):
+                self._lock_crop()
 
             logger.debug(f"Screenshot saved: {output_path}")
             return output_path
@@ -86,15 +195,208 @@ class PageCapturer:
             logger.error(f"Error capturing screenshot: {e}")
             return None
 
-    def _apply_resolution_scaling(self, image: Image.Image) -> Image.Image:
+    def wait_for_page(self, region: Tuple[int, int, int, int]) -> bool:
+        """
+        Wait for a freshly turned page to stabilize.
+
+        Args:
+            region: Tuple of (left, top, right, bottom) coordinates
+
+        Returns:
+            True if the wait was cancelled, False otherwise
+        """
+        if self.delay_tuner is not None:
+            return self._wait_for_settle(region)
+        return self.cancel_token.sleep(self.capture_speed)
+
+    def _wait_for_settle(self, region: Tuple[int, int, int, int]) -> bool:
+        """
+        Wait the tuned delay while measuring when the page stopped changing.
+
+        Low-resolution probe screenshots are compared during the delay. If
+        the screen is still changing when the delay runs out, the frame would
+        be torn, so the tuner backs off and the wait is extended.
+
+        Args:
+            region: Tuple of (left, top, right, bottom) coordinates
+
+        Returns:
+            True if the wait was cancelled, False otherwise
+        """
+        tuner = self.delay_tuner
+        start = self.clock.now()
+        last_change = start
+        changed = False
+        previous = self.grab_probe(region)
+
+        while True:
+            now = self.clock.now()
+            deadline = start + tuner.delay
+
+            if now >= deadline:
+                # A change on the last probe means the frame would be torn
+                if changed and now - start < tuner.MAX_DELAY:
+                    tuner.record_bad_frame("page still rendering")
+                    continue
+                break
+
+            if self.cancel_token.sleep(min(self.PROBE_INTERVAL, deadline - now)):
+                return True
+
+            probe = self.grab_probe(region)
+            if probe is None or previous is None:
+                # Probing unavailable: fall back to a plain wait
+                return self.cancel_token.sleep(max(deadline - self.clock.now(), 0))
+            changed = self.probes_differ(previous, probe)
+            if changed:
+                last_change = self.clock.now()
+            previous = probe
+
+        tuner.record_settle(last_change - start)
+        return False
+
+    def _lock_crop(self):
+        """Apply a newly locked crop to the sample pages and analysis frames."""
+        scale = self.resolution_scale
+        rewritten = self.auto_cropper.recrop_samples(scale)
+        logger.debug(f"Re-cropped {rewritten} sample pages")
+
+        # Keep consecutive analysis frames comparable
+        if self.last_gray is not None:
+            self.last_gray = self.auto_cropper.crop(self.last_gray, scale)
+        if self.previous_gray is not None:
+            self.previous_gray = self.auto_cropper.crop(self.previous_gray, scale)
+
+        # Volatile regions were given as fractions of the uncropped frame
+        if self.page_change_map is not None and self.auto_cropper.rect is not None:
+            self.page_change_map.apply_crop(self.auto_cropper.rect, self.auto_cropper.frame_shape)
+
+        # Reference pages were measured on uncropped frames
+        if self.quality_gate is not None:
+            self.quality_gate.reset()
+
+    def _next_gray(self, frame: "np.ndarray") -> "np.ndarray":
+        """
+        Convert a captured frame to grayscale into the next pooled gray slot.
+
+        The slot not holding last_gray is used, so the previous page stays
+        valid until the new frame is committed.
+
+        Args:
+            frame: BGR frame
+
+        Returns:
+            Grayscale frame (pooled buffer)
+        """
+        height, width = frame.shape[:2]
+        gray = self.frame_pool.get(f'gray{self._gray_slot}', (height, width))
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        return gray
+
+    def _commit_gray(self, gray: "np.ndarray"):
+        """
+        Make a saved page's grayscale frame the current analysis frame.
+
+        Args:
+            gray: Frame returned by _next_gray()
+        """
+        self._gray_slot ^= 1
+        self.previous_gray = self.last_gray
+        self.last_gray = gray
+
+    def grab_probe(self, region: Tuple[int, int, int, int]) -> Optional["np.ndarray"]:
+        """
+        Grab a small grayscale screenshot used only for change detection.
+
+        With a change map the probe is the frame's tile fingerprint. The grab
+        reuses the pooled raw buffer; only the small probe itself is a new
+        array, so probes taken before and after a turn can coexist.
+
+        Args:
+            region: Tuple of (left, top, right, bottom) coordinates
+
+        Returns:
+            Downscaled grayscale image, or None if failed
+        """
+        try:
+            left, top, right, bottom = region
+            width, height = right - left, bottom - top
+            frame = self.capture_source.grab_into((left, top, width, height), self.frame_pool)
+
+            if self.change_map is not None:
+                probe_size = self.change_map.fingerprint_size
+            else:
+                probe_size = (max(width // self.PROBE_REDUCE, 1), max(height // self.PROBE_REDUCE, 1))
+            small = self.frame_pool.get('probe', (probe_size[1], probe_size[0], 3))
+            cv2.resize(frame, probe_size, dst=small, interpolation=cv2.INTER_AREA)
+            return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        except Exception as e:
+            logger.debug(f"Probe capture failed: {e}")
+            return None
+
+    @staticmethod
+    def probe_difference(probe1: "np.ndarray", probe2: "np.ndarray") -> float:
+        """
+        Mean absolute pixel difference between two probes (0-255).
+
+        Args:
+            probe1: First probe image
+            probe2: Second probe image
+
+        Returns:
+            Mean absolute difference
+        """
+        if probe1.shape != probe2.shape:
+            return 255.0
+        return float(cv2.mean(cv2.absdiff(probe1, probe2))[0])
+
+    def probes_differ(self, probe1: "np.ndarray", probe2: "np.ndarray") -> bool:
+        """
+        Check whether two probes show different content.
+
+        With a change map, any changed tile outside the volatile regions
+        counts; otherwise the mean pixel difference is thresholded.
+
+        Args:
+            probe1: First probe image
+            probe2: Second probe image
+
+        Returns:
+            True if the probes differ
+        """
+        if self.change_map is not None and probe1.shape == probe2.shape:
+            return self.change_map.changed_fraction(probe1, probe2) > 0.0
+        return self.probe_difference(probe1, probe2) > self.PROBE_DIFF_THRESHOLD
+
+    def page_changed(self, before: Optional["np.ndarray"], after: Optional["np.ndarray"]) -> bool:
+        """
+        Check whether the screen changed between two probes.
+
+        Args:
+            before: Probe taken before a page turn
+            after: Probe taken after the page turn settled
+
+        Returns:
+            True if the probes differ (or either probe is missing)
+        """
+        if before is None or after is None:
+            return True
+        return self.probes_differ(before, after)
+
+    @property
+    def resolution_scale(self) -> float:
+        """Size of saved pages relative to the captured region."""
+        return self.MEDIUM_SCALE if self.resolution == Resolution.MEDIUM else 1.0
+
+    def _apply_resolution_scaling(self, image: "np.ndarray") -> "np.ndarray":
         """
         Apply resolution scaling based on resolution mode.
 
         Args:
-            image: Original screenshot
+            image: Original screenshot (BGR)
 
         Returns:
-            Scaled image
+            Scaled image (the input itself or a pooled buffer)
         """
         if self.resolution == Resolution.LOW:
             # No scaling
@@ -102,9 +404,12 @@ class PageCapturer:
 
         elif self.resolution == Resolution.MEDIUM:
             # Scale 1.5x for clarity
-            new_width = int(image.width * 1.5)
-            new_height = int(image.height * 1.5)
-            return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            height, width = image.shape[:2]
+            new_width = int(width * self.MEDIUM_SCALE)
+            new_height = int(height * self.MEDIUM_SCALE)
+            scaled = self.frame_pool.get('scaled', (new_height, new_width, 3))
+            cv2.resize(image, (new_width, new_height), dst=scaled, interpolation=cv2.INTER_LANCZOS4)
+            return scaled
 
         elif self.resolution == Resolution.HIGH:
             # High resolution - no additional scaling needed as we maximize window
@@ -133,8 +438,8 @@ class PageCapturer:
             logger.debug(f"Turning page: {key}")
 
             # Press key multiple times to ensure it registers
-            pyautogui.press(key)
-            time.sleep(0.1)
+            self.capture_source.press(key)
+            self.cancel_token.sleep(0.1)
 
             return True
 
@@ -157,19 +462,22 @@ class PageCapturer:
         filename = f"page_{page_number:04d}_{timestamp}.png"
         return temp_dir / filename
 
-    def wait_for_page_load(self, extra_delay: float = 0.0):
+    def wait_for_page_load(self, extra_delay: float = 0.0) -> bool:
         """
         Wait for page to finish loading/rendering.
 
         Args:
             extra_delay: Additional delay in seconds
+
+        Returns:
+            True if the wait was cancelled, False otherwise
         """
-        total_delay = self.capture_speed + extra_delay
+        base_delay = self.delay_tuner.delay if self.delay_tuner is not None else self.capture_speed
+        total_delay = base_delay + extra_delay
         logger.debug(f"Waiting {total_delay}s for page to load")
-        time.sleep(total_delay)
+        return self.cancel_token.sleep(total_delay)
 
-    @staticmethod
-    def click_window_center(region: Tuple[int, int, int, int]):
+    def click_window_center(self, region: Tuple[int, int, int, int]):
         """
         Click at the bottom-right corner of window to ensure focus.
         Uses corner position where links never exist.
@@ -185,8 +493,8 @@ class PageCapturer:
             click_y = int(top + (bottom - top) * 0.95)   # 95% from top
 
             logger.debug(f"Clicking window corner: ({click_x}, {click_y}) to avoid links")
-            pyautogui.click(click_x, click_y)
-            time.sleep(0.2)
+            self.capture_source.click(click_x, click_y)
+            self.cancel_token.sleep(0.2)
 
         except Exception as e:
             logger.error(f"Error clicking window: {e}")
@@ -203,7 +511,7 @@ class PageCapturer:
         """
         try:
             left, top, width, height = region[0], region[1], region[2] - region[0], region[3] - region[1]
-            test_screenshot = pyautogui.screenshot(region=(left, top, width, height))
+            test_screenshot = self.capture_source.screenshot((left, top, width, height))
             return test_screenshot is not None and test_screenshot.size[0] > 0
         except Exception as e:
             logger.error(f"Screenshot test failed: {e}")
@@ -0,0 +1,271 @@
+"""
+Parallel encoding of spooled page images into PDF image streams.
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+from ..models.export import EncoderSettings
+from ..utils.lazy_import import lazy_import
+from ..utils.logger import logger
+from .adaptive_quality import QualityCache, adaptive_jpeg
+from .image_codec import encode_lossy, pdf_image
+from .mrc import encode_mrc
+from .pdf_writer import PageImage, PDFImage
+from .png_stream import png_image
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+T = TypeVar("T")
+
+
+@dataclass
+class EncodeOptions:
+    """How spooled pages are encoded for the PDF."""
+
+    quality: int = 95                                    # JPEG quality (1-100; the maximum with ssim_floor)
+    grayscale: bool = False                              # Encode as DeviceGray
+    crop: Optional[Tuple[int, int, int, int]] = None     # (top, bottom, left, right) pixels
+    lossless: bool = False                               # Flate-compressed pixels instead of JPEG
+    blank_pages: bool = True                             # Write blank pages without an image
+    scale: float = 1.0                                   # Resize factor (below 1 downsamples)
+    mrc: bool = False                                    # Text mask over a low-resolution background
+    ssim_floor: float = 0.0                              # Lowest JPEG quality keeping this SSIM (0 = off)
+    encoder: EncoderSettings = field(default_factory=EncoderSettings)  # Lossy codec and settings
+
+
+# Blank page detection (on a 1/4 scale grayscale copy)
+BLANK_REDUCE = 4
+BLANK_CONTENT_THRESHOLD = 20   # Difference from background (0-255) counted as content
+BLANK_MIN_LEVEL = 230          # Only light pages are blank (an empty PDF page is white)
+BLANK_PNG_RATIO = 100          # PNGs compressed below raw size / ratio are checked for blankness
+
+
+def is_blank(image: "np.ndarray") -> bool:
+    """
+    Check whether a page image has no content.
+
+    Args:
+        image: BGR or grayscale page image
+
+    Returns:
+        True if the page is a light background with nothing on it
+    """
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape
+    small = cv2.resize(gray, (max(width // BLANK_REDUCE, 1), max(height // BLANK_REDUCE, 1)),
+                       interpolation=cv2.INTER_AREA)
+    background = int(np.median(small))
+    if background < BLANK_MIN_LEVEL:
+        return False
+    return not (cv2.absdiff(small, background) > BLANK_CONTENT_THRESHOLD).any()
+
+
+def blank_page(width: int, height: int) -> PDFImage:
+    """Placeholder for a page written without an image."""
+    return PDFImage(data=b'', filter="", width=width, height=height, blank=True)
+
+
+def default_workers() -> int:
+    """Worker count used when none is configured."""
+    return min(os.cpu_count() or 1, 8)
+
+
+def passthrough_png(data: bytes, options: EncodeOptions) -> Optional[PDFImage]:
+    """
+    Embed a PNG page without decoding it, if the options allow.
+
+    Only PNGs that compress suspiciously well are decoded, to check
+    whether they are blank.
+
+    Args:
+        data: PNG file contents
+        options: Encoding options (lossless, no crop, no scaling)
+
+    Returns:
+        Image stream or blank placeholder, or None if the page must be decoded
+    """
+    if not options.lossless or options.crop is not None or options.scale != 1.0:
+        return None
+    image = png_image(data, grayscale=options.grayscale)
+    if image is None:
+        return None
+
+    raw_size = image.width * image.height * image.decode_parms['Colors'] * image.bpc // 8
+    if not options.blank_pages or len(image.data) * BLANK_PNG_RATIO > raw_size:
+        return image
+    pixels = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if pixels is not None and is_blank(pixels):
+        return blank_page(image.width, image.height)
+    return image
+
+
+def encode_image(image: "np.ndarray", options: EncodeOptions, blank: Optional[bool] = None,
+                 cache: Optional[QualityCache] = None) -> Optional[PageImage]:
+    """
+    Encode a decoded (and cropped) page image.
+
+    Converts to grayscale and rescales as the options say, then encodes
+    with the options' lossy codec (see encode_lossy(); JPEG by default)
+    or, in lossless mode, as PNG data (see png_image()). In MRC mode,
+    pages with text are split into MRC layers (see encode_mrc()); pages
+    without text are still encoded as one image. With an SSIM floor,
+    each page gets the lowest quality that keeps it (see adaptive_jpeg()).
+
+    Args:
+        image: BGR or grayscale page image
+        options: Encoding options (crop is not applied here)
+        blank: Whether the page is blank, if already known
+        cache: Quality per page class for the SSIM floor search
+
+    Returns:
+        Encoded image or blank placeholder, or None if encoding failed
+    """
+    if options.grayscale and image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    if options.scale != 1.0:
+        height, width = image.shape[:2]
+        size = (max(round(width * options.scale), 1), max(round(height * options.scale), 1))
+        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    height, width = image.shape[:2]
+    if options.blank_pages and (blank if blank is not None else is_blank(image)):
+        return blank_page(width, height)
+
+    if options.lossless:
+        ok, encoded = cv2.imencode('.png', image)
+        return png_image(encoded.tobytes()) if ok else None
+
+    if options.mrc:
+        layers = encode_mrc(image, options.quality, options.encoder)
+        if layers is not None:
+            return layers
+
+    if options.ssim_floor > 0:
+        data = adaptive_jpeg(image, options.quality, options.ssim_floor, cache, options.encoder)
+    else:
+        data = encode_lossy(image, options.quality, options.encoder)
+    if data is None:
+        return None
+    return pdf_image(data, image, options.encoder)
+
+
+def load_page(data: "np.ndarray", options: EncodeOptions) -> Optional["np.ndarray"]:
+    """
+    Decode a page file and apply the crop.
+
+    Args:
+        data: Page file contents
+        options: Encoding options (grayscale and crop are used)
+
+    Returns:
+        Page image (a view when cropped), or None if it could not be decoded
+    """
+    flags = cv2.IMREAD_GRAYSCALE if options.grayscale else cv2.IMREAD_COLOR
+    image = cv2.imdecode(data, flags)
+    if image is not None and options.crop is not None:
+        top, bottom, left, right = options.crop
+        image = image[top:bottom, left:right]
+    return image
+
+
+def encode_page(image_path: Path, options: EncodeOptions,
+                cache: Optional[QualityCache] = None) -> Optional[PageImage]:
+    """
+    Load a spooled page and encode it as a JPEG image stream.
+
+    In lossless mode, an uncropped PNG page is embedded without decoding
+    (see passthrough_png()); other pages are decoded and re-compressed as
+    PNG data, which is lossless too. Blank pages are returned as blank
+    placeholders (see is_blank()).
+
+    Args:
+        image_path: Spooled page image
+        options: Encoding options
+        cache: Quality per page class for the SSIM floor search
+
+    Returns:
+        Encoded image, or None if the page could not be read
+    """
+    try:
+        data = np.fromfile(str(image_path), dtype=np.uint8)
+        if options.lossless:
+            image = passthrough_png(data.tobytes(), options)
+            if image is not None:
+                return image
+
+        pixels = load_page(data, options)
+        if pixels is None:
+            logger.warning(f"Failed to load image {image_path}")
+            return None
+
+        image = encode_image(pixels, options, cache=cache)
+        if image is None:
+            logger.warning(f"Failed to encode image {image_path}")
+        return image
+
+    except Exception as e:
+        logger.warning(f"Failed to encode image {image_path}: {e}")
+        return None
+
+
+def ordered_map(func: Callable[[Path], T], image_paths: List[Path],
+                workers: Optional[int] = None) -> Iterator[Tuple[Path, T]]:
+    """
+    Apply a per-page function in parallel, yielding results in page order.
+
+    OpenCV releases the GIL while decoding and encoding, so a thread pool
+    scales across cores. At most a few pages per worker are in flight, so
+    memory stays bounded however long the book is.
+
+    Args:
+        func: Function of one page path
+        image_paths: Page images in page order
+        workers: Number of threads (default: CPU count, max 8)
+
+    Yields:
+        Tuples of (image_path, result)
+    """
+    workers = workers or default_workers()
+    if workers <= 1 or len(image_paths) <= 1:
+        for path in image_paths:
+            yield path, func(path)
+        return
+
+    max_in_flight = workers * 2
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page-encoder") as executor:
+        pending = deque()
+        paths = iter(image_paths)
+        for path in paths:
+            pending.append((path, executor.submit(func, path)))
+            if len(pending) >= max_in_flight:
+                break
+
+        while pending:
+            path, future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append((next_path, executor.submit(func, next_path)))
+            yield path, future.result()
+
+
+def encode_pages(image_paths: List[Path], options: EncodeOptions, workers: Optional[int] = None,
+                 cache: Optional[QualityCache] = None) -> Iterator[Tuple[Path, Optional[PageImage]]]:
+    """
+    Encode pages in parallel, yielding results in page order.
+
+    Args:
+        image_paths: Spooled page images in page order
+        options: Encoding options
+        workers: Number of encoder threads (default: CPU count, max 8)
+        cache: Quality per page class for the SSIM floor search, shared
+            by the threads
+
+    Yields:
+        Tuples of (image_path, encoded image or None)
+    """
+    return ordered_map(lambda path: encode_page(path, options, cache), image_paths, workers)
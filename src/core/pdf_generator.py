@@ -1,32 +1,176 @@
 """
 PDF generation from image files.
 """
+import math
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
-from PIL import Image
+from typing import Dict, List, Optional, Tuple
 
+from ..models.config import ScanConfig
+from ..models.export import EncoderSettings, ExportProfile
 from ..utils.logger import logger
+from .adaptive_quality import QualityCache
+from .fanout import FanOutExporter
+from .page_encoder import EncodeOptions, default_workers, encode_pages
+from .pdf_linearize import linearize_pdf
+from .pdf_merge import merge_pdfs
+from .pdf_writer import PDFWriter
+
+
+def write_pdf(image_paths: List[Path], output_path: Path, title: Optional[str],
+              options: EncodeOptions, workers: int, first_number: int = 1,
+              page_numbers: bool = False, page_labels: bool = False,
+              linearize: bool = False, object_streams: bool = False) -> List[int]:
+    """
+    Encode pages and stream them into a PDF.
+
+    Module-level so it can run in a worker process. With an SSIM floor,
+    the quality chosen per page class is shared by the pages of this PDF
+    (each chunk of a chunked build searches its own).
+
+    Args:
+        image_paths: Page images in order
+        output_path: Output PDF file path
+        title: PDF title metadata
+        options: Encoding options
+        workers: Encoder threads
+        first_number: Page number of the first image (later ones count up
+            by position, so a page that fails to load leaves a gap)
+        page_numbers: Draw page numbers on the pages
+        page_labels: Record page numbers as page labels
+        linearize: Rewrite the finished PDF for fast web view
+        object_streams: Pack small objects into object streams (PDF 1.5)
+
+    Returns:
+        Page numbers of the written pages (empty means no PDF was written)
+    """
+    writer = PDFWriter(output_path, title=title, page_numbers=page_numbers,
+                       page_labels=page_labels, object_streams=object_streams)
+    cache = QualityCache() if options.ssim_floor > 0 else None
+    numbers = []
+    try:
+        for number, (img_path, image) in enumerate(encode_pages(image_paths, options, workers, cache),
+                                                   start=first_number):
+            if image is None:
+                continue
+            writer.add_page(image, number)
+            numbers.append(number)
+            logger.debug(f"Added page: {img_path.name}")
+    except BaseException:
+        writer.abort()
+        raise
+
+    if not numbers:
+        writer.abort()
+        return []
+
+    writer.close()
+    if cache is not None:
+        logger.info(f"Adaptive quality for {output_path.name}: {cache.summary()}")
+    if linearize:
+        linearize_pdf(output_path)
+    return numbers
 
 
 class PDFGenerator:
     """Generates PDF files from images."""
 
-    def __init__(self, quality: int = 95):
+    # PDF size relative to the captured page files (rough estimate)
+    COMPRESSION_FACTOR = 0.8
+
+    # Smallest chunk worth a worker process in chunked builds
+    MIN_CHUNK_PAGES = 25
+
+    def __init__(self, quality: int = 95, grayscale: bool = False,
+                 crop: Optional[Tuple[int, int, int, int]] = None,
+                 workers: Optional[int] = None, processes: int = 0,
+                 lossless: bool = False, blank_pages: bool = True,
+                 page_numbers: bool = False, page_labels: bool = False,
+                 linearize: bool = False, object_streams: bool = False, mrc: bool = False,
+                 ssim_floor: float = 0.0, encoder: Optional[EncoderSettings] = None):
         """
         Initialize PDF generator.
 
         Args:
-            quality: JPEG compression quality for images (1-100)
+            quality: JPEG compression quality for images (1-100; the
+                highest quality used with ssim_floor)
+            grayscale: Encode pages in grayscale
+            crop: Crop rectangle (top, bottom, left, right) applied to every page
+            workers: Parallel encoder threads (default: CPU count, max 8)
+            processes: Worker processes for chunked builds (0 or 1: build in this process)
+            lossless: Embed pages losslessly (PNG data as is) instead of as JPEG
+            blank_pages: Write blank pages as empty pages without an image
+            page_numbers: Draw page numbers on the pages (as PDF text, not into the images)
+            page_labels: Record page numbers as PDF page labels
+            linearize: Write linearized PDFs (fast web view: page 1 shows
+                before the whole file is read)
+            object_streams: Write PDF 1.5 object streams and a compressed
+                cross-reference stream (smaller, faster to open for large
+                books; not combined with linearize)
+            mrc: Encode pages with text as mixed raster content: a full
+                resolution text mask over a low-resolution background
+                (ignored with lossless)
+            ssim_floor: Encode each JPEG page at the lowest quality whose
+                SSIM against the page stays at or above this (0 = always
+                use quality)
+            encoder: Lossy codec and its settings (default: OpenCV JPEG)
         """
         self.quality = quality
-        logger.info(f"PDFGenerator initialized with quality: {quality}")
+        self.options = EncodeOptions(quality=quality, grayscale=grayscale, crop=crop,
+                                     lossless=lossless, blank_pages=blank_pages,
+                                     mrc=mrc and not lossless, ssim_floor=ssim_floor,
+                                     encoder=encoder or EncoderSettings())
+        self.workers = workers or default_workers()
+        self.processes = processes
+        self.page_numbers = page_numbers
+        self.page_labels = page_labels
+        self.linearize = linearize
+        self.object_streams = object_streams
+        if linearize and object_streams:
+            logger.warning("Object streams are not used in linearized PDFs")
+            self.object_streams = False
+        logger.info(f"PDFGenerator initialized with quality: {'lossless' if lossless else quality}"
+                   f"{f', codec: {encoder.codec}' if encoder and not lossless else ''}"
+                   f"{f', SSIM floor: {ssim_floor}' if ssim_floor and not lossless else ''}"
+                   f"{', grayscale' if grayscale else ''}{', MRC' if self.options.mrc else ''}"
+                   f"{f', crop: {crop}' if crop else ''}, workers: {self.workers}"
+                   f"{f', processes: {processes}' if processes > 1 else ''}")
+
+    @classmethod
+    def from_config(cls, config: ScanConfig, workers: Optional[int] = None) -> "PDFGenerator":
+        """
+        Create a PDF generator with a scan configuration's PDF settings.
+
+        Args:
+            config: Scan configuration
+            workers: Parallel encoder threads (default: CPU count, max 8)
+
+        Returns:
+            PDF generator
+        """
+        return cls(quality=config.pdf_quality, workers=workers,
+                   processes=config.pdf_processes, lossless=config.pdf_lossless,
+                   page_numbers=config.pdf_page_numbers, page_labels=config.pdf_page_labels,
+                   linearize=config.pdf_linearize, object_streams=config.pdf_object_streams,
+                   mrc=config.pdf_mrc, ssim_floor=config.pdf_ssim_floor,
+                   encoder=config.pdf_encoder)
+
+    @property
+    def chunked(self) -> bool:
+        """Whether PDFs are built in worker processes."""
+        return self.processes > 1
 
     def create_pdf(self, image_paths: List[Path], output_path: Path,
                    title: Optional[str] = None) -> Optional[Path]:
         """
         Create a PDF from a list of images.
 
+        Pages are encoded in parallel and streamed into the PDF in order,
+        so memory use does not grow with the number of pages. With worker
+        processes configured, chunks of pages are built as separate PDFs
+        in parallel and then concatenated without re-encoding.
+
         Args:
             image_paths: List of image file paths
             output_path: Output PDF file path
@@ -42,53 +186,15 @@ class PDFGenerator:
         try:
             logger.info(f"Creating PDF with {len(image_paths)} images")
 
-            # Load all images
-            images = []
-            for img_path in image_paths:
-                try:
-                    img = Image.open(img_path)
-                    # Convert to RGB if necessary (PDF requires RGB)
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    images.append(img)
-                    logger.debug(f"Loaded image: {img_path.name}")
-                except Exception as e:
-                    logger.warning(f"Failed to load image {img_path}: {e}")
-                    continue
+            if self.chunked and len(image_paths) >= 2 * self.MIN_CHUNK_PAGES:
+                numbers = self._create_pdf_chunked(image_paths, output_path, title)
+            else:
+                numbers = self._write(image_paths, output_path, title, 1, self.workers)
 
-            if not images:
+            if not numbers:
                 logger.error("No valid images could be loaded")
                 return None
 
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Create PDF
-            first_image = images[0]
-            remaining_images = images[1:] if len(images) > 1 else []
-
-            # Set up PDF metadata
-            pdf_metadata = {
-                'Title': title or f'Kindle Scan {datetime.now().strftime("%Y-%m-%d")}',
-                'Author': 'AK Auto-Scanner',
-                'Subject': 'Scanned book pages',
-                'Creator': 'AK Auto-Scanner',
-                'Producer': 'Pillow',
-                'CreationDate': datetime.now(),
-            }
-
-            # Save as PDF
-            first_image.save(
-                str(output_path),
-                'PDF',
-                resolution=100.0,
-                save_all=True,
-                append_images=remaining_images,
-                quality=self.quality,
-                optimize=False,
-                **pdf_metadata
-            )
-
             logger.info(f"PDF created successfully: {output_path}")
             logger.info(f"PDF size: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
 
@@ -124,6 +230,99 @@ class PDFGenerator:
 
         return self.create_pdf(image_paths, output_path)
 
+    def _write(self, image_paths: List[Path], output_path: Path, title: Optional[str],
+               first_number: int, workers: int) -> List[int]:
+        """write_pdf() with this generator's settings."""
+        return write_pdf(image_paths, output_path, title, self.options, workers,
+                         first_number, self.page_numbers, self.page_labels, self.linearize,
+                         self.object_streams)
+
+    def _build_parts(self, parts: List[Tuple[List[Path], Path, Optional[str], int]],
+                     final: bool) -> List[List[int]]:
+        """
+        Build several PDFs in parallel worker processes.
+
+        Each process encodes its pages with a share of the encoder threads.
+
+        Args:
+            parts: Tuples of (page images, output path, title, first page number)
+            final: The parts are finished PDFs, not chunks that are merged later
+                (chunks are written plain: no linearization or object streams)
+
+        Returns:
+            Page numbers written per part, in the same order
+        """
+        processes = min(self.processes, len(parts))
+        workers = max(self.workers // processes, 1)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(write_pdf, pages, path, title, self.options, workers,
+                                       first_number, self.page_numbers, self.page_labels,
+                                       final and self.linearize, final and self.object_streams)
+                       for pages, path, title, first_number in parts]
+            return [future.result() for future in futures]
+
+    def _create_pdf_chunked(self, image_paths: List[Path], output_path: Path,
+                            title: Optional[str]) -> List[int]:
+        """
+        Build chunks in parallel, then merge them into one PDF.
+
+        Args:
+            image_paths: Page images in order
+            output_path: Output PDF file path
+            title: PDF title metadata
+
+        Returns:
+            Page numbers of the pages in the merged PDF
+        """
+        # A few chunks per process, so a slow chunk does not idle the others
+        chunk_size = max(math.ceil(len(image_paths) / (self.processes * 2)), self.MIN_CHUNK_PAGES)
+        chunk_dir = output_path.parent / f".{output_path.stem}_chunks"
+        chunk_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            parts = [(image_paths[i:i + chunk_size], chunk_dir / f"chunk_{i // chunk_size:04d}.pdf",
+                      None, i + 1)
+                     for i in range(0, len(image_paths), chunk_size)]
+            results = self._build_parts(parts, final=False)
+            built = [part[1] for part, numbers in zip(parts, results) if numbers]
+            numbers = [number for part_numbers in results for number in part_numbers]
+            if not built:
+                return []
+
+            logger.info(f"Built {len(built)} chunks in parallel, merging")
+            merge_pdfs(built, output_path, title=title, page_labels=self.page_labels,
+                       numbers=numbers, object_streams=self.object_streams)
+            if self.linearize:
+                linearize_pdf(output_path)
+            return numbers
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+
+    def export(self, image_paths: List[Path], profiles: List[ExportProfile],
+               output_dir: Path, name: str, title: str) -> Dict[str, List[Path]]:
+        """
+        Create one PDF (or set of volumes) per export profile in a single pass.
+
+        Each page is decoded once for all profiles (see FanOutExporter).
+        This generator's crop, blank page and page number settings apply
+        to every profile; quality, colour, DPI and splitting come from the
+        profiles.
+
+        Args:
+            image_paths: List of image file paths
+            profiles: Output profiles
+            output_dir: Output directory
+            name: File name prefix (files are <name>_<profile>.pdf)
+            title: PDF title metadata
+
+        Returns:
+            Created PDFs per profile name (empty if the export failed)
+        """
+        exporter = FanOutExporter(profiles, crop=self.options.crop, workers=self.workers,
+                                  blank_pages=self.options.blank_pages,
+                                  page_numbers=self.page_numbers, page_labels=self.page_labels,
+                                  linearize=self.linearize, object_streams=self.object_streams)
+        return exporter.export(image_paths, output_dir, name, title)
+
     def estimate_pdf_size(self, image_paths: List[Path]) -> float:
         """
         Estimate the size of the resulting PDF in MB.
@@ -147,27 +346,41 @@ class PDFGenerator:
                     total_size += img_path.stat().st_size
 
             avg_size_per_image = total_size / sample_size
-            estimated_total = avg_size_per_image * len(image_paths)
-
-            # PDF compression factor (rough estimate)
-            compression_factor = 0.8
-
-            estimated_mb = (estimated_total * compression_factor) / 1024 / 1024
-            return estimated_mb
+            return self.project_pdf_size(avg_size_per_image, len(image_paths))
 
         except Exception as e:
             logger.error(f"Error estimating PDF size: {e}")
             return 0.0
 
+    def project_pdf_size(self, bytes_per_page: float, page_count: int) -> float:
+        """
+        Project the PDF size in MB from an average captured page size.
+
+        Args:
+            bytes_per_page: Average size of a captured page file in bytes
+            page_count: Number of pages the PDF will contain
+
+        Returns:
+            Projected size in MB
+        """
+        estimated_total = bytes_per_page * page_count
+        return (estimated_total * self.COMPRESSION_FACTOR) / 1024 / 1024
+
     def split_pdf(self, image_paths: List[Path], output_dir: Path,
-                  pages_per_pdf: int = 100) -> List[Path]:
+                  pages_per_pdf: int = 100, name: str = "kindle_scan",
+                  title: str = "Kindle Scan") -> List[Path]:
         """
         Create multiple PDFs if there are too many pages.
 
+        With worker processes configured, the parts are built in parallel.
+        Page numbers continue across the parts.
+
         Args:
             image_paths: List of image file paths
             output_dir: Output directory for PDFs
             pages_per_pdf: Maximum pages per PDF file
+            name: File name prefix of the parts
+            title: Title prefix of the parts
 
         Returns:
             List of created PDF paths
@@ -179,75 +392,27 @@ class PDFGenerator:
         pdf_paths = []
 
         # Split images into chunks
+        parts = []
         for i in range(0, len(image_paths), pages_per_pdf):
-            chunk = image_paths[i:i + pages_per_pdf]
             chunk_num = (i // pages_per_pdf) + 1
+            parts.append((image_paths[i:i + pages_per_pdf],
+                          output_dir / f"{name}_part{chunk_num}.pdf",
+                          f"{title} Part {chunk_num}", i + 1))
 
-            output_path = output_dir / f"kindle_scan_part{chunk_num}.pdf"
-            pdf_path = self.create_pdf(chunk, output_path,
-                                      title=f"Kindle Scan Part {chunk_num}")
-
-            if pdf_path:
-                pdf_paths.append(pdf_path)
-
-        logger.info(f"Created {len(pdf_paths)} PDF files")
-        return pdf_paths
-
-    def add_page_numbers(self, image_paths: List[Path],
-                        output_dir: Path) -> List[Path]:
-        """
-        Add page numbers to images before creating PDF.
-
-        Args:
-            image_paths: List of image file paths
-            output_dir: Output directory for numbered images
-
-        Returns:
-            List of paths to numbered images
-        """
-        from PIL import ImageDraw, ImageFont
-
-        output_dir.mkdir(parents=True, exist_ok=True)
-        numbered_paths = []
-
-        for idx, img_path in enumerate(image_paths, start=1):
+        if self.chunked and len(parts) > 1:
             try:
-                img = Image.open(img_path)
-                draw = ImageDraw.Draw(img)
-
-                # Calculate position (bottom center)
-                text = str(idx)
-                # Use default font since custom fonts may not be available
-                font = ImageFont.load_default()
-
-                # Get text size using textbbox
-                bbox = draw.textbbox((0, 0), text, font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-
-                x = (img.width - text_width) // 2
-                y = img.height - text_height - 20
-
-                # Draw text with outline for visibility
-                outline_color = "white"
-                text_color = "black"
-
-                # Draw outline
-                for adj_x in [-1, 0, 1]:
-                    for adj_y in [-1, 0, 1]:
-                        draw.text((x + adj_x, y + adj_y), text, font=font, fill=outline_color)
-
-                # Draw main text
-                draw.text((x, y), text, font=font, fill=text_color)
-
-                # Save numbered image
-                output_path = output_dir / f"numbered_{img_path.name}"
-                img.save(output_path)
-                numbered_paths.append(output_path)
-
+                results = self._build_parts(parts, final=True)
             except Exception as e:
-                logger.warning(f"Failed to add page number to {img_path}: {e}")
-                # Use original image if numbering fails
-                numbered_paths.append(img_path)
+                logger.error(f"Error creating PDF parts: {e}")
+                return []
+            pdf_paths = [part[1] for part, numbers in zip(parts, results) if numbers]
+        else:
+            for chunk, output_path, part_title, first_number in parts:
+                try:
+                    if self._write(chunk, output_path, part_title, first_number, self.workers):
+                        pdf_paths.append(output_path)
+                except Exception as e:
+                    logger.error(f"Error creating PDF {output_path}: {e}")
 
-        return numbered_paths
+        logger.info(f"Created {len(pdf_paths)} PDF files")
+        return pdf_paths
@@ -0,0 +1,331 @@
+"""
+Linearization (fast web view) of PDFs produced by PDFWriter.
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..utils.logger import logger
+from .pdf_merge import REFERENCE, PDFPartReader, renumber_head, split_stream
+from .pdf_writer import PDF_HEADER
+
+
+class _BitWriter:
+    """Packs unsigned integers most significant bit first, as hint tables require."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._value = 0
+        self._bits = 0
+
+    def write(self, value: int, bits: int):
+        """Append a value using the given number of bits."""
+        for shift in range(bits - 1, -1, -1):
+            self._value = (self._value << 1) | ((value >> shift) & 1)
+            self._bits += 1
+            if self._bits == 8:
+                self.data.append(self._value)
+                self._value = 0
+                self._bits = 0
+
+    def flush(self):
+        """Pad to the next byte boundary."""
+        if self._bits:
+            self.write(0, 8 - self._bits)
+
+
+def _bits(value: int) -> int:
+    """Number of bits needed for a non-negative value."""
+    return value.bit_length()
+
+
+class Linearizer:
+    """
+    Rewrites a PDF in linearized order, so viewers can show page 1 first.
+
+    The file is laid out as the PDF specification (Annex F) describes:
+    a linearization dictionary and a small cross-reference section for
+    the first page, the catalog, the hint stream, the first page's
+    objects, every other page's objects in page order, objects shared by
+    several pages, and finally the page tree, document info and the main
+    cross-reference table. Objects are renumbered so the first-page
+    section has the highest numbers.
+
+    Objects are copied from the source file one at a time (stream data
+    byte for byte); only dictionaries are rewritten. All offsets are
+    computed from object sizes before anything is written, since the
+    hint tables record offsets as if the hint stream were absent.
+    """
+
+    def __init__(self, source: Path):
+        """
+        Read the object map of a PDF written by PDFWriter.
+
+        Args:
+            source: PDF to linearize
+
+        Raises:
+            ValueError: If the file does not have PDFWriter's layout
+        """
+        self.reader = PDFPartReader(source)
+        self._heads: Dict[int, bytes] = {}
+
+    def _head(self, object_id: int) -> bytes:
+        """Dictionary of an object (cached; stream data is not read)."""
+        head = self._heads.get(object_id)
+        if head is None:
+            head = self.reader.read_head(object_id)
+            self._heads[object_id] = head
+        return head
+
+    def _page_objects(self, page_id: int) -> List[int]:
+        """A page object followed by everything it needs, except the page tree."""
+        objects = [page_id]
+        seen = {page_id, self.reader.pages_id, self.reader.root_id}
+        for object_id in objects:
+            for ref in REFERENCE.findall(self._head(object_id)):
+                ref = int(ref)
+                if ref not in seen:
+                    seen.add(ref)
+                    objects.append(ref)
+        return objects
+
+    def write(self, output_path: Path) -> Path:
+        """
+        Write the linearized PDF.
+
+        Args:
+            output_path: Output file (must differ from the source)
+
+        Returns:
+            Path of the linearized PDF
+        """
+        reader = self.reader
+        pages = [self._page_objects(page_id) for page_id in reader.page_ids]
+        if not pages:
+            raise ValueError(f"{reader.path}: no pages to linearize")
+
+        # Partition the objects: first page, other pages, shared, the rest
+        first_page = pages[0]
+        assigned = set(first_page)
+        use_count: Dict[int, int] = {}
+        for objects in pages[1:]:
+            for object_id in objects:
+                use_count[object_id] = use_count.get(object_id, 0) + 1
+        shared = [object_id for object_id, count in use_count.items()
+                  if count > 1 and object_id not in assigned]
+        assigned.update(shared)
+        private = []
+        for objects in pages[1:]:
+            own = [object_id for object_id in objects if object_id not in assigned]
+            assigned.update(own)
+            private.append(own)
+        other = [reader.pages_id] + ([reader.info_id] if reader.info_id else [])
+        other += sorted(object_id for object_id in reader.offsets
+                        if object_id not in assigned and object_id not in other
+                        and object_id != reader.root_id)
+
+        # Number the later parts 1..m-1, then the first-page section m..size-1
+        tail = [object_id for own in private for object_id in own] + shared + other
+        id_map = {object_id: number for number, object_id in enumerate(tail, start=1)}
+        first_number = len(tail) + 1
+        linearized_id, catalog_id, hint_id = first_number, first_number + 1, first_number + 2
+        id_map[reader.root_id] = catalog_id
+        for number, object_id in enumerate(first_page, start=hint_id + 1):
+            id_map[object_id] = number
+        size = hint_id + 1 + len(first_page)
+
+        # Serialized size of every copied object
+        heads = {object_id: renumber_head(self._head(object_id), id_map)
+                 for object_id in reader.offsets}
+        lengths = {object_id: len(b'%d 0 obj\n' % id_map[object_id]) + len(heads[object_id])
+                   + reader.content_length(object_id) - len(self._head(object_id))
+                   + len(b'\nendobj\n')
+                   for object_id in reader.offsets}
+
+        # Fixed-size parts before the catalog
+        info_id = id_map[reader.info_id] if reader.info_id else None
+        section_count = size - first_number
+        linearized_length = len(self._linearization_dict(linearized_id, 0, 0, 0, 0, 0, 0, 0))
+        first_xref_offset = len(PDF_HEADER) + linearized_length
+        catalog_offset = first_xref_offset + len(self._first_xref(
+            first_number, [0] * section_count, catalog_id, info_id, 0))
+
+        # Offsets without the hint stream (hint tables use these)
+        offsets: Dict[int, int] = {}
+        position = catalog_offset + lengths[reader.root_id]
+        for object_id in first_page + tail:
+            offsets[object_id] = position
+            position += lengths[object_id]
+        first_page_end = offsets[first_page[-1]] + lengths[first_page[-1]]
+
+        hint = self._hint_stream(hint_id, pages, private, shared, offsets, lengths,
+                                 id_map, first_page_end)
+        shift = len(hint)
+        for object_id in offsets:
+            offsets[object_id] += shift
+        offsets[reader.root_id] = catalog_offset
+        hint_offset = catalog_offset + lengths[reader.root_id]
+
+        # Readers start at the first-page section, whose trailer points here
+        main_xref_offset = position + shift
+        main_xref = (b'xref\n0 %d\n' % first_number + b'0000000000 65535 f \n'
+                     + b''.join(b'%010d 00000 n \n' % offsets[object_id] for object_id in tail)
+                     + b'trailer\n<< /Size %d >>\n' % first_number
+                     + b'startxref\n%d\n%%%%EOF\n' % first_xref_offset)
+        file_length = main_xref_offset + len(main_xref)
+
+        section_offsets = [len(PDF_HEADER), catalog_offset, hint_offset] + [
+            offsets[object_id] for object_id in first_page]
+
+        with open(output_path, 'wb') as f:
+            f.write(PDF_HEADER)
+            f.write(self._linearization_dict(
+                linearized_id, file_length, hint_offset, shift, id_map[first_page[0]],
+                first_page_end + shift, len(pages),
+                # White-space before the first main xref entry
+                main_xref_offset + len(b'xref\n0 %d' % first_number)
+            ))
+            f.write(self._first_xref(first_number, section_offsets, catalog_id, info_id,
+                                     main_xref_offset))
+            self._copy(f, reader.root_id, id_map, heads)
+            f.write(hint)
+            for object_id in first_page + tail:
+                self._copy(f, object_id, id_map, heads)
+            f.write(main_xref)
+            if f.tell() != file_length:
+                raise ValueError(f"Linearized layout mismatch ({f.tell()} != {file_length} bytes)")
+
+        return Path(output_path)
+
+    def _copy(self, f, object_id: int, id_map: Dict[int, int], heads: Dict[int, bytes]):
+        """Copy one object under its new number, with its dictionary rewritten."""
+        _, stream = split_stream(self.reader.read_object(object_id))
+        f.write(b'%d 0 obj\n' % id_map[object_id])
+        f.write(heads[object_id])
+        f.write(stream)
+        f.write(b'\nendobj\n')
+
+    @staticmethod
+    def _linearization_dict(object_id: int, file_length: int, hint_offset: int,
+                            hint_length: int, first_page_id: int, first_page_end: int,
+                            page_count: int, main_xref_entries: int) -> bytes:
+        """Linearization parameter dictionary (fixed width, so it can be sized in advance)."""
+        return (b'%d 0 obj\n<< /Linearized 1 /L %010d /H [ %010d %010d ] /O %010d '
+                b'/E %010d /N %010d /T %010d >>\nendobj\n'
+                % (object_id, file_length, hint_offset, hint_length, first_page_id,
+                   first_page_end, page_count, main_xref_entries))
+
+    @staticmethod
+    def _first_xref(first_number: int, offsets: List[int], catalog_id: int,
+                    info_id: Optional[int], main_xref_offset: int) -> bytes:
+        """First-page cross-reference section and trailer (fixed width)."""
+        entries = b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+        info = b' /Info %d 0 R' % info_id if info_id else b''
+        return (b'xref\n%d %d\n' % (first_number, len(offsets)) + entries
+                + b'trailer\n<< /Size %d /Root %d 0 R%s /Prev %010d >>\n'
+                % (first_number + len(offsets), catalog_id, info, main_xref_offset)
+                + b'startxref\n0\n%%EOF\n')
+
+    def _hint_stream(self, hint_id: int, pages: List[List[int]], private: List[List[int]],
+                     shared: List[int], offsets: Dict[int, int], lengths: Dict[int, int],
+                     id_map: Dict[int, int], first_page_end: int) -> bytes:
+        """
+        Primary hint stream: page offset and shared object hint tables.
+
+        Args:
+            hint_id: Object number of the hint stream
+            pages: Objects every page needs, page object first (the first
+                page's objects all count as shared object entries)
+            private: Objects of each later page, page object first
+            shared: Objects shared by later pages, outside the first page
+            offsets: Object offsets without the hint stream
+            lengths: Serialized object lengths
+            id_map: Old to new object numbers
+            first_page_end: Offset after the first page's objects
+
+        Returns:
+            Serialized hint stream object
+        """
+        # Shared object identifiers: first page objects, then the shared section
+        first_page = pages[0]
+        identifiers = {object_id: index for index, object_id in enumerate(first_page + shared)}
+
+        object_counts = [len(first_page)] + [len(own) for own in private]
+        page_lengths = [first_page_end - offsets[first_page[0]]] + [
+            sum(lengths[object_id] for object_id in own) for own in private]
+        # Everything a page needs counts, also objects reached indirectly
+        # (e.g. the /Mask of a shared image)
+        page_shared = [[]] + [
+            sorted({identifiers[object_id] for object_id in objects if object_id in identifiers})
+            for objects in pages[1:]
+        ]
+
+        min_objects = min(object_counts)
+        objects_bits = _bits(max(object_counts) - min_objects)
+        min_length = min(page_lengths)
+        length_bits = _bits(max(page_lengths) - min_length)
+        shared_count_bits = _bits(max(len(refs) for refs in page_shared))
+        identifier_bits = _bits(max((max(refs) for refs in page_shared if refs), default=0))
+
+        bits = _BitWriter()
+        for value, width in ((min_objects, 32), (offsets[first_page[0]], 32), (objects_bits, 16),
+                             (min_length, 32), (length_bits, 16), (0, 32), (0, 16),
+                             (min_length, 32), (length_bits, 16), (shared_count_bits, 16),
+                             (identifier_bits, 16), (0, 16), (4, 16)):
+            bits.write(value, width)
+        for column in (
+            [(count - min_objects, objects_bits) for count in object_counts],
+            [(length - min_length, length_bits) for length in page_lengths],
+            [(len(refs), shared_count_bits) for refs in page_shared],
+            [(ref, identifier_bits) for refs in page_shared for ref in refs],
+            [(0, 0) for refs in page_shared for _ in refs],         # Fractional positions
+            [(0, 0) for _ in page_shared],                          # Content stream offsets
+            [(length - min_length, length_bits) for length in page_lengths],
+        ):
+            for value, width in column:
+                bits.write(value, width)
+            bits.flush()
+
+        shared_table_offset = len(bits.data)
+        group_lengths = [lengths[object_id] for object_id in first_page + shared]
+        min_group = min(group_lengths)
+        group_bits = _bits(max(group_lengths) - min_group)
+        for value, width in ((id_map[shared[0]] if shared else 0, 32),
+                             (offsets[shared[0]] if shared else 0, 32),
+                             (len(first_page), 32), (len(first_page) + len(shared), 32),
+                             (0, 16), (min_group, 32), (group_bits, 16)):
+            bits.write(value, width)
+        for column in (
+            [(length - min_group, group_bits) for length in group_lengths],
+            [(0, 1) for _ in group_lengths],                        # No signatures
+        ):
+            for value, width in column:
+                bits.write(value, width)
+            bits.flush()
+
+        data = bytes(bits.data)
+        return (b'%d 0 obj\n<< /S %d /Length %d >>\nstream\n' % (hint_id, shared_table_offset, len(data))
+                + data + b'\nendstream\nendobj\n')
+
+
+def linearize_pdf(pdf_path: Path) -> bool:
+    """
+    Linearize a PDF written by PDFWriter in place.
+
+    Args:
+        pdf_path: PDF to rewrite
+
+    Returns:
+        True if successful, False otherwise (the original file is kept)
+    """
+    temp_path = pdf_path.with_name(f".{pdf_path.name}.linearizing")
+    try:
+        Linearizer(pdf_path).write(temp_path)
+        os.replace(temp_path, pdf_path)
+        logger.info(f"Linearized {pdf_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to linearize {pdf_path}: {e}")
+        temp_path.unlink(missing_ok=True)
+        return False
@@ -0,0 +1,261 @@
+"""
+Lossless concatenation of PDFs produced by PDFWriter.
+"""
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..utils.logger import logger
+from .pdf_writer import PDFWriter, content_digest
+
+REFERENCE = re.compile(rb'(\d+) 0 R')
+
+
+class PDFPartReader:
+    """
+    Reads the objects of a PDF written by PDFWriter.
+
+    Only the layout PDFWriter produces is supported: one classic
+    cross-reference table, objects stored uncompressed and a flat page
+    tree. Objects are read one at a time, so memory use is bounded by the
+    largest object (one page image), not by the file size.
+    """
+
+    HEAD_BYTES = 4096  # Read when only an object's dictionary is needed
+
+    def __init__(self, path: Path):
+        """
+        Open a PDF and read its cross-reference table.
+
+        Args:
+            path: PDF file path
+
+        Raises:
+            ValueError: If the file does not have the expected layout
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(max(size - 1024, 0))
+            tail = f.read()
+            match = re.search(rb'startxref\s+(\d+)\s+%%EOF', tail)
+            if match is None:
+                raise ValueError(f"{self.path}: startxref not found")
+            self.xref_offset = int(match.group(1))
+
+            f.seek(self.xref_offset)
+            if f.readline().strip() != b'xref':
+                raise ValueError(f"{self.path}: unsupported cross-reference format")
+            first, count = (int(value) for value in f.readline().split())
+            self.offsets: Dict[int, int] = {}
+            for object_id in range(first, first + count):
+                entry = f.read(20)
+                if entry[17:18] == b'n':
+                    self.offsets[object_id] = int(entry[:10])
+
+            trailer = f.read(1024)
+
+        # Each object ends where the next one (or the xref table) starts
+        ordered = sorted(self.offsets, key=self.offsets.get)
+        self._ends: Dict[int, int] = {
+            object_id: self.offsets[following]
+            for object_id, following in zip(ordered, ordered[1:])
+        }
+        if ordered:
+            self._ends[ordered[-1]] = self.xref_offset
+        root = re.search(rb'/Root (\d+) 0 R', trailer)
+        info = re.search(rb'/Info (\d+) 0 R', trailer)
+        if root is None:
+            raise ValueError(f"{self.path}: trailer has no /Root")
+        self.root_id = int(root.group(1))
+        self.info_id = int(info.group(1)) if info else None
+
+        catalog = self.read_object(self.root_id)
+        pages = re.search(rb'/Pages (\d+) 0 R', catalog)
+        if pages is None:
+            raise ValueError(f"{self.path}: catalog has no /Pages")
+        self.pages_id = int(pages.group(1))
+        kids = re.search(rb'/Kids \[([^\]]*)\]', self.read_object(self.pages_id))
+        self.page_ids = [int(ref) for ref in REFERENCE.findall(kids.group(1))] if kids else []
+
+    def _object_span(self, object_id: int) -> Tuple[int, int]:
+        """File range of an object: from its offset to the next object or the xref."""
+        return self.offsets[object_id], self._ends[object_id]
+
+    def content_length(self, object_id: int) -> int:
+        """
+        Length of an object's content, as PDFWriter wrote it.
+
+        Args:
+            object_id: Object number
+
+        Returns:
+            Byte length of what read_object() returns
+        """
+        start, end = self._object_span(object_id)
+        return end - start - len(b'%d 0 obj\n' % object_id) - len(b'\nendobj\n')
+
+    def read_head(self, object_id: int) -> bytes:
+        """
+        Read an object's dictionary without its stream data.
+
+        Args:
+            object_id: Object number
+
+        Returns:
+            Content up to the stream keyword (all of it for non-stream objects)
+        """
+        start, end = self._object_span(object_id)
+        if end - start <= self.HEAD_BYTES:
+            return split_stream(self.read_object(object_id))[0]
+
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            data = f.read(self.HEAD_BYTES)
+        if b'stream\n' not in data:
+            return split_stream(self.read_object(object_id))[0]
+        return split_stream(data[data.index(b'obj') + 3:].lstrip(b'\r\n'))[0]
+
+    def read_object(self, object_id: int) -> bytes:
+        """
+        Read an object's content (between "obj" and "endobj").
+
+        Args:
+            object_id: Object number
+
+        Returns:
+            Serialized object content
+        """
+        start, end = self._object_span(object_id)
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return self._strip(f.read(end - start))
+
+    @staticmethod
+    def _strip(data: bytes) -> bytes:
+        """Remove the "N 0 obj" header and "endobj" trailer."""
+        header_end = data.index(b'obj') + 3
+        body_end = data.rindex(b'endobj')
+        return data[header_end:body_end].strip(b'\r\n')
+
+    def iter_objects(self, skip: Tuple[int, ...] = ()) -> Iterator[Tuple[int, bytes]]:
+        """
+        Read all objects in file order.
+
+        Args:
+            skip: Object numbers to leave out
+
+        Yields:
+            Tuples of (object number, content)
+        """
+        ordered = sorted((offset, object_id) for object_id, offset in self.offsets.items())
+        ends = [offset for offset, _ in ordered[1:]] + [self.xref_offset]
+        with open(self.path, 'rb') as f:
+            for (start, object_id), end in zip(ordered, ends):
+                if object_id in skip:
+                    continue
+                f.seek(start)
+                yield object_id, self._strip(f.read(end - start))
+
+
+class _IdMap(dict):
+    """Old to new object numbers, allocating new numbers on first use."""
+
+    def __init__(self, writer: PDFWriter):
+        super().__init__()
+        self.writer = writer
+
+    def __missing__(self, object_id: int) -> int:
+        new_id = self.writer.allocate_id()
+        self[object_id] = new_id
+        return new_id
+
+
+def split_stream(content: bytes) -> Tuple[bytes, bytes]:
+    """
+    Split object content into its dictionary and its stream.
+
+    Args:
+        content: Serialized object content
+
+    Returns:
+        Tuple of (content up to the stream keyword, the rest)
+    """
+    split = content.find(b'stream\n')
+    return (content, b'') if split < 0 else (content[:split], content[split:])
+
+
+def renumber_head(head: bytes, id_map: Dict[int, int]) -> bytes:
+    """Rewrite the object references in an object's dictionary."""
+    return REFERENCE.sub(lambda m: b'%d 0 R' % id_map[int(m.group(1))], head)
+
+
+def renumber(content: bytes, id_map: Dict[int, int]) -> bytes:
+    """
+    Rewrite object references in an object's dictionary (stream data is copied as is).
+
+    Args:
+        content: Serialized object content
+        id_map: Old object number to new object number
+
+    Returns:
+        Content with references renumbered
+    """
+    head, tail = split_stream(content)
+    return renumber_head(head, id_map) + tail
+
+
+def merge_pdfs(parts: List[Path], output_path: Path, title: Optional[str] = None,
+               page_labels: bool = False, numbers: Optional[List[int]] = None,
+               object_streams: bool = False) -> Path:
+    """
+    Concatenate PDFs without re-encoding anything.
+
+    Every part's objects (images, content streams, pages) are copied
+    byte for byte under new object numbers; each part's catalog, page tree
+    and info are replaced by one new page tree and info. Images repeated
+    across parts are stored once.
+
+    Args:
+        parts: PDFs written by PDFWriter, in order
+        output_path: Merged PDF path
+        title: PDF title metadata
+        page_labels: Record page numbers as page labels
+        numbers: Page number of every merged page (default: position)
+        object_streams: Write the merged PDF with object streams (PDF 1.5)
+
+    Returns:
+        Path of the merged PDF
+    """
+    numbers = iter(numbers or [])
+    with PDFWriter(output_path, title=title, page_labels=page_labels,
+                   object_streams=object_streams) as writer:
+        for part in parts:
+            reader = PDFPartReader(part)
+            skip = (reader.root_id, reader.pages_id, reader.info_id)
+            id_map = _IdMap(writer)
+            id_map[reader.pages_id] = writer.PAGES_ID
+
+            for object_id, content in reader.iter_objects(skip):
+                digest = None
+                # Renumbered first: an image's /Mask must be the same object too
+                content = renumber(content, id_map)
+                if b'/Subtype /Image' in split_stream(content)[0]:
+                    digest = content_digest(content)
+                    shared_id = writer.known_image(digest)
+                    if shared_id is not None:
+                        id_map[object_id] = shared_id
+                        writer.shared_images += 1
+                        continue
+
+                writer.write_raw_object(id_map[object_id], content)
+                if digest is not None:
+                    writer.remember_image(digest, id_map[object_id])
+            for page_id in reader.page_ids:
+                writer.append_page(id_map[page_id], next(numbers, None))
+
+            logger.debug(f"Merged {len(reader.page_ids)} pages from {part.name}")
+
+    logger.info(f"Merged {len(parts)} parts into {output_path}")
+    return output_path
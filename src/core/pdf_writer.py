@@ -0,0 +1,518 @@
+"""
+Streaming PDF writer for pre-encoded page images.
+"""
+import hashlib
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..utils.logger import logger
+
+# Version line and binary marker comment
+PDF_HEADER = b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n'
+# Object and cross-reference streams need PDF 1.5
+PDF_HEADER_COMPRESSED = b'%PDF-1.5\n%\xe2\xe3\xcf\xd3\n'
+
+
+@dataclass
+class PDFImage:
+    """An image already encoded in a PDF stream filter."""
+
+    data: bytes
+    filter: str                # PDF filter name, e.g. "DCTDecode"
+    width: int
+    height: int
+    colorspace: str = "DeviceRGB"
+    bpc: int = 8               # Bits per component
+    decode_parms: Optional[Dict[str, int]] = None
+    blank: bool = False        # Page without content: written as an empty page, data unused
+    image_mask: bool = False   # 1-bit stencil mask (1 = painted), no colour space
+
+
+@dataclass
+class MRCImage:
+    """A page split into mixed raster content layers (see mrc.py)."""
+
+    background: PDFImage                  # Low-resolution page without the text
+    mask: PDFImage                        # Full-resolution text mask (image_mask)
+    foreground: Optional[PDFImage] = None  # Low-resolution text colours, shown through the mask
+    color: Tuple[float, ...] = (0.0,)     # Gray or RGB (0-1) text colour if there is no foreground
+    blank: bool = False
+
+    @property
+    def width(self) -> int:
+        """Page width in pixels."""
+        return self.mask.width
+
+    @property
+    def height(self) -> int:
+        """Page height in pixels."""
+        return self.mask.height
+
+
+PageImage = Union[PDFImage, MRCImage]
+
+
+def content_digest(*parts: bytes) -> bytes:
+    """
+    Hash serialized object content.
+
+    Args:
+        *parts: Consecutive pieces of the content
+
+    Returns:
+        Digest identifying the content
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+def pdf_string(text: str) -> bytes:
+    """
+    Encode text as a PDF string object.
+
+    Args:
+        text: Text to encode
+
+    Returns:
+        Literal string for ASCII text, UTF-16BE hex string otherwise
+    """
+    try:
+        raw = text.encode('ascii')
+    except UnicodeEncodeError:
+        return b'<FEFF' + text.encode('utf-16-be').hex().upper().encode('ascii') + b'>'
+    escaped = raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return b'(' + escaped + b')'
+
+
+def pdf_date(moment: datetime) -> bytes:
+    """Format a datetime as a PDF date string."""
+    return b'(D:' + moment.strftime("%Y%m%d%H%M%S").encode('ascii') + b')'
+
+
+class PDFWriter:
+    """
+    Writes a PDF one page at a time.
+
+    Each page's image, content stream and page object are written to the
+    file as soon as the page is added, so memory use does not grow with
+    the page count: only object offsets are kept. The page tree, document
+    info and cross-reference table are written by close().
+
+    Identical images are stored once: every image stream is hashed, and
+    pages repeating an earlier image refer to the same XObject. Blank
+    pages get no image at all. MRC pages (MRCImage) are drawn as their
+    background image with the text mask painted on top, either in the
+    foreground image's colours or in a single fill colour.
+
+    Page numbers are drawn as text in each page's content stream (no
+    image is touched), and can also be recorded as /PageLabels so viewers
+    show them in their page field.
+
+    With object_streams, the small objects (page dictionaries, page tree,
+    catalog, info) are packed into compressed object streams and the
+    cross-reference table is written as a compressed stream (PDF 1.5).
+    This removes most of the per-page overhead of books with thousands
+    of pages, and viewers parse one short stream instead of a 20-byte
+    text line per object. Images and content streams are written as
+    before.
+    """
+
+    CATALOG_ID = 1
+    PAGES_ID = 2
+    INFO_ID = 3
+
+    PAGE_NUMBER_SIZE = 9.0     # Font size of page numbers (points)
+    PAGE_NUMBER_MARGIN = 12.0  # Baseline distance from the page bottom (points)
+    DIGIT_WIDTH = 0.556        # Helvetica digit width per point of font size
+
+    OBJECT_STREAM_SIZE = 100   # Objects per object stream
+
+    def __init__(self, output_path: Path, title: Optional[str] = None, dpi: float = 100.0,
+                 page_numbers: bool = False, page_labels: bool = False,
+                 object_streams: bool = False):
+        """
+        Open a PDF for writing.
+
+        Args:
+            output_path: Output PDF file path
+            title: PDF title metadata
+            dpi: Resolution used to size pages from image pixels
+            page_numbers: Draw page numbers at the bottom center of each page
+            page_labels: Record page numbers as page labels
+            object_streams: Pack small objects into object streams and write a
+                cross-reference stream (PDF 1.5)
+        """
+        self.output_path = Path(output_path)
+        self.title = title
+        self.dpi = dpi
+        self.page_numbers = page_numbers
+        self.page_labels = page_labels
+        self.object_streams = object_streams
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.output_path, 'wb')
+        self._offsets: Dict[int, int] = {}
+        self._compressed: Dict[int, Tuple[int, int]] = {}  # Object -> (object stream, index)
+        self._pending: List[Tuple[int, bytes]] = []        # Objects for the next object stream
+        self._page_ids: List[int] = []
+        self._numbers: List[int] = []
+        self._next_id = self.INFO_ID + 1
+        self._font_id: Optional[int] = None
+        self._images: Dict[bytes, int] = {}  # Content digest -> image object number
+        self.shared_images = 0               # Pages that reused an earlier image
+        self.blank_pages = 0                 # Pages written without an image
+        self._jpx = False                    # JPEG 2000 images written (PDF 1.5)
+
+        self._file.write(PDF_HEADER_COMPRESSED if object_streams else PDF_HEADER)
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages written so far."""
+        return len(self._page_ids)
+
+    def allocate_id(self) -> int:
+        """Reserve the next object number."""
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def write_raw_object(self, object_id: int, content: bytes):
+        """
+        Write an indirect object whose content is already serialized.
+
+        Args:
+            object_id: Object number (from allocate_id())
+            content: Everything between "obj" and "endobj", streams included
+        """
+        if b'/JPXDecode' in content[:content.find(b'stream\n') + 1]:
+            self._jpx = True
+        if self.object_streams and b'stream\n' not in content:
+            self._compress_object(object_id, content)
+            return
+        self._offsets[object_id] = self._file.tell()
+        self._file.write(b'%d 0 obj\n' % object_id)
+        self._file.write(content)
+        self._file.write(b'\nendobj\n')
+
+    def known_image(self, digest: bytes) -> Optional[int]:
+        """
+        Look up an already written image.
+
+        Args:
+            digest: content_digest() of the serialized image object
+
+        Returns:
+            Object number of the image, or None if it was not written yet
+        """
+        return self._images.get(digest)
+
+    def remember_image(self, digest: bytes, object_id: int):
+        """
+        Record a written image for reuse by later pages.
+
+        Args:
+            digest: content_digest() of the serialized image object
+            object_id: Object number of the image
+        """
+        self._images[digest] = object_id
+
+    def append_page(self, page_id: int, number: Optional[int] = None):
+        """
+        Add an already written page object to the page tree.
+
+        The page's /Parent must refer to PAGES_ID.
+
+        Args:
+            page_id: Object number of the page
+            number: Page number for page labels (default: position in the PDF)
+        """
+        self._page_ids.append(page_id)
+        self._numbers.append(number if number is not None else len(self._page_ids))
+
+    def _page_number_overlay(self, number: int, page_width: float) -> bytes:
+        """Content stream operators drawing a page number (black with a thin white outline)."""
+        if self._font_id is None:
+            self._font_id = self.allocate_id()
+            self._write_object(self._font_id, b'<< /Type /Font /Subtype /Type1 '
+                               b'/BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+        text = b'%d' % number
+        size = self.PAGE_NUMBER_SIZE
+        x = (page_width - len(text) * self.DIGIT_WIDTH * size) / 2
+        position = b'/F1 %.1f Tf %.2f %.2f Td (%s) Tj' % (size, x, self.PAGE_NUMBER_MARGIN, text)
+        # Fill and stroke in one pass, so text extraction sees the number once
+        return b' BT 0 g 1 G 0.6 w 2 Tr ' + position + b' ET'
+
+    @staticmethod
+    def _stream_start(body: bytes, length: int) -> bytes:
+        """Stream dictionary with /Length inserted, followed by the stream keyword."""
+        return body[:-2] + b' /Length %d >>\nstream\n' % length
+
+    def _write_object(self, object_id: int, body: bytes, stream: Optional[bytes] = None):
+        """
+        Write an indirect object, optionally with a stream.
+
+        Args:
+            object_id: Object number
+            body: Object dictionary (without stream Length for streams)
+            stream: Stream data, if the object is a stream
+        """
+        if self.object_streams and stream is None:
+            self._compress_object(object_id, body)
+            return
+        self._offsets[object_id] = self._file.tell()
+        self._file.write(b'%d 0 obj\n' % object_id)
+        if stream is None:
+            self._file.write(body)
+        else:
+            self._file.write(self._stream_start(body, len(stream)))
+            self._file.write(stream)
+            self._file.write(b'\nendstream')
+        self._file.write(b'\nendobj\n')
+
+    def _compress_object(self, object_id: int, content: bytes):
+        """Queue a non-stream object for the next object stream."""
+        self._pending.append((object_id, content))
+        if len(self._pending) >= self.OBJECT_STREAM_SIZE:
+            self._flush_object_stream()
+
+    def _flush_object_stream(self):
+        """Write the queued objects as one compressed object stream."""
+        if not self._pending:
+            return
+        stream_id = self.allocate_id()
+        index = []
+        objects = []
+        offset = 0
+        for position, (object_id, content) in enumerate(self._pending):
+            index.append(b'%d %d' % (object_id, offset))
+            objects.append(content)
+            offset += len(content) + 1
+            self._compressed[object_id] = (stream_id, position)
+        header = b' '.join(index) + b'\n'
+        data = zlib.compress(header + b'\n'.join(objects) + b'\n')
+        self._pending = []
+
+        self._offsets[stream_id] = self._file.tell()
+        self._file.write(b'%d 0 obj\n' % stream_id)
+        self._file.write(self._stream_start(
+            b'<< /Type /ObjStm /N %d /First %d /Filter /FlateDecode >>'
+            % (len(objects), len(header)), len(data)))
+        self._file.write(data)
+        self._file.write(b'\nendstream\nendobj\n')
+
+    def _image(self, image: PDFImage, mask_id: Optional[int] = None) -> int:
+        """
+        Write an image XObject, or find an identical one already written.
+
+        Args:
+            image: Encoded image
+            mask_id: Object number of an image mask to show the image through
+
+        Returns:
+            Object number of the image
+        """
+        if image.image_mask:
+            image_dict = (b'<< /Type /XObject /Subtype /Image /Width %d /Height %d '
+                          b'/ImageMask true /Decode [1 0] /BitsPerComponent 1 /Filter /%s'
+                          % (image.width, image.height, image.filter.encode('ascii')))
+        else:
+            image_dict = (b'<< /Type /XObject /Subtype /Image /Width %d /Height %d '
+                          b'/ColorSpace /%s /BitsPerComponent %d /Filter /%s'
+                          % (image.width, image.height, image.colorspace.encode('ascii'),
+                             image.bpc, image.filter.encode('ascii')))
+        if image.decode_parms:
+            parms = b' '.join(b'/%s %d' % (key.encode('ascii'), value)
+                              for key, value in image.decode_parms.items())
+            image_dict += b' /DecodeParms << ' + parms + b' >>'
+        if mask_id is not None:
+            image_dict += b' /Mask %d 0 R' % mask_id
+        image_dict += b' >>'
+
+        # Same digest as the merger computes from the serialized object
+        digest = content_digest(self._stream_start(image_dict, len(image.data)),
+                                image.data, b'\nendstream')
+        image_id = self.known_image(digest)
+        if image_id is None:
+            image_id = self.allocate_id()
+            self._jpx |= image.filter == "JPXDecode"
+            self._write_object(image_id, image_dict, image.data)
+            self.remember_image(digest, image_id)
+        else:
+            self.shared_images += 1
+        return image_id
+
+    def _mrc_layers(self, image: MRCImage, page_width: float,
+                    page_height: float) -> Tuple[bytes, bytes]:
+        """
+        Write the images of an MRC page.
+
+        Returns:
+            Tuple of (XObject resource entries, content stream operators)
+        """
+        place = b'%.2f 0 0 %.2f 0 0 cm' % (page_width, page_height)
+        background_id = self._image(image.background)
+        mask_id = self._image(image.mask)
+        if image.foreground is not None:
+            text_id = self._image(image.foreground, mask_id)
+            paint = b''
+        else:
+            text_id = mask_id
+            paint = b' '.join(b'%.3f' % value for value in image.color)
+            paint += b' g ' if len(image.color) == 1 else b' rg '
+        xobjects = b'/Im0 %d 0 R /Im1 %d 0 R' % (background_id, text_id)
+        content = b'q %s /Im0 Do Q q %s%s /Im1 Do Q' % (place, paint, place)
+        return xobjects, content
+
+    def add_page(self, image: PageImage, number: Optional[int] = None):
+        """
+        Write a page showing one image (or MRC layers) scaled to the full page.
+
+        Args:
+            image: Encoded page image
+            number: Page number to draw and label (default: position in the PDF)
+        """
+        page_width = image.width * 72.0 / self.dpi
+        page_height = image.height * 72.0 / self.dpi
+        if number is None:
+            number = len(self._page_ids) + 1
+
+        overlay = b''
+        font = b''
+        if self.page_numbers:
+            overlay = self._page_number_overlay(number, page_width)
+            font = b' /Font << /F1 %d 0 R >>' % self._font_id
+
+        if image.blank:
+            resources = b'<<' + font + b' >>'
+            contents = b''
+            if overlay:
+                content_id = self.allocate_id()
+                self._write_object(content_id, b'<< >>', overlay.strip())
+                contents = b' /Contents %d 0 R' % content_id
+            page_id = self.allocate_id()
+            self._write_object(page_id, (
+                b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] /Resources %s%s >>'
+                % (self.PAGES_ID, page_width, page_height, resources, contents)
+            ))
+            self.append_page(page_id, number)
+            self.blank_pages += 1
+            return
+
+        if isinstance(image, MRCImage):
+            xobjects, content = self._mrc_layers(image, page_width, page_height)
+        else:
+            xobjects = b'/Im0 %d 0 R' % self._image(image)
+            content = b'q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q' % (page_width, page_height)
+
+        content_id = self.allocate_id()
+        page_id = self.allocate_id()
+        self._write_object(content_id, b'<< >>', content + overlay)
+
+        self._write_object(page_id, (
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] '
+            b'/Resources << /XObject << %s >>%s >> /Contents %d 0 R >>'
+            % (self.PAGES_ID, page_width, page_height, xobjects, font, content_id)
+        ))
+        self.append_page(page_id, number)
+
+    def _page_labels(self) -> bytes:
+        """/PageLabels number tree: a new decimal range wherever numbering jumps."""
+        ranges = []
+        for index, number in enumerate(self._numbers):
+            if index == 0 or number != self._numbers[index - 1] + 1:
+                ranges.append(b'%d << /S /D /St %d >>' % (index, number))
+        return b' /PageLabels << /Nums [' + b' '.join(ranges) + b'] >>'
+
+    def close(self) -> Path:
+        """
+        Write the catalog, page tree, metadata and cross-reference table (or stream).
+
+        Returns:
+            Path of the finished PDF
+        """
+        labels = self._page_labels() if self.page_labels and self._numbers else b''
+        # JPEG 2000 needs PDF 1.5; the header was written before the images
+        version = b' /Version /1.5' if self._jpx and not self.object_streams else b''
+        self._write_object(self.CATALOG_ID, b'<< /Type /Catalog /Pages %d 0 R%s%s >>'
+                           % (self.PAGES_ID, version, labels))
+
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self._page_ids)
+        self._write_object(self.PAGES_ID, b'<< /Type /Pages /Kids [%s] /Count %d >>'
+                           % (kids, len(self._page_ids)))
+
+        now = datetime.now()
+        title = self.title or f'Kindle Scan {now.strftime("%Y-%m-%d")}'
+        self._write_object(self.INFO_ID, (
+            b'<< /Title ' + pdf_string(title) +
+            b' /Author (AK Auto-Scanner) /Subject (Scanned book pages)'
+            b' /Creator (AK Auto-Scanner) /Producer (AK Auto-Scanner)'
+            b' /CreationDate ' + pdf_date(now) + b' >>'
+        ))
+
+        if self.object_streams:
+            self._flush_object_stream()
+            xref_offset = self._write_xref_stream()
+        else:
+            xref_offset = self._file.tell()
+            self._file.write(b'xref\n0 %d\n' % self._next_id)
+            self._file.write(b'0000000000 65535 f \n')
+            for object_id in range(1, self._next_id):
+                self._file.write(b'%010d 00000 n \n' % self._offsets[object_id])
+            self._file.write(b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\n'
+                             % (self._next_id, self.CATALOG_ID, self.INFO_ID))
+        self._file.write(b'startxref\n%d\n%%%%EOF\n' % xref_offset)
+        self._file.close()
+
+        logger.debug(f"PDFWriter wrote {len(self._page_ids)} pages to {self.output_path} "
+                    f"({self.shared_images} shared images, {self.blank_pages} blank pages)")
+        return self.output_path
+
+    def _write_xref_stream(self) -> int:
+        """
+        Write the cross-reference table as a compressed stream (it is also the trailer).
+
+        Returns:
+            Offset of the cross-reference stream
+        """
+        xref_id = self.allocate_id()
+        xref_offset = self._file.tell()
+        self._offsets[xref_id] = xref_offset
+
+        # Entries: type (0 free, 1 offset, 2 in object stream), field 2, field 3
+        width = max((xref_offset.bit_length() + 7) // 8, 1)
+        rows = [b'\x00' + bytes(width) + b'\xff\xff']
+        for object_id in range(1, self._next_id):
+            if object_id in self._offsets:
+                rows.append(b'\x01' + self._offsets[object_id].to_bytes(width, 'big') + b'\x00\x00')
+            else:
+                stream_id, index = self._compressed[object_id]
+                rows.append(b'\x02' + stream_id.to_bytes(width, 'big') + index.to_bytes(2, 'big'))
+        data = zlib.compress(b''.join(rows))
+
+        self._file.write(b'%d 0 obj\n' % xref_id)
+        self._file.write(self._stream_start(
+            b'<< /Type /XRef /Size %d /W [1 %d 2] /Root %d 0 R /Info %d 0 R /Filter /FlateDecode >>'
+            % (self._next_id, width, self.CATALOG_ID, self.INFO_ID), len(data)))
+        self._file.write(data)
+        self._file.write(b'\nendstream\nendobj\n')
+        return xref_offset
+
+    def abort(self):
+        """Close and delete an unfinished PDF."""
+        self._file.close()
+        self.output_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "PDFWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,68 @@
+"""
+Embedding PNG image data in PDFs without decoding it.
+"""
+import struct
+from typing import Optional
+
+from .pdf_writer import PDFImage
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG colour types embeddable as is: grayscale and RGB (no palette, no alpha)
+COLOR_TYPES = {0: ("DeviceGray", 1), 2: ("DeviceRGB", 3)}
+
+
+def png_image(data: bytes, grayscale: bool = False) -> Optional[PDFImage]:
+    """
+    Wrap a PNG's compressed pixel data as a FlateDecode image stream.
+
+    A PNG's concatenated IDAT chunks are a zlib stream of scanlines, each
+    prefixed with its PNG filter byte, which is exactly what FlateDecode
+    with /Predictor 15 reads. So the image is copied, not decoded.
+
+    Args:
+        data: PNG file contents
+        grayscale: Only accept grayscale PNGs
+
+    Returns:
+        Image stream, or None if the PNG must be decoded instead
+        (interlaced, palette, alpha channel, or colour when grayscale
+        is wanted)
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+
+    header = None
+    idat = []
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'IDAT':
+            idat.append(body)
+        elif kind == b'IEND':
+            break
+        pos += length + 12  # Length, type, data, CRC
+
+    if header is None or not idat:
+        return None
+
+    width, height, depth, color_type, _, _, interlace = header
+    if interlace or color_type not in COLOR_TYPES:
+        return None
+    colorspace, colors = COLOR_TYPES[color_type]
+    if grayscale and colors != 1:
+        return None
+
+    return PDFImage(
+        data=b''.join(idat),
+        filter="FlateDecode",
+        width=width,
+        height=height,
+        colorspace=colorspace,
+        bpc=depth,
+        decode_parms={'Predictor': 15, 'Colors': colors,
+                      'BitsPerComponent': depth, 'Columns': width}
+    )
@@ -0,0 +1,104 @@
+"""
+Coalescing progress bus between the scan thread and its consumers.
+
+The scanner publishes an event for every stage of every page. Consumers
+such as the Tk UI pull the latest event at their own rate, so superseded
+intermediate events are dropped instead of queued.
+"""
+import threading
+from typing import Optional
+
+from ..models.progress import ProgressEvent, ProgressStage
+from ..utils.clock import Clock
+
+
+class ProgressBus:
+    """Thread-safe holder of the latest progress event."""
+
+    def __init__(self, clock: Optional[Clock] = None):
+        """
+        Initialize progress bus.
+
+        Args:
+            clock: Clock used for event timestamps (real time if None)
+        """
+        self.clock = clock or Clock()
+        self._condition = threading.Condition()
+        self._latest: Optional[ProgressEvent] = None
+        self._sequence = 0
+
+    def publish(self, stage: ProgressStage, message: str, progress: Optional[float] = None,
+                page_count: int = 0, **fields) -> ProgressEvent:
+        """
+        Publish a new progress event, superseding the previous one.
+
+        Args:
+            stage: Workflow stage
+            message: Human-readable status message
+            progress: Progress value (0.0-1.0) or None
+            page_count: Pages captured so far
+            **fields: Additional ProgressEvent fields
+
+        Returns:
+            The published event
+        """
+        with self._condition:
+            self._sequence += 1
+            event = ProgressEvent(
+                sequence=self._sequence,
+                stage=stage,
+                message=message,
+                progress=progress,
+                page_count=page_count,
+                timestamp=self.clock.now(),
+                **fields
+            )
+            self._latest = event
+            self._condition.notify_all()
+        return event
+
+    def latest(self) -> Optional[ProgressEvent]:
+        """Get the most recent event."""
+        with self._condition:
+            return self._latest
+
+    def poll(self, last_sequence: int = 0) -> Optional[ProgressEvent]:
+        """
+        Get the latest event if it is newer than the one last seen.
+
+        Args:
+            last_sequence: Sequence number of the last event the consumer handled
+
+        Returns:
+            Latest event, or None if nothing new was published
+        """
+        with self._condition:
+            if self._latest is not None and self._latest.sequence > last_sequence:
+                return self._latest
+            return None
+
+    def wait(self, last_sequence: int = 0, timeout: Optional[float] = None) -> Optional[ProgressEvent]:
+        """
+        Block until an event newer than last_sequence is published.
+
+        Args:
+            last_sequence: Sequence number of the last event the consumer handled
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            Latest event, or None on timeout
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._latest is not None and self._latest.sequence > last_sequence,
+                timeout=timeout
+            )
+            if self._latest is not None and self._latest.sequence > last_sequence:
+                return self._latest
+            return None
+
+    @property
+    def published_count(self) -> int:
+        """Total number of events published."""
+        with self._condition:
+            return self._sequence
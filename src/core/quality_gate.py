@@ -0,0 +1,119 @@
+"""
+Quality gate that rejects half-drawn, fading or blank frames before they are saved.
+"""
+from collections import deque
+from typing import Optional
+
+from ..utils.lazy_import import lazy_import
+from ..utils.logger import logger
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+
+class QualityGate:
+    """
+    Cheap per-frame checks for pages captured before Kindle finished drawing.
+
+    Three checks run on the grayscale frame:
+
+    - Blank: the frame matches a blank template of its own background
+      level (no row has content), as when Kindle clears the page before
+      drawing it.
+    - Incomplete text band: content stops well above where it usually
+      ends, as when the page is drawn top to bottom and only the upper
+      band is visible.
+    - Blur: the Laplacian variance is far below that of recent pages, as
+      when a page is still fading in.
+
+    The incomplete-band and blur checks compare against recent accepted
+    pages, so they only run after a few pages have been seen. A rejected
+    frame is accepted if the recapture shows exactly the same frame: the
+    page has settled and is genuinely blank (a verso), short (a chapter
+    end) or low in detail.
+    """
+
+    BLANK_FRAME = "blank frame"  # Reason returned for frames without content
+
+    CONTENT_THRESHOLD = 20     # Difference from background (0-255) counted as content
+    ANALYSIS_REDUCE = 4        # Downscale factor for the content profile
+    HISTORY = 30               # Accepted pages kept as reference
+    MIN_HISTORY = 5            # Pages needed before relative checks run
+    EXTENT_PERCENTILE = 90     # Usual extent: fully drawn pages end lowest
+    INCOMPLETE_RATIO = 0.7     # Content extent below this share of the usual extent
+    BLUR_RATIO = 0.5           # Sharpness below this share of the usual sharpness
+    STABLE_DIFF = 1.0          # Mean difference (0-255) to a rejected frame counted as unchanged
+
+    def __init__(self):
+        """Initialize quality gate."""
+        self._extents: deque = deque(maxlen=self.HISTORY)
+        self._sharpness: deque = deque(maxlen=self.HISTORY)
+        self._pending = None
+        self._rejected = None
+
+    def reset(self):
+        """Forget reference pages (e.g. after the frame geometry changed)."""
+        self._extents.clear()
+        self._sharpness.clear()
+        self._pending = None
+        self._rejected = None
+
+    def check(self, gray: "np.ndarray") -> Optional[str]:
+        """
+        Check a grayscale frame.
+
+        Args:
+            gray: Grayscale frame as it will be saved
+
+        Returns:
+            Reason the frame looks incomplete, or None if it looks fine
+        """
+        height, width = gray.shape[:2]
+        small = cv2.resize(gray, (max(width // self.ANALYSIS_REDUCE, 1),
+                                  max(height // self.ANALYSIS_REDUCE, 1)),
+                           interpolation=cv2.INTER_AREA)
+
+        # Blank template: the frame's own background level everywhere
+        border = np.concatenate((small[0], small[-1], small[:, 0], small[:, -1]))
+        template = np.full_like(small, int(np.median(border)))
+        content = cv2.absdiff(small, template) > self.CONTENT_THRESHOLD
+        rows = np.flatnonzero(content.any(axis=1))
+
+        extent = (rows[-1] + 1) / small.shape[0] if rows.size else 0.0
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_32F).var())
+        self._pending = (extent, sharpness)
+
+        rejected, self._rejected = self._rejected, None
+
+        reason = None
+        if rows.size == 0:
+            reason = self.BLANK_FRAME
+        elif len(self._extents) >= self.MIN_HISTORY:
+            usual_extent = float(np.percentile(self._extents, self.EXTENT_PERCENTILE))
+            usual_sharpness = float(np.median(self._sharpness))
+            if extent < usual_extent * self.INCOMPLETE_RATIO:
+                reason = f"incomplete text band (content ends at {extent:.0%}, usually {usual_extent:.0%})"
+            elif sharpness < usual_sharpness * self.BLUR_RATIO:
+                reason = f"blurred frame (sharpness {sharpness:.0f}, usually {usual_sharpness:.0f})"
+
+        if reason is None:
+            return None
+        if (rejected is not None and rejected.shape == small.shape
+                and cv2.mean(cv2.absdiff(rejected, small))[0] < self.STABLE_DIFF):
+            # Unchanged since the last rejection: the page really looks like this
+            logger.debug(f"Accepting settled page despite {reason}")
+            self._pending = None
+            return None
+        self._rejected = small
+        return reason
+
+    def accept(self):
+        """Record the last checked frame as a reference page."""
+        if self._pending is None:
+            return
+        extent, sharpness = self._pending
+        self._pending = None
+        if extent > 0:
+            self._extents.append(extent)
+            self._sharpness.append(sharpness)
+            logger.debug(f"QualityGate reference: extent={extent:.2f}, sharpness={sharpness:.0f}")
@@ -1,51 +1,129 @@
 """
 Main scanning orchestrator that coordinates the entire workflow.
 """
-import time
 import shutil
 from pathlib import Path
 from typing import Optional, Callable, List
 from datetime import datetime
 import threading
 
-from ..models.config import ScanConfig, ScanState, Resolution
+from ..models.config import DuplicateDetection, ScanConfig, ScanState, Resolution
 from ..models.scan_state import ScanSession
+from ..models.progress import ProgressStage
+from ..utils.cancellation import CancellationToken
+from ..utils.clock import Clock
+from ..utils.json_store import JsonStore
 from ..utils.logger import logger
 from .window_manager import WindowManager
 from .page_capturer import PageCapturer
+from .capture_source import CaptureSource
 from .image_processor import ImageProcessor
 from .pdf_generator import PDFGenerator
+from .progress_bus import ProgressBus
+from .delay_tuner import DelayTuner
+from .auto_crop import AutoCropper
+from .change_map import ChangeMap
+from .quality_gate import QualityGate
+from .focus_monitor import FocusMonitor
+from .spool import write_journal
 
 
 class Scanner:
     """Main scanner orchestrator."""
 
-    def __init__(self, config: ScanConfig):
+    # max_pages at or above this value means "scan until the end of the book"
+    AUTO_STOP_MIN_PAGES = 1000
+
+    # Progress stage reported for each session state
+    STAGE_BY_STATE = {
+        ScanState.PREPARING: ProgressStage.PREPARING,
+        ScanState.CAPTURING: ProgressStage.CAPTURING,
+        ScanState.PROCESSING: ProgressStage.PROCESSING,
+        ScanState.COMPLETE: ProgressStage.COMPLETE,
+        ScanState.CANCELLED: ProgressStage.CANCELLED,
+        ScanState.ERROR: ProgressStage.ERROR,
+    }
+
+    def __init__(self, config: ScanConfig, window_manager: Optional[WindowManager] = None,
+                 capture_source: Optional[CaptureSource] = None, clock: Optional[Clock] = None):
         """
         Initialize scanner.
 
         Args:
             config: Scan configuration
+            window_manager: Window manager (real Windows windows if None)
+            capture_source: Screen capture/input backend (PyAutoGUI if None)
+            clock: Clock for all waits and timings (real time if None)
         """
         self.config = config
-        self.session = ScanSession()
+        self.clock = clock or Clock()
+        self.session = ScanSession(clock=self.clock)
+
+        # Interrupts every wait in the workflow when the scan is stopped
+        self.cancel_token = CancellationToken(self.clock)
+
+        # Self-tuning capture delay (profile learned per machine)
+        self.delay_tuner: Optional[DelayTuner] = None
+        if config.auto_tune_delay:
+            self.delay_tuner = DelayTuner(
+                initial_delay=config.capture_speed,
+                profile_store=JsonStore(config.state_dir / "delay_profiles.json"),
+                profile_key=DelayTuner.profile_key_for(config.resolution)
+            )
+
+        # Content-aware crop (rectangle learned from the first pages)
+        self.auto_cropper: Optional[AutoCropper] = None
+        if config.auto_crop:
+            self.auto_cropper = AutoCropper(
+                sample_pages=config.auto_crop_sample_pages,
+                padding=config.auto_crop_padding
+            )
+
+        # Tile change maps for settle/no-op probes (whole window) and for
+        # duplicate checks (captured pages, cropped once the auto-crop locks)
+        self.change_map = ChangeMap(volatile_regions=config.volatile_regions)
+        self.page_change_map = ChangeMap(volatile_regions=config.volatile_regions)
 
         # Initialize components
-        self.window_manager = WindowManager()
+        self.window_manager = window_manager or WindowManager(cancel_token=self.cancel_token)
         self.page_capturer = PageCapturer(
             direction=config.direction,
             resolution=config.resolution,
-            capture_speed=config.capture_speed
+            capture_speed=config.capture_speed,
+            delay_tuner=self.delay_tuner,
+            cancel_token=self.cancel_token,
+            capture_source=capture_source,
+            clock=self.clock,
+            auto_cropper=self.auto_cropper,
+            change_map=self.change_map,
+            page_change_map=self.page_change_map,
+            quality_gate=QualityGate() if config.quality_gate else None,
+            max_recaptures=config.max_recaptures
         )
+        use_tiles = config.duplicate_detection == DuplicateDetection.TILES
         self.image_processor = ImageProcessor(
-            similarity_threshold=config.similarity_threshold
+            similarity_threshold=config.similarity_threshold,
+            change_map=self.page_change_map if use_tiles else None,
+            max_changed_fraction=config.duplicate_max_changed
         )
-        self.pdf_generator = PDFGenerator(quality=config.pdf_quality)
+        self.pdf_generator = PDFGenerator.from_config(config)
+
+        # Directory pages are spooled to (a per-session subdirectory if kept)
+        self.spool_dir: Path = config.temp_dir
+
+        # Created once the Kindle window is known
+        self.focus_monitor: Optional[FocusMonitor] = None
 
         # Threading
         self.scan_thread: Optional[threading.Thread] = None
         self.progress_callback: Optional[Callable] = None
 
+        # Latest progress, polled by the UI at its own rate
+        self.progress_bus = ProgressBus(self.clock)
+
+        # Page counts of previous scans, keyed by Kindle window title
+        self.scan_history = JsonStore(config.state_dir / "scan_history.json")
+
         logger.info("Scanner initialized")
 
     def start_scan(self, progress_callback: Optional[Callable] = None) -> bool:
@@ -53,7 +131,8 @@ class Scanner:
         Start scanning in a background thread.
 
         Args:
-            progress_callback: Callback function(message, progress, page_count)
+            progress_callback: Optional callback function(ProgressEvent), called
+                synchronously for every event. UIs should poll progress_bus instead.
 
         Returns:
             True if scan started successfully, False otherwise
@@ -63,6 +142,7 @@ class Scanner:
             return False
 
         self.progress_callback = progress_callback
+        self.cancel_token.reset()
         self.session.start()
 
         # Start scan thread
@@ -79,7 +159,9 @@ class Scanner:
 
         logger.info("Stop requested")
         self.session.stop_requested = True
-        self._notify_progress("Stopping scan...", None, self.session.pages_captured)
+        self.cancel_token.cancel()
+        self._notify_progress("Stopping scan...", None, self.session.pages_captured,
+                              stage=ProgressStage.STOPPING)
 
     def _scan_workflow(self):
         """Main scanning workflow (runs in background thread)."""
@@ -108,9 +190,11 @@ class Scanner:
                 self._notify_progress(
                     f"Starting in {countdown} second{'s' if countdown > 1 else ''}... (Press ESC to cancel)",
                     0.0,
-                    0
+                    0,
+                    stage=ProgressStage.COUNTDOWN,
+                    countdown=countdown
                 )
-                time.sleep(1)
+                self.cancel_token.sleep(1)
 
             # Find and activate Kindle window
             self._notify_progress("Finding Kindle window...", 0.0, 0)
@@ -123,6 +207,10 @@ class Scanner:
                 self._notify_progress(error_msg, 0.0, 0)
                 return
 
+            self.session.expected_pages = self._resolve_expected_pages()
+            if self.session.expected_pages:
+                logger.info(f"Expecting {self.session.expected_pages} pages")
+
             # Activate window
             self._notify_progress("Activating Kindle window...", 0.05, 0)
             if not self.window_manager.activate_window(kindle_hwnd):
@@ -158,9 +246,8 @@ class Scanner:
             # Use keyboard input instead of clicking to avoid triggering links
             self._notify_progress("Ensuring Kindle window has focus...", 0.12, 0)
             logger.info("Using Ctrl key press to establish focus (avoids clicking links)")
-            import pyautogui
-            pyautogui.press('ctrl')  # Press Ctrl key - has no effect but establishes focus
-            time.sleep(1.5)  # Wait for focus to be established
+            self.page_capturer.capture_source.press('ctrl')  # No effect but establishes focus
+            self.cancel_token.sleep(1.5)  # Wait for focus to be established
 
             # Test capture
             self._notify_progress("Testing screenshot capture...", 0.15, 0)
@@ -173,13 +260,27 @@ class Scanner:
 
             # Main capture loop
             self.session.state = ScanState.CAPTURING
-            self._capture_loop(capture_region, kindle_hwnd)
+            self.focus_monitor = FocusMonitor(self.window_manager, kindle_hwnd)
+            self.focus_monitor.start()
+            try:
+                self._capture_loop(capture_region, kindle_hwnd)
+            finally:
+                self.focus_monitor.stop()
+
+            if self.delay_tuner is not None:
+                self.delay_tuner.save()
+
+            # The capture loop failed (e.g. the Kindle window was closed)
+            if self.session.state == ScanState.ERROR:
+                self._notify_progress(self.session.error_message, 0.0, self.session.pages_captured)
+                return
 
             # Check if cancelled
             if self.session.stop_requested:
                 logger.info("Scan cancelled by user")
                 self.session.cancel()
                 self._notify_progress("Scan cancelled", 0.95, self.session.pages_captured)
+                self._write_journal(self.session.captured_images)
                 self._cleanup()
                 return
 
@@ -192,18 +293,21 @@ class Scanner:
                 return
 
             self._generate_pdf()
+            if self.session.state == ScanState.ERROR:
+                return
 
             # Restore window if maximized
             if self.config.resolution == Resolution.HIGH:
                 self.window_manager.restore_window(kindle_hwnd)
 
             # Complete
+            self._record_history()
             logger.info(f"Scan completed: {self.session.pages_captured} pages")
-            self._notify_progress(
-                f"Scan complete! PDF saved to {self.session.output_pdf_path}",
-                1.0,
-                self.session.pages_captured
-            )
+            if self.config.build_pdf:
+                message = f"Scan complete! PDF saved to {self.session.output_pdf_path}"
+            else:
+                message = f"Capture complete! {self.session.pages_captured} pages spooled to {self.spool_dir}"
+            self._notify_progress(message, 1.0, self.session.pages_captured)
 
         except Exception as e:
             error_msg = f"Unexpected error: {e}"
@@ -224,10 +328,13 @@ class Scanner:
         max_consecutive_duplicates = 5  # Stop after 5 duplicate pages (more robust)
 
         # Determine scan mode: exact page count (50/100) or auto-detect (large number)
-        use_auto_stop = self.config.max_pages >= 1000
+        use_auto_stop = self.config.max_pages >= self.AUTO_STOP_MIN_PAGES
         scan_mode = "auto-detect end" if use_auto_stop else f"exact {self.config.max_pages} pages"
         logger.info(f"Scan mode: {scan_mode}")
 
+        # True when the page turn already waited for the next page to settle
+        page_settled = False
+
         for page_num in range(1, self.config.max_pages + 1):
             # Check for stop request
             if self.session.stop_requested:
@@ -235,29 +342,38 @@ class Scanner:
                 break
 
             # Check if window is still valid
-            if not self.window_manager.is_window_valid(kindle_hwnd):
+            if self.focus_monitor.window_closed:
                 logger.error("Kindle window closed during scan")
                 self.session.error("Kindle window was closed")
                 break
 
+            self._ensure_focus(kindle_hwnd)
+
+            page_start = self.clock.now()
+
             # Generate screenshot path
             img_path = self.page_capturer.generate_screenshot_path(
-                self.config.temp_dir, page_num
+                self.spool_dir, page_num
             )
 
             # Capture page
-            progress = 0.2 + (0.7 * page_num / self.config.max_pages)
             self._notify_progress(
                 f"Capturing page {page_num}...",
-                progress,
-                page_num - 1
+                self._capture_progress(),
+                page_num - 1,
+                page_number=page_num,
+                **self._throughput_fields()
             )
 
-            captured_path = self.page_capturer.capture_page(capture_region, img_path)
+            captured_path = self.page_capturer.capture_page(
+                capture_region, img_path, wait=not page_settled
+            )
 
             if captured_path is None:
+                if self.session.stop_requested:
+                    break
                 logger.warning(f"Failed to capture page {page_num}, retrying...")
-                time.sleep(1.0)
+                self.cancel_token.sleep(1.0)
                 # Retry once
                 captured_path = self.page_capturer.capture_page(capture_region, img_path)
                 if captured_path is None:
@@ -265,12 +381,17 @@ class Scanner:
                     continue
 
             # Add to session
-            self.session.add_page(captured_path)
+            self.session.recaptures += self.page_capturer.last_recaptures
+            self.session.add_page(
+                captured_path,
+                latency=self.clock.now() - page_start,
+                size_bytes=captured_path.stat().st_size
+            )
 
             # Check for duplicate (end of book detection - only in auto mode)
             if previous_img_path is not None and use_auto_stop:
-                is_duplicate, similarity = self.image_processor.compare_images(
-                    previous_img_path, captured_path
+                is_duplicate, similarity = self.image_processor.compare_frames(
+                    self.page_capturer.previous_gray, self.page_capturer.last_gray
                 )
 
                 logger.debug(f"Page {page_num} similarity: {similarity:.4f}")
@@ -279,52 +400,183 @@ class Scanner:
                     consecutive_duplicates += 1
                     logger.info(f"Duplicate detected (#{consecutive_duplicates}): page {page_num}")
 
+                    # The turn may not have been rendered yet: wait longer next time.
+                    # Only the first duplicate of a run backs off; a run is the
+                    # end of the book, not a slow render.
+                    if consecutive_duplicates == 1 and self.delay_tuner is not None:
+                        self.delay_tuner.record_bad_frame("duplicate frame")
+
                     if consecutive_duplicates >= max_consecutive_duplicates:
                         logger.info(f"Reached end of book (detected {consecutive_duplicates} duplicates)")
                         # Remove duplicate pages
                         for _ in range(consecutive_duplicates):
-                            if self.session.captured_images:
-                                removed = self.session.captured_images.pop()
+                            removed = self.session.remove_last_page()
+                            if removed is not None:
                                 removed.unlink(missing_ok=True)
-                                self.session.pages_captured -= 1
                         break
                 else:
                     consecutive_duplicates = 0
 
             # In exact page count mode, just log similarity without stopping
             elif previous_img_path is not None and not use_auto_stop:
-                is_duplicate, similarity = self.image_processor.compare_images(
-                    previous_img_path, captured_path
+                is_duplicate, similarity = self.image_processor.compare_frames(
+                    self.page_capturer.previous_gray, self.page_capturer.last_gray
                 )
                 logger.debug(f"Page {page_num} similarity: {similarity:.4f} (exact mode - continuing)")
+                consecutive_duplicates = consecutive_duplicates + 1 if is_duplicate else 0
+                if consecutive_duplicates == 1 and self.delay_tuner is not None:
+                    self.delay_tuner.record_bad_frame("duplicate frame")
 
             previous_img_path = captured_path
 
-            # Re-activate window every 5 pages to maintain focus
-            if page_num % 5 == 0:
-                logger.debug(f"Re-activating window at page {page_num} to maintain focus")
-                self.window_manager.activate_window(kindle_hwnd)
-                time.sleep(0.3)
+            if use_auto_stop:
+                # Turn and confirm the screen changed before capturing again
+                if not self._turn_page_checked(capture_region, kindle_hwnd):
+                    logger.info(f"Reached end of book ({self.config.max_noop_turns} "
+                                f"page turns had no visible effect)")
+                    break
+                page_settled = True
+            else:
+                self._turn_page(kindle_hwnd)
+
+                # Small delay between captures
+                self.cancel_token.sleep(0.2)
+
+    def _turn_page(self, kindle_hwnd):
+        """
+        Turn the page, re-activating the window and retrying once on failure.
 
-            # Turn page with retry
+        Args:
+            kindle_hwnd: Kindle window handle
+        """
+        page_turned = self.page_capturer.turn_page()
+        if not page_turned:
+            logger.warning("Failed to turn page, re-activating window and retrying...")
+            # Re-activate window to ensure focus
+            self.window_manager.activate_window(kindle_hwnd)
+            self.cancel_token.sleep(0.5)
             page_turned = self.page_capturer.turn_page()
             if not page_turned:
-                logger.warning("Failed to turn page, re-activating window and retrying...")
-                # Re-activate window to ensure focus
-                self.window_manager.activate_window(kindle_hwnd)
-                time.sleep(0.5)
-                page_turned = self.page_capturer.turn_page()
-                if not page_turned:
-                    logger.error("Failed to turn page after retry and window re-activation")
+                logger.error("Failed to turn page after retry and window re-activation")
+
+    def _turn_page_checked(self, capture_region, kindle_hwnd) -> bool:
+        """
+        Turn the page and confirm with a cheap probe diff that the screen changed.
 
-            # Small delay between captures
-            time.sleep(0.2)
+        A turn that leaves the screen unchanged is retried (after re-activating
+        the window, in case focus was lost). Nothing is captured or written for
+        no-op turns.
+
+        Args:
+            capture_region: Window region to capture
+            kindle_hwnd: Kindle window handle
+
+        Returns:
+            True if the page turned (or the change could not be checked),
+            False if max_noop_turns consecutive turns changed nothing
+        """
+        before = self.page_capturer.grab_probe(capture_region)
+
+        for attempt in range(1, self.config.max_noop_turns + 1):
+            self._turn_page(kindle_hwnd)
+            if self.page_capturer.wait_for_page(capture_region):
+                return True
+
+            after = self.page_capturer.grab_probe(capture_region)
+            if self.page_capturer.page_changed(before, after):
+                return True
+
+            self.session.noop_turns += 1
+            logger.info(f"Page turn had no visible effect ({attempt}/{self.config.max_noop_turns})")
+
+            if self.session.stop_requested:
+                return True
+
+            if attempt < self.config.max_noop_turns:
+                self._ensure_focus(kindle_hwnd)
+
+        return False
+
+    def _ensure_focus(self, kindle_hwnd):
+        """
+        Re-activate the Kindle window if the focus monitor saw it lose focus.
+
+        Args:
+            kindle_hwnd: Kindle window handle
+        """
+        if not self.focus_monitor.focus_lost:
+            return
+
+        logger.info("Kindle window lost focus, re-activating")
+        self.window_manager.activate_window(kindle_hwnd)
+        self.cancel_token.sleep(0.3)
+        self.session.focus_reactivations += 1
+        self.focus_monitor.acknowledge()
+
+    def _resolve_expected_pages(self) -> Optional[int]:
+        """
+        Determine how many pages this scan is expected to capture.
+
+        Returns:
+            The page target in exact mode, the page count of a previous
+            scan of the same book in auto mode, or None if unknown
+        """
+        if self.config.max_pages < self.AUTO_STOP_MIN_PAGES:
+            return self.config.max_pages
+
+        title = self.window_manager.kindle_title
+        entry = self.scan_history.get(title) if title else None
+        if entry:
+            return entry.get('pages')
+        return None
+
+    def _record_history(self):
+        """Remember the page count of a completed auto-mode scan for future ETAs."""
+        if self.session.state != ScanState.COMPLETE:
+            return  # Failed scans did not reach the end of the book
+        title = self.window_manager.kindle_title
+        if not title or self.config.max_pages < self.AUTO_STOP_MIN_PAGES:
+            return
+
+        self.scan_history.set(title, {
+            'pages': self.session.pages_captured,
+            'scanned_at': datetime.now().isoformat(timespec='seconds'),
+        })
+        self.scan_history.save()
+
+    def _capture_progress(self) -> Optional[float]:
+        """
+        Get capture progress for the progress bar.
+
+        Returns:
+            Progress value (0.2-0.9), or None if the total page count is unknown
+        """
+        expected = self.session.expected_pages
+        if not expected:
+            return None
+        return 0.2 + 0.7 * min(self.session.pages_captured / expected, 1.0)
+
+    def _projected_pdf_mb(self) -> Optional[float]:
+        """Project the final PDF size from the average captured page size."""
+        bytes_per_page = self.session.bytes_per_page
+        if bytes_per_page is None:
+            return None
+        page_total = max(self.session.expected_pages or 0, self.session.pages_captured)
+        return self.pdf_generator.project_pdf_size(bytes_per_page, page_total)
+
+    def _throughput_fields(self) -> dict:
+        """Throughput statistics attached to capture progress events."""
+        return {
+            'pages_per_minute': self.session.pages_per_minute,
+            'eta_seconds': self.session.eta_seconds,
+            'projected_pdf_mb': self._projected_pdf_mb(),
+        }
 
     def _generate_pdf(self):
-        """Generate PDF from captured images."""
+        """Generate PDF from captured images (or only finalize the spool if build_pdf is off)."""
         self.session.state = ScanState.PROCESSING
         self._notify_progress(
-            "Generating PDF...",
+            "Generating PDF..." if self.config.build_pdf else "Finalizing pages...",
             0.9,
             self.session.pages_captured
         )
@@ -348,17 +600,36 @@ class Scanner:
             self._notify_progress(error_msg, 0.0, 0)
             return
 
+        self._write_journal(valid_images)
+
+        if not self.config.build_pdf:
+            # The PDF is built later from the kept spool
+            self.session.complete(None)
+            return
+
         # Generate output filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_filename = f"kindle_scan_{timestamp}.pdf"
         output_path = self.config.output_path / output_filename
 
         # Create PDF
-        pdf_path = self.pdf_generator.create_pdf(
-            valid_images,
-            output_path,
-            title=f"Kindle Scan {timestamp}"
-        )
+        if self.config.export_profiles:
+            outputs = self.pdf_generator.export(
+                valid_images,
+                self.config.export_profiles,
+                self.config.output_path,
+                output_path.stem,
+                title=f"Kindle Scan {timestamp}"
+            )
+            # The session reports the first profile's PDF
+            first = outputs.get(self.config.export_profiles[0].name) if outputs else None
+            pdf_path = first[0] if first else None
+        else:
+            pdf_path = self.pdf_generator.create_pdf(
+                valid_images,
+                output_path,
+                title=f"Kindle Scan {timestamp}"
+            )
 
         if pdf_path is None:
             error_msg = "Failed to create PDF"
@@ -384,8 +655,39 @@ class Scanner:
             except Exception as e:
                 logger.warning(f"Failed to delete temp file {file}: {e}")
 
+        # Kept spools get their own directory so the next scan does not clear them
+        if self.config.keep_spool:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.spool_dir = self.config.temp_dir / f"session_{timestamp}"
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Keeping page spool in {self.spool_dir}")
+
+    def _write_journal(self, image_paths: List[Path]):
+        """
+        Write the spool journal used to rebuild the PDF offline.
+
+        Args:
+            image_paths: Pages in final order
+        """
+        if not self.config.keep_spool or not image_paths:
+            return
+        write_journal(
+            self.spool_dir,
+            image_paths,
+            title=self.window_manager.kindle_title,
+            direction=self.config.direction.value,
+            resolution=self.config.resolution.value,
+            pdf_quality=self.config.pdf_quality,
+            crop_rect=self.auto_cropper.rect if self.auto_cropper else None,
+            complete=not self.session.stop_requested
+        )
+
     def _cleanup(self):
         """Clean up temporary files."""
+        if self.config.keep_spool:
+            logger.info(f"Page spool kept for offline rebuild: {self.spool_dir}")
+            return
+
         try:
             if self.config.temp_dir.exists():
                 for file in self.config.temp_dir.glob("*.png"):
@@ -397,18 +699,26 @@ class Scanner:
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
 
-    def _notify_progress(self, message: str, progress: Optional[float], page_count: int):
+    def _notify_progress(self, message: str, progress: Optional[float], page_count: int,
+                         stage: Optional[ProgressStage] = None, **fields):
         """
-        Notify progress callback.
+        Publish progress to the progress bus and callback.
 
         Args:
             message: Status message
             progress: Progress value (0.0-1.0) or None
             page_count: Current page count
+            stage: Workflow stage (derived from session state if None)
+            **fields: Additional ProgressEvent fields (page_number, countdown)
         """
+        if stage is None:
+            stage = self.STAGE_BY_STATE.get(self.session.state, ProgressStage.PREPARING)
+
+        event = self.progress_bus.publish(stage, message, progress, page_count, **fields)
+
         if self.progress_callback:
             try:
-                self.progress_callback(message, progress, page_count)
+                self.progress_callback(event)
             except Exception as e:
                 logger.error(f"Error in progress callback: {e}")
 
@@ -426,4 +736,15 @@ class Scanner:
             'error_message': self.session.error_message,
             'output_pdf': str(self.session.output_pdf_path) if self.session.output_pdf_path else None,
             'duration': self.session.duration,
+            'expected_pages': self.session.expected_pages,
+            'pages_per_minute': self.session.pages_per_minute,
+            'avg_page_latency': self.session.avg_page_latency,
+            'bytes_per_page': self.session.bytes_per_page,
+            'projected_pdf_mb': self._projected_pdf_mb(),
+            'eta_seconds': self.session.eta_seconds,
+            'noop_turns': self.session.noop_turns,
+            'focus_reactivations': self.session.focus_reactivations,
+            'recaptures': self.session.recaptures,
+            'capture_delay': self.delay_tuner.delay if self.delay_tuner else self.config.capture_speed,
+            'crop_rect': self.auto_cropper.rect if self.auto_cropper else None,
         }
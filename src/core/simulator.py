@@ -0,0 +1,164 @@
+"""
+Simulated Kindle window and book for running the scan workflow without
+Windows, Kindle or a display.
+
+Combined with a VirtualClock, a full scan of thousands of pages runs in
+seconds, which makes timing policies and end-of-book rules measurable.
+"""
+import random
+from typing import Optional, Tuple
+
+from ..models.config import Direction
+from ..utils.clock import Clock
+from ..utils.lazy_import import lazy_import
+from ..utils.logger import logger
+from .capture_source import CaptureSource
+from .page_capturer import PageCapturer
+
+Image = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+
+
+class SimulatedBook(CaptureSource):
+    """
+    Capture source that renders synthetic book pages.
+
+    Each page is drawn deterministically from its page number. A page turn
+    starts a render that completes render_delay seconds later on the clock;
+    screenshots taken before that show a half-drawn page. Turning past the
+    last page has no effect, as in the Kindle app.
+    """
+
+    def __init__(self, page_count: int, clock: Optional[Clock] = None,
+                 direction: Direction = Direction.WESTERN,
+                 page_size: Tuple[int, int] = (120, 160), render_delay: float = 0.3,
+                 seed: int = 0):
+        """
+        Initialize simulated book.
+
+        Args:
+            page_count: Number of pages in the book
+            clock: Clock that defines render timing (real time if None)
+            direction: Page turn direction the book responds to
+            page_size: Rendered page size (width, height)
+            render_delay: Seconds from a page turn until the page is fully drawn
+            seed: Seed for page content
+        """
+        self.page_count = page_count
+        self.clock = clock or Clock()
+        self.page_size = page_size
+        self.render_delay = render_delay
+        self.seed = seed
+        self.next_keys = {
+            PageCapturer.DIRECTION_KEYS[direction],
+            PageCapturer.DIRECTION_KEYS_ALT[direction],
+        }
+
+        self.current_page = 1
+        self.turned_at = self.clock.now() - render_delay
+        self.screenshots = 0
+        self.key_presses = 0
+        self._cached_page: Optional[int] = None
+        self._cached_image = None
+
+    def _render(self, page_number: int) -> "Image.Image":
+        """Draw a page (cached for the current page)."""
+        if self._cached_page == page_number:
+            return self._cached_image
+
+        width, height = self.page_size
+        image = Image.new('RGB', self.page_size, (255, 255, 255))
+        draw = ImageDraw.Draw(image)
+        rng = random.Random(self.seed * 1_000_003 + page_number)
+
+        # Text-like lines of varying length between wide margins
+        margin_x = width // 8
+        y = height // 10
+        while y < height - height // 8:
+            line_width = rng.randint(width // 3, width - 2 * margin_x)
+            draw.rectangle((margin_x, y, margin_x + line_width, y + 2), fill=(20, 20, 20))
+            y += rng.randint(6, 10)
+
+        # Page number footer
+        draw.text((width // 2 - 8, height - height // 12), str(page_number), fill=(0, 0, 0))
+
+        self._cached_page = page_number
+        self._cached_image = image
+        return image
+
+    def screenshot(self, region: Tuple[int, int, int, int]) -> "Image.Image":
+        self.screenshots += 1
+        page = self._render(self.current_page)
+        left, top, width, height = region
+        if (width, height) != self.page_size:
+            page = page.resize((width, height))
+
+        # Still rendering: only the top part of the page is drawn
+        elapsed = self.clock.now() - self.turned_at
+        if elapsed < self.render_delay:
+            drawn_rows = int(height * elapsed / self.render_delay)
+            partial = Image.new('RGB', (width, height), (255, 255, 255))
+            if drawn_rows > 0:
+                partial.paste(page.crop((0, 0, width, drawn_rows)), (0, 0))
+            return partial
+
+        return page.copy()
+
+    def press(self, key: str):
+        self.key_presses += 1
+        if key in self.next_keys and self.current_page < self.page_count:
+            self.current_page += 1
+            self.turned_at = self.clock.now()
+
+    def click(self, x: int, y: int):
+        pass
+
+
+class SimulatedWindowManager:
+    """Window manager for a single simulated Kindle window that always has focus."""
+
+    KINDLE_HWND = 1
+
+    # No WinEvent hooks: FocusMonitor falls back to polling
+    supports_win_events = False
+
+    def __init__(self, book: SimulatedBook, title: str = "Kindle for PC - Simulated Book"):
+        """
+        Initialize simulated window manager.
+
+        Args:
+            book: Simulated book shown in the window
+            title: Window title (used as the book key for scan history)
+        """
+        self.book = book
+        self.kindle_hwnd: Optional[int] = None
+        self.kindle_title: Optional[str] = None
+        self.title = title
+        self.activations = 0
+
+    def find_kindle_window(self) -> Optional[int]:
+        self.kindle_hwnd = self.KINDLE_HWND
+        self.kindle_title = self.title
+        logger.info(f"Found simulated Kindle window: {self.title}")
+        return self.kindle_hwnd
+
+    def activate_window(self, hwnd: int = None) -> bool:
+        self.activations += 1
+        return True
+
+    def get_client_rect(self, hwnd: int = None, margin_top: int = 0, margin_bottom: int = 0,
+                        margin_left: int = 0, margin_right: int = 0) -> Optional[Tuple[int, int, int, int]]:
+        width, height = self.book.page_size
+        return (0, 0, width, height)
+
+    def maximize_window(self, hwnd: int = None) -> bool:
+        return True
+
+    def restore_window(self, hwnd: int = None) -> bool:
+        return True
+
+    def get_foreground_window(self) -> Optional[int]:
+        return self.KINDLE_HWND
+
+    def is_window_valid(self, hwnd: int = None) -> bool:
+        return True
@@ -0,0 +1,68 @@
+"""
+Kept page spools and their journals, used to rebuild PDFs without rescanning.
+"""
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import List, Tuple
+
+from ..utils.json_store import JsonStore
+from ..utils.logger import logger
+
+JOURNAL_NAME = "journal.json"
+
+# Spooled page file names: page_0001_20240101_120000.png
+PAGE_PATTERN = re.compile(r"page_(\d+)_")
+
+
+def write_journal(spool_dir: Path, pages: List[Path], **metadata) -> bool:
+    """
+    Record the pages of a session (in order) next to the spooled files.
+
+    Args:
+        spool_dir: Directory holding the spooled pages
+        pages: Page images in final page order
+        **metadata: Extra JSON-serializable session details (title, crop, ...)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    store = JsonStore(spool_dir / JOURNAL_NAME)
+    store.set('created', datetime.now().isoformat(timespec='seconds'))
+    for key, value in metadata.items():
+        store.set(key, value)
+    store.set('pages', [path.name for path in pages])
+    return store.save()
+
+
+def load_spool(path: Path) -> Tuple[List[Path], dict]:
+    """
+    Load the page list of a spool.
+
+    Args:
+        path: Spool directory or its journal file. A directory without a
+            journal is read by page number from the file names.
+
+    Returns:
+        Tuple of (page images in order, journal metadata)
+    """
+    path = Path(path)
+    journal_path = path if path.is_file() else path / JOURNAL_NAME
+    spool_dir = journal_path.parent
+
+    if journal_path.exists():
+        store = JsonStore(journal_path)
+        metadata = {key: value for key, value in store.data.items() if key != 'pages'}
+        pages = [spool_dir / name for name in store.get('pages', [])]
+        missing = [page for page in pages if not page.exists()]
+        if missing:
+            logger.warning(f"{len(missing)} journal pages are missing from {spool_dir}")
+            pages = [page for page in pages if page.exists()]
+        return pages, metadata
+
+    numbered = []
+    for page in spool_dir.glob("page_*.png"):
+        match = PAGE_PATTERN.match(page.name)
+        if match:
+            numbered.append((int(match.group(1)), page.name, page))
+    return [page for _, _, page in sorted(numbered)], {}
@@ -1,14 +1,16 @@
 """
 Windows window management for Kindle app control.
 """
-import win32gui
-import win32con
-import win32api
 from typing import Optional, Tuple
-import time
 
+from ..utils.cancellation import CancellationToken
+from ..utils.lazy_import import lazy_import
 from ..utils.logger import logger
 
+win32gui = lazy_import("win32gui")
+win32con = lazy_import("win32con")
+win32api = lazy_import("win32api")
+
 
 class WindowManager:
     """Manages Windows window operations for Kindle app."""
@@ -24,9 +26,19 @@ class WindowManager:
         "Auto-Scanner",
     ]
 
-    def __init__(self):
-        """Initialize window manager."""
+    # Focus changes can be tracked with WinEvent hooks (see FocusMonitor)
+    supports_win_events = True
+
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        """
+        Initialize window manager.
+
+        Args:
+            cancel_token: Token that interrupts waits when the scan is stopped
+        """
+        self.cancel_token = cancel_token or CancellationToken()
         self.kindle_hwnd: Optional[int] = None
+        self.kindle_title: Optional[str] = None
         self.original_rect: Optional[Tuple[int, int, int, int]] = None
         self.was_maximized: bool = False
 
@@ -62,7 +74,7 @@ class WindowManager:
             return None
 
         # Return the first matching window
-        self.kindle_hwnd = windows[0][0]
+        self.kindle_hwnd, self.kindle_title = windows[0]
         logger.info(f"Found Kindle window: {windows[0][1]} (HWND: {self.kindle_hwnd})")
         return self.kindle_hwnd
 
@@ -89,11 +101,11 @@ class WindowManager:
             if placement[1] == win32con.SW_SHOWMINIMIZED:
                 self.was_maximized = placement[1] == win32con.SW_SHOWMAXIMIZED
                 win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                time.sleep(0.3)
+                self.cancel_token.sleep(0.3)
 
             # Set as foreground window
             win32gui.SetForegroundWindow(hwnd)
-            time.sleep(0.2)
+            self.cancel_token.sleep(0.2)
 
             logger.debug(f"Activated window HWND: {hwnd}")
             return True
@@ -187,7 +199,7 @@ class WindowManager:
                 self.original_rect = self.get_window_rect(hwnd)
 
             win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
-            time.sleep(0.5)  # Wait for window to maximize
+            self.cancel_token.sleep(0.5)  # Wait for window to maximize
 
             logger.debug("Window maximized")
             return True
@@ -232,6 +244,19 @@ class WindowManager:
             logger.error(f"Error restoring window: {e}")
             return False
 
+    def get_foreground_window(self) -> Optional[int]:
+        """
+        Get the window that currently has focus.
+
+        Returns:
+            Foreground window handle, or None if error
+        """
+        try:
+            return win32gui.GetForegroundWindow()
+        except Exception as e:
+            logger.error(f"Error getting foreground window: {e}")
+            return None
+
     def is_window_valid(self, hwnd: int = None) -> bool:
         """
         Check if window handle is still valid.
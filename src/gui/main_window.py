@@ -17,6 +17,9 @@ from .progress_display import ProgressDisplay
 class MainWindow:
     """Main application window."""
 
+    # Progress bus polling interval (10 Hz)
+    PROGRESS_INTERVAL_MS = 100
+
     def __init__(self):
         """Initialize main window."""
         self.root = tk.Tk()
@@ -28,6 +31,7 @@ class MainWindow:
         self.scanner: Scanner = None
         self.keyboard_handler: KeyboardHandler = None
         self.is_scanning = False
+        self._last_progress_sequence = 0
 
         self._create_widgets()
         self._setup_keyboard_handler()
@@ -132,6 +136,8 @@ class MainWindow:
                 direction=self.settings_panel.get_direction(),
                 resolution=self.settings_panel.get_resolution(),
                 capture_speed=self.settings_panel.get_speed(),
+                auto_tune_delay=self.settings_panel.get_auto_tune(),
+                auto_crop=self.settings_panel.get_auto_crop(),
                 max_pages=max_pages,
                 output_path=Path("output"),
                 temp_dir=Path("temp"),
@@ -161,11 +167,16 @@ class MainWindow:
             self.keyboard_handler.start()
 
             # Start scan
-            success = self.scanner.start_scan(progress_callback=self._on_progress_update)
+            success = self.scanner.start_scan()
 
             if not success:
                 self._on_scan_complete()
                 messagebox.showerror("Error", "Failed to start scan")
+                return
+
+            # Start polling progress
+            self._last_progress_sequence = 0
+            self.root.after(self.PROGRESS_INTERVAL_MS, self._poll_progress)
 
         except Exception as e:
             logger.exception("Error starting scan")
@@ -181,32 +192,32 @@ class MainWindow:
         self.scanner.stop_scan()
         self.stop_button.config(state="disabled")
 
-    def _on_progress_update(self, message: str, progress: float, page_count: int):
-        """
-        Handle progress update from scanner.
-
-        Args:
-            message: Status message
-            progress: Progress value (0.0-1.0) or None
-            page_count: Current page count
+    def _poll_progress(self):
         """
-        # Update UI in main thread
-        self.root.after(0, self._update_progress_ui, message, progress, page_count)
+        Apply the latest progress event and reschedule (runs in main thread).
 
-    def _update_progress_ui(self, message: str, progress: float, page_count: int):
+        Events published between two polls are coalesced: only the newest
+        one is drawn, so the UI cost is bounded by the polling rate rather
+        than by how often the scanner reports progress.
         """
-        Update progress UI (must be called from main thread).
+        if not self.is_scanning or self.scanner is None:
+            return
 
-        Args:
-            message: Status message
-            progress: Progress value (0.0-1.0) or None
-            page_count: Current page count
-        """
-        self.progress_display.update_progress(message, progress, page_count)
+        event = self.scanner.progress_bus.poll(self._last_progress_sequence)
+        if event is not None:
+            self._last_progress_sequence = event.sequence
+            self.progress_display.update_progress(event.message, event.progress, event.page_count)
+            if event.pages_per_minute is not None:
+                self.progress_display.update_stats(
+                    event.pages_per_minute, event.eta_seconds, event.projected_pdf_mb
+                )
 
         # Check if scan is complete
-        if self.scanner and self.scanner.session.is_finished:
+        if self.scanner.session.is_finished:
             self._on_scan_complete()
+            return
+
+        self.root.after(self.PROGRESS_INTERVAL_MS, self._poll_progress)
 
     def _on_scan_complete(self):
         """Handle scan completion."""
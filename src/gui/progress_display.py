@@ -20,6 +20,7 @@ class ProgressDisplay(ttk.Frame):
         # Variables
         self.status_var = tk.StringVar(value="Ready to scan")
         self.page_count_var = tk.StringVar(value="Pages: 0")
+        self.stats_var = tk.StringVar(value="")
 
         self._create_widgets()
 
@@ -52,6 +53,15 @@ class ProgressDisplay(ttk.Frame):
         )
         self.page_count_label.pack(pady=(5, 0))
 
+        # Throughput / ETA label
+        self.stats_label = ttk.Label(
+            self,
+            textvariable=self.stats_var,
+            font=("Arial", 8),
+            foreground="#999999"
+        )
+        self.stats_label.pack(pady=(2, 0))
+
     def update_progress(self, message: str, progress: float = None, page_count: int = 0):
         """
         Update progress display.
@@ -65,18 +75,40 @@ class ProgressDisplay(ttk.Frame):
         self.page_count_var.set(f"Pages: {page_count}")
 
         if progress is not None:
+            if str(self.progress_bar['mode']) == 'indeterminate':
+                self.progress_bar.stop()
+                self.progress_bar['mode'] = 'determinate'
             self.progress_bar['value'] = progress * 100
-        else:
-            # Indeterminate mode
+        elif str(self.progress_bar['mode']) != 'indeterminate':
+            # Indeterminate mode (start the animation only once)
             self.progress_bar['mode'] = 'indeterminate'
             self.progress_bar.start()
 
-        self.update_idletasks()
+    def update_stats(self, pages_per_minute: float = None, eta_seconds: float = None,
+                     projected_pdf_mb: float = None):
+        """
+        Update throughput statistics line.
+
+        Args:
+            pages_per_minute: Current capture rate
+            eta_seconds: Estimated seconds remaining
+            projected_pdf_mb: Projected PDF size in MB
+        """
+        parts = []
+        if pages_per_minute is not None:
+            parts.append(f"{pages_per_minute:.1f} pages/min")
+        if eta_seconds is not None:
+            minutes, seconds = divmod(int(eta_seconds), 60)
+            parts.append(f"ETA {minutes}:{seconds:02d}")
+        if projected_pdf_mb is not None:
+            parts.append(f"~{projected_pdf_mb:.0f} MB")
+        self.stats_var.set(" | ".join(parts))
 
     def reset(self):
         """Reset progress display."""
         self.status_var.set("Ready to scan")
         self.page_count_var.set("Pages: 0")
+        self.stats_var.set("")
         self.progress_bar['value'] = 0
         self.progress_bar['mode'] = 'determinate'
         self.progress_bar.stop()
@@ -26,6 +26,8 @@ class SettingsPanel(ttk.Frame):
         self.direction_var = tk.StringVar(value=Direction.JAPANESE.value)  # Default to Japanese
         self.resolution_var = tk.StringVar(value=Resolution.MEDIUM.value)
         self.speed_var = tk.DoubleVar(value=1.0)
+        self.auto_tune_var = tk.BooleanVar(value=False)
+        self.auto_crop_var = tk.BooleanVar(value=False)
         self.page_count_var = tk.IntVar(value=0)  # 0 = all pages
         self.custom_page_count_var = tk.StringVar(value="")  # Custom page count input
 
@@ -88,6 +90,13 @@ class SettingsPanel(ttk.Frame):
             command=self._on_setting_change
         ).pack(anchor="w")
 
+        ttk.Checkbutton(
+            resolution_frame,
+            text="Auto-crop margins (余白自動カット)",
+            variable=self.auto_crop_var,
+            command=self._on_setting_change
+        ).pack(anchor="w", pady=(5, 0))
+
         # Speed setting
         speed_frame = ttk.LabelFrame(self, text="Capture Speed (キャプチャ速度)", padding="5")
         speed_frame.grid(row=2, column=0, sticky="ew", pady=5)
@@ -107,6 +116,13 @@ class SettingsPanel(ttk.Frame):
                 command=self._on_setting_change
             ).pack(anchor="w")
 
+        ttk.Checkbutton(
+            speed_frame,
+            text="Auto-tune (自動調整) - learn the fastest safe delay",
+            variable=self.auto_tune_var,
+            command=self._on_setting_change
+        ).pack(anchor="w", pady=(5, 0))
+
         # Page count setting
         page_count_frame = ttk.LabelFrame(self, text="Scan Mode (スキャンモード)", padding="5")
         page_count_frame.grid(row=3, column=0, sticky="ew", pady=5)
@@ -240,6 +256,14 @@ class SettingsPanel(ttk.Frame):
         """Get selected capture speed."""
         return self.speed_var.get()
 
+    def get_auto_tune(self) -> bool:
+        """Get whether the capture delay is auto-tuned."""
+        return self.auto_tune_var.get()
+
+    def get_auto_crop(self) -> bool:
+        """Get whether page margins are cropped automatically."""
+        return self.auto_crop_var.get()
+
     def get_page_count(self) -> int:
         """Get selected page count (0 = all pages, -1 = use custom value)."""
         selected = self.page_count_var.get()
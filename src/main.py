@@ -1,6 +1,12 @@
 """
 AK Auto-Scanner PDF Tool - Main Entry Point
 """
+import time
+
+# Measured as early as possible so the startup log covers all imports
+_process_start = time.perf_counter()
+
+import multiprocessing
 import sys
 from pathlib import Path
 
@@ -22,6 +28,11 @@ def main():
     try:
         # Create and run main window
         app = MainWindow()
+        app.root.after_idle(
+            lambda: logger.info(
+                f"Window ready in {(time.perf_counter() - _process_start) * 1000:.0f} ms"
+            )
+        )
         app.run()
 
     except KeyboardInterrupt:
@@ -34,4 +45,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Parallel PDF builds start worker processes; needed for frozen executables
+    multiprocessing.freeze_support()
     main()
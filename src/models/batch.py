@@ -0,0 +1,72 @@
+"""
+Models for queued multi-book batch scans.
+"""
+import re
+from dataclasses import dataclass, asdict, field
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+from .config import ScanConfig
+
+
+class JobState(Enum):
+    """Lifecycle of a batch job."""
+    QUEUED = "queued"
+    WAITING = "waiting"        # Waiting for the book to be opened in Kindle
+    CAPTURING = "capturing"
+    BUILDING = "building"      # PDF build running (overlaps the next capture)
+    COMPLETE = "complete"
+    CANCELLED = "cancelled"
+    ERROR = "error"
+    SKIPPED = "skipped"        # Batch stopped before the job started
+
+
+@dataclass
+class BatchJob:
+    """One book in a batch."""
+
+    name: str
+    config: ScanConfig = field(default_factory=ScanConfig)
+
+    # Kindle window title (substring) to wait for before capturing; None starts at once
+    book_title: Optional[str] = None
+
+    @property
+    def slug(self) -> str:
+        """File-system safe job name used for the workspace and PDF."""
+        slug = re.sub(r'[<>:"/\\|?*\x00-\x1f]+', "_", self.name).strip(" .")
+        return slug or "job"
+
+
+@dataclass
+class JobResult:
+    """Outcome and throughput of a batch job."""
+
+    name: str
+    state: JobState = JobState.QUEUED
+    workspace: Optional[Path] = None
+    output_pdf: Optional[Path] = None
+    pages: int = 0
+    error_message: Optional[str] = None
+
+    # Seconds spent waiting for the book, capturing and building the PDF
+    wait_seconds: float = 0.0
+    capture_seconds: float = 0.0
+    build_seconds: float = 0.0
+
+    @property
+    def pages_per_minute(self) -> Optional[float]:
+        """Capture throughput of the job."""
+        if self.pages == 0 or self.capture_seconds <= 0:
+            return None
+        return self.pages / self.capture_seconds * 60.0
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        data = asdict(self)
+        data['state'] = self.state.value
+        data['workspace'] = str(self.workspace) if self.workspace else None
+        data['output_pdf'] = str(self.output_pdf) if self.output_pdf else None
+        data['pages_per_minute'] = self.pages_per_minute
+        return data
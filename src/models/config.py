@@ -1,10 +1,12 @@
 """
 Configuration models and enums for the AK Auto-Scanner.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
+
+from .export import EncoderSettings, ExportProfile
 
 
 class Direction(Enum):
@@ -20,6 +22,17 @@ class Resolution(Enum):
     HIGH = "high"      # Ultra - maximize window + full screen capture
 
 
+class DuplicateDetection(Enum):
+    """How consecutive pages are compared for duplicate detection."""
+    TILES = "tiles"  # Tile change map - fast, ignores volatile UI regions
+    SSIM = "ssim"    # Full-frame structural similarity
+
+
+# Kindle's location/progress bar at the bottom of the window, as
+# (top, bottom, left, right) fractions of the captured frame
+KINDLE_LOCATION_BAR = (0.93, 1.0, 0.0, 1.0)
+
+
 class ScanState(Enum):
     """Scanner state machine states."""
     IDLE = "idle"
@@ -43,19 +56,53 @@ class ScanConfig:
 
     # Timing
     capture_speed: float = 1.0  # Seconds between captures (0.5, 1.0, 2.0)
+    auto_tune_delay: bool = False  # Learn the delay from observed settle times
 
     # Duplicate detection
+    duplicate_detection: DuplicateDetection = DuplicateDetection.TILES
     similarity_threshold: float = 0.95  # SSIM threshold for detecting duplicates
+    duplicate_max_changed: float = 0.01  # Changed tile fraction still counted as a duplicate
+    # Regions whose changes are ignored by the tile change map (fractions of the frame)
+    volatile_regions: List[Tuple[float, float, float, float]] = field(
+        default_factory=lambda: [KINDLE_LOCATION_BAR]
+    )
+
+    # Quality gate (recapture half-drawn, fading or blank frames before saving)
+    quality_gate: bool = True
+    max_recaptures: int = 2  # Recaptures per page before a rejected frame is kept
 
     # Limits
     max_pages: int = 10000  # Maximum pages to scan before auto-stop
+    max_noop_turns: int = 3  # Consecutive page turns with no visible change = end of book
 
     # Paths
     output_path: Optional[Path] = None  # PDF output path
     temp_dir: Optional[Path] = None     # Temporary screenshot directory
+    keep_spool: bool = False            # Keep captured pages (and a journal) for offline rebuilds
+    build_pdf: bool = True              # False: stop after capture, the PDF is built from the spool later
+    state_dir: Optional[Path] = None    # Data kept between scans (delay profiles, history); default output_path
 
     # PDF settings
     pdf_quality: int = 95  # JPEG quality for PDF images (1-100)
+    pdf_lossless: bool = False  # Embed pages losslessly (PNG data as is) instead of as JPEG
+    pdf_codec: str = "opencv"   # Lossy page encoder: opencv, pillow (JPEG) or jpeg2000
+    pdf_subsampling: str = "420"  # JPEG chroma subsampling: 444, 422 or 420
+    pdf_progressive: bool = False  # Progressive JPEG
+    pdf_optimize: bool = False     # Optimized JPEG Huffman tables (smaller, slower)
+    pdf_mrc: bool = False       # Text mask over a low-resolution background for pages with text
+    pdf_ssim_floor: float = 0.0  # Per-page JPEG quality: lowest (up to pdf_quality) keeping this SSIM (0 = off)
+    pdf_page_numbers: bool = False  # Draw page numbers on the PDF pages (as text, not into the images)
+    pdf_page_labels: bool = False   # Record page numbers as PDF page labels
+    pdf_linearize: bool = False     # Linearized PDFs (fast web view) for large scans
+    pdf_object_streams: bool = False  # PDF 1.5 object streams and compressed xref (not with pdf_linearize)
+    pdf_processes: int = 0  # Worker processes building PDF chunks in parallel (0: single process)
+    # Several PDFs from one pass (e.g. archival and mobile); replaces the single PDF when set
+    export_profiles: List[ExportProfile] = field(default_factory=list)
+
+    # Auto-crop (content bounding box measured on the first pages)
+    auto_crop: bool = False
+    auto_crop_sample_pages: int = 5  # Pages measured before the crop is locked
+    auto_crop_padding: int = 16      # Pixels kept around the detected content
 
     # Capture region margins (negative values to expand, positive to shrink)
     margin_top: int = -20     # Top margin adjustment in pixels
@@ -69,12 +116,60 @@ class ScanConfig:
             self.output_path = Path("output")
         if self.temp_dir is None:
             self.temp_dir = Path("temp")
+        if self.state_dir is None:
+            self.state_dir = self.output_path
 
         # Ensure paths are Path objects
         if not isinstance(self.output_path, Path):
             self.output_path = Path(self.output_path)
         if not isinstance(self.temp_dir, Path):
             self.temp_dir = Path(self.temp_dir)
+        if not isinstance(self.state_dir, Path):
+            self.state_dir = Path(self.state_dir)
+
+    @property
+    def pdf_encoder(self) -> EncoderSettings:
+        """Lossy page encoder settings."""
+        return EncoderSettings(codec=self.pdf_codec, subsampling=self.pdf_subsampling,
+                               progressive=self.pdf_progressive, optimize=self.pdf_optimize)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScanConfig":
+        """
+        Build a configuration from plain values (e.g. a JSON config file).
+
+        Enum options are given by value ("japanese", "medium", "tiles") and
+        paths as strings. Missing options keep their defaults.
+
+        Args:
+            data: Option names mapped to values
+
+        Returns:
+            Scan configuration
+
+        Raises:
+            ValueError: If an option is unknown or an enum value is invalid
+        """
+        known = {f.name for f in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown config options: {', '.join(unknown)}")
+
+        values = dict(data)
+        enums = {'direction': Direction, 'resolution': Resolution,
+                 'duplicate_detection': DuplicateDetection}
+        for name, enum in enums.items():
+            if name in values and not isinstance(values[name], enum):
+                values[name] = enum(values[name])
+        if 'volatile_regions' in values:
+            values['volatile_regions'] = [tuple(region) for region in values['volatile_regions']]
+        if 'export_profiles' in values:
+            values['export_profiles'] = [
+                profile if isinstance(profile, ExportProfile) else ExportProfile.from_dict(profile)
+                for profile in values['export_profiles']
+            ]
+
+        return cls(**values)
 
     def validate(self) -> list[str]:
         """
@@ -91,10 +186,53 @@ class ScanConfig:
         if self.similarity_threshold < 0.0 or self.similarity_threshold > 1.0:
             errors.append("Similarity threshold must be between 0.0 and 1.0")
 
+        if self.duplicate_max_changed < 0.0 or self.duplicate_max_changed > 1.0:
+            errors.append("Duplicate max changed fraction must be between 0.0 and 1.0")
+
+        for region in self.volatile_regions:
+            top, bottom, left, right = region
+            if not (0.0 <= top < bottom <= 1.0 and 0.0 <= left < right <= 1.0):
+                errors.append(f"Invalid volatile region: {region}")
+
+        if not self.build_pdf and not self.keep_spool:
+            errors.append("Skipping the PDF build requires keep_spool")
+
+        if self.max_recaptures < 0:
+            errors.append("Max recaptures must not be negative")
+
         if self.max_pages < 1:
             errors.append("Max pages must be at least 1")
 
+        if self.max_noop_turns < 1:
+            errors.append("Max no-op turns must be at least 1")
+
         if self.pdf_quality < 1 or self.pdf_quality > 100:
             errors.append("PDF quality must be between 1 and 100")
 
+        if self.pdf_ssim_floor < 0 or self.pdf_ssim_floor >= 1:
+            errors.append("PDF SSIM floor must be at least 0 and below 1")
+
+        errors.extend(self.pdf_encoder.validate("PDF encoder"))
+
+        if self.pdf_processes < 0:
+            errors.append("PDF processes must not be negative")
+
+        if self.pdf_lossless and self.pdf_mrc:
+            errors.append("PDF MRC encoding cannot be combined with lossless")
+
+        if self.pdf_linearize and self.pdf_object_streams:
+            errors.append("PDF object streams cannot be combined with linearization")
+
+        for profile in self.export_profiles:
+            errors.extend(profile.validate())
+        names = [profile.name for profile in self.export_profiles]
+        if len(set(names)) != len(names):
+            errors.append("Export profile names must be unique")
+
+        if self.auto_crop_sample_pages < 1:
+            errors.append("Auto-crop sample pages must be at least 1")
+
+        if self.auto_crop_padding < 0:
+            errors.append("Auto-crop padding must not be negative")
+
         return errors
@@ -0,0 +1,142 @@
+"""
+Output profiles for exporting several PDFs from one set of pages.
+"""
+from dataclasses import dataclass, fields
+
+# Pixel density the captured pages are laid out at (PDFWriter's default)
+SOURCE_DPI = 100.0
+
+# Lossy page image encoders (see core/image_codec.py) and JPEG chroma subsampling modes
+CODECS = ("opencv", "pillow", "jpeg2000")
+CHROMA_SUBSAMPLING = ("444", "422", "420")
+
+
+@dataclass
+class EncoderSettings:
+    """Encoder backend and settings for lossy page images."""
+
+    codec: str = "opencv"       # opencv or pillow (JPEG), jpeg2000 (JPX, PDF 1.5)
+    subsampling: str = "420"    # JPEG chroma subsampling (colour pages)
+    progressive: bool = False   # Progressive JPEG
+    optimize: bool = False      # Optimized JPEG Huffman tables (smaller, slower)
+
+    def validate(self, context: str = "Encoder") -> list[str]:
+        """
+        Validate encoder settings.
+
+        Args:
+            context: Prefix of the error messages
+
+        Returns:
+            List of error messages (empty if valid)
+        """
+        errors = []
+        if self.codec not in CODECS:
+            errors.append(f"{context}: codec must be one of {', '.join(CODECS)}")
+        if self.subsampling not in CHROMA_SUBSAMPLING:
+            errors.append(f"{context}: chroma subsampling must be one of {', '.join(CHROMA_SUBSAMPLING)}")
+        return errors
+
+
+@dataclass
+class ExportProfile:
+    """One PDF produced by a fan-out export (e.g. archival or mobile)."""
+
+    name: str                 # File name suffix: <book>_<name>.pdf
+    quality: int = 95         # JPEG quality (1-100)
+    grayscale: bool = False   # Encode in grayscale
+    lossless: bool = False    # Embed losslessly instead of as JPEG
+    mrc: bool = False         # Text mask over a low-resolution background (pages with text)
+    ssim_floor: float = 0.0   # Lowest JPEG quality (up to quality) keeping this SSIM (0 = off)
+    codec: str = "opencv"     # Lossy encoder: opencv, pillow or jpeg2000
+    subsampling: str = "420"  # JPEG chroma subsampling: 444, 422 or 420
+    progressive: bool = False  # Progressive JPEG
+    optimize: bool = False    # Optimized JPEG Huffman tables
+    dpi: float = SOURCE_DPI   # Output pixel density; below SOURCE_DPI downsamples the pages
+    split_pages: int = 0      # Pages per volume (0 = one file)
+
+    @property
+    def scale(self) -> float:
+        """Resize factor applied to the captured pages."""
+        return self.dpi / SOURCE_DPI
+
+    @property
+    def encoder(self) -> EncoderSettings:
+        """Lossy encoder settings of the profile."""
+        return EncoderSettings(codec=self.codec, subsampling=self.subsampling,
+                               progressive=self.progressive, optimize=self.optimize)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExportProfile":
+        """
+        Build a profile from plain values (e.g. a JSON config file).
+
+        Args:
+            data: Field names mapped to values
+
+        Returns:
+            Export profile
+
+        Raises:
+            ValueError: If a field is unknown
+        """
+        known = {f.name for f in fields(cls)}
+        unknown = sorted(set(data) - known)
+        if unknown:
+            raise ValueError(f"Unknown export profile options: {', '.join(unknown)}")
+        return cls(**data)
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "ExportProfile":
+        """
+        Parse a command line profile such as "mobile:quality=60,dpi=72,grayscale".
+
+        Args:
+            spec: Name, optionally followed by ":" and comma-separated
+                options (key=value, or a bare key for boolean options)
+
+        Returns:
+            Export profile
+
+        Raises:
+            ValueError: If the spec is malformed
+        """
+        name, _, options = spec.partition(":")
+        values = {'name': name.strip()}
+        types = {f.name: f.type for f in fields(cls)}
+        for option in filter(None, (part.strip() for part in options.split(","))):
+            key, has_value, value = option.partition("=")
+            if key not in types or key == 'name':
+                raise ValueError(f"Unknown export profile option: {key}")
+            if types[key] is bool:
+                values[key] = value.lower() in ("1", "true", "yes") if has_value else True
+            elif types[key] is int:
+                values[key] = int(value)
+            elif types[key] is str:
+                values[key] = value
+            else:
+                values[key] = float(value)
+        return cls(**values)
+
+    def validate(self) -> list[str]:
+        """
+        Validate profile values.
+
+        Returns:
+            List of error messages (empty if valid)
+        """
+        errors = []
+        if not self.name:
+            errors.append("Export profile name must not be empty")
+        if self.quality < 1 or self.quality > 100:
+            errors.append(f"Export profile '{self.name}': quality must be between 1 and 100")
+        if self.dpi <= 0:
+            errors.append(f"Export profile '{self.name}': DPI must be positive")
+        if self.split_pages < 0:
+            errors.append(f"Export profile '{self.name}': split pages must not be negative")
+        if self.ssim_floor < 0 or self.ssim_floor >= 1:
+            errors.append(f"Export profile '{self.name}': SSIM floor must be at least 0 and below 1")
+        errors.extend(self.encoder.validate(f"Export profile '{self.name}'"))
+        if self.lossless and self.mrc:
+            errors.append(f"Export profile '{self.name}': MRC cannot be combined with lossless")
+        return errors
@@ -0,0 +1,60 @@
+"""
+Structured progress events published by the scanner.
+"""
+from dataclasses import dataclass, asdict
+from enum import Enum
+from typing import Optional
+
+
+class ProgressStage(Enum):
+    """Workflow stage a progress event belongs to."""
+    COUNTDOWN = "countdown"
+    PREPARING = "preparing"
+    CAPTURING = "capturing"
+    STOPPING = "stopping"
+    PROCESSING = "processing"
+    COMPLETE = "complete"
+    CANCELLED = "cancelled"
+    ERROR = "error"
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Snapshot of scan progress at one point in time."""
+
+    # Monotonically increasing per bus (gaps mean superseded events were dropped)
+    sequence: int
+
+    stage: ProgressStage
+    message: str
+
+    # Progress value (0.0-1.0) or None when the total is unknown
+    progress: Optional[float] = None
+
+    # Pages captured so far
+    page_count: int = 0
+
+    # Page currently being captured (capturing stage only)
+    page_number: Optional[int] = None
+
+    # Seconds remaining before capture starts (countdown stage only)
+    countdown: Optional[int] = None
+
+    # Throughput statistics (capturing stage only, None until known)
+    pages_per_minute: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    projected_pdf_mb: Optional[float] = None
+
+    # Clock time (monotonic seconds) when the event was published
+    timestamp: float = 0.0
+
+    @property
+    def is_terminal(self) -> bool:
+        """Check if this event ends the session."""
+        return self.stage in (ProgressStage.COMPLETE, ProgressStage.CANCELLED, ProgressStage.ERROR)
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        data = asdict(self)
+        data['stage'] = self.stage.value
+        return data
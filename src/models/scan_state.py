@@ -1,11 +1,13 @@
 """
 Scan state management for tracking progress and state.
 """
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from ..utils.clock import Clock
 from .config import ScanState
 
 
@@ -28,12 +30,35 @@ class ScanSession:
     output_pdf_path: Optional[Path] = None
     captured_images: list[Path] = field(default_factory=list)
 
+    # Page turns that did not change the screen
+    noop_turns: int = 0
+
+    # Times Kindle was re-activated after losing focus
+    focus_reactivations: int = 0
+
+    # Frames rejected by the quality gate and captured again
+    recaptures: int = 0
+
     # Error handling
     error_message: Optional[str] = None
 
     # Control flags
     stop_requested: bool = False
 
+    # Clock used for throughput statistics
+    clock: Clock = field(default_factory=Clock, repr=False)
+
+    # Throughput statistics over the most recent pages
+    stats_window: int = 20
+    expected_pages: Optional[int] = None  # Page target or previous run of the same book
+    total_bytes: int = 0
+    _page_times: deque = field(default_factory=deque, repr=False)
+    _page_latencies: deque = field(default_factory=deque, repr=False)
+    _page_bytes: deque = field(default_factory=deque, repr=False)
+    _page_records: list = field(default_factory=list, repr=False)  # (size, latency) per page
+    _latency_sum: float = field(default=0.0, repr=False)
+    _window_bytes: int = field(default=0, repr=False)
+
     def start(self):
         """Mark session as started."""
         self.state = ScanState.PREPARING
@@ -42,9 +67,18 @@ class ScanSession:
         self.captured_images = []
         self.stop_requested = False
         self.error_message = None
-
-    def complete(self, pdf_path: Path):
-        """Mark session as completed."""
+        self.noop_turns = 0
+        self.focus_reactivations = 0
+        self.total_bytes = 0
+        self._page_times.clear()
+        self._page_latencies.clear()
+        self._page_bytes.clear()
+        self._page_records = []
+        self._latency_sum = 0.0
+        self._window_bytes = 0
+
+    def complete(self, pdf_path: Optional[Path]):
+        """Mark session as completed (pdf_path is None if the PDF is built later)."""
         self.state = ScanState.COMPLETE
         self.end_time = datetime.now()
         self.output_pdf_path = pdf_path
@@ -60,12 +94,96 @@ class ScanSession:
         self.end_time = datetime.now()
         self.error_message = message
 
-    def add_page(self, image_path: Path):
-        """Add a captured page to the session."""
+    def add_page(self, image_path: Path, latency: Optional[float] = None,
+                 size_bytes: Optional[int] = None):
+        """
+        Add a captured page to the session.
+
+        Args:
+            image_path: Path of the captured page
+            latency: Seconds spent capturing the page (settle + grab + save)
+            size_bytes: Size of the saved page in bytes
+        """
         self.captured_images.append(image_path)
         self.current_page_path = image_path
         self.pages_captured += 1
 
+        size_bytes = size_bytes or 0
+        self.total_bytes += size_bytes
+        self._page_records.append((size_bytes, latency))
+
+        # Rolling window sums are updated incrementally so reads stay O(1)
+        self._page_times.append(self.clock.now())
+        self._page_bytes.append(size_bytes)
+        self._window_bytes += size_bytes
+        if latency is not None:
+            self._page_latencies.append(latency)
+            self._latency_sum += latency
+
+        if len(self._page_times) > self.stats_window:
+            self._page_times.popleft()
+            self._window_bytes -= self._page_bytes.popleft()
+        if len(self._page_latencies) > self.stats_window:
+            self._latency_sum -= self._page_latencies.popleft()
+
+    def remove_last_page(self) -> Optional[Path]:
+        """
+        Remove the most recently captured page from the session.
+
+        Returns:
+            Path of the removed page, or None if there are no pages
+        """
+        if not self.captured_images:
+            return None
+
+        removed = self.captured_images.pop()
+        self.pages_captured -= 1
+        size_bytes, latency = self._page_records.pop() if self._page_records else (0, None)
+        self.total_bytes -= size_bytes
+
+        # The page is the newest entry of the rolling windows (unless they are empty)
+        if self._page_times:
+            self._page_times.pop()
+            self._window_bytes -= self._page_bytes.pop()
+        if latency is not None and self._page_latencies:
+            self._latency_sum -= self._page_latencies.pop()
+
+        self.current_page_path = self.captured_images[-1] if self.captured_images else None
+        return removed
+
+    @property
+    def pages_per_minute(self) -> Optional[float]:
+        """Capture rate over the rolling window (None until two pages are captured)."""
+        if len(self._page_times) < 2:
+            return None
+        elapsed = self._page_times[-1] - self._page_times[0]
+        if elapsed <= 0:
+            return None
+        return (len(self._page_times) - 1) * 60.0 / elapsed
+
+    @property
+    def avg_page_latency(self) -> Optional[float]:
+        """Average seconds spent capturing a page over the rolling window."""
+        if not self._page_latencies:
+            return None
+        return self._latency_sum / len(self._page_latencies)
+
+    @property
+    def bytes_per_page(self) -> Optional[float]:
+        """Average saved page size in bytes over the rolling window."""
+        if not self._page_bytes:
+            return None
+        return self._window_bytes / len(self._page_bytes)
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds until the expected page count is reached."""
+        rate = self.pages_per_minute
+        if self.expected_pages is None or rate is None:
+            return None
+        remaining = max(self.expected_pages - self.pages_captured, 0)
+        return remaining * 60.0 / rate
+
     @property
     def duration(self) -> Optional[float]:
         """Get session duration in seconds."""
@@ -0,0 +1,54 @@
+"""
+Cancellable waits for the scan workflow.
+"""
+import threading
+from typing import Optional
+
+from .clock import Clock
+
+
+class CancellationToken:
+    """
+    Shared stop signal that interrupts waits as soon as it is cancelled.
+
+    Every delay in the scan workflow goes through sleep() instead of
+    time.sleep(), so Stop/ESC takes effect within milliseconds rather than
+    after the current capture delay, countdown step or retry pause.
+    """
+
+    def __init__(self, clock: Optional[Clock] = None):
+        """
+        Initialize token (not cancelled).
+
+        Args:
+            clock: Clock used for waits (real time if None)
+        """
+        self.clock = clock or Clock()
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Cancel: wake all current waits and make future waits return at once."""
+        self._event.set()
+
+    def reset(self):
+        """Clear the cancelled state for a new session."""
+        self._event.clear()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Whether cancel() was called since the last reset()."""
+        return self._event.is_set()
+
+    def sleep(self, seconds: float) -> bool:
+        """
+        Wait for the given time unless cancelled first.
+
+        Args:
+            seconds: Time to wait
+
+        Returns:
+            True if the wait was cut short by cancellation, False otherwise
+        """
+        if seconds <= 0:
+            return self._event.is_set()
+        return self.clock.wait(self._event, seconds)
@@ -0,0 +1,84 @@
+"""
+Clock abstraction so timing logic can run on real or virtual time.
+"""
+import threading
+import time
+
+
+class Clock:
+    """Real monotonic time."""
+
+    def now(self) -> float:
+        """
+        Get the current time.
+
+        Returns:
+            Monotonic time in seconds
+        """
+        return time.monotonic()
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        """
+        Wait until the event is set or the time elapses.
+
+        Args:
+            event: Event that ends the wait early
+            seconds: Maximum time to wait
+
+        Returns:
+            True if the event is set, False if the time elapsed
+        """
+        return event.wait(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    Simulated time that advances instantly.
+
+    wait() moves the clock forward by the requested time without sleeping,
+    so workflows with long delays (countdowns, capture delays, retries) run
+    as fast as the CPU allows while still observing consistent timestamps.
+    """
+
+    def __init__(self, start: float = 0.0):
+        """
+        Initialize virtual clock.
+
+        Args:
+            start: Initial time in seconds
+        """
+        self._now = start
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        """Get the current virtual time."""
+        with self._lock:
+            return self._now
+
+    def advance(self, seconds: float):
+        """
+        Move virtual time forward.
+
+        Args:
+            seconds: Time to advance (negative values are ignored)
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._now += seconds
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        """
+        Advance virtual time instead of sleeping.
+
+        Args:
+            event: Event that ends the wait early
+            seconds: Time to advance
+
+        Returns:
+            True if the event is set, False otherwise
+        """
+        if event.is_set():
+            return True
+        self.advance(seconds)
+        return event.is_set()
@@ -0,0 +1,80 @@
+"""
+Small JSON-backed key/value store for data kept between scans.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from .logger import logger
+
+
+class JsonStore:
+    """Key/value store persisted as a single JSON object."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize store and load existing data.
+
+        Args:
+            path: JSON file path (created on first save)
+        """
+        self.path = Path(path)
+        self.data: dict = {}
+        self._load()
+
+    def _load(self):
+        """Load data from disk (a missing or corrupt file yields an empty store)."""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.data = data
+            else:
+                logger.warning(f"Ignoring malformed store {self.path}")
+        except Exception as e:
+            logger.warning(f"Failed to load {self.path}: {e}")
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """
+        Get a stored value.
+
+        Args:
+            key: Entry key
+            default: Value returned if key is missing
+
+        Returns:
+            Stored value or default
+        """
+        return self.data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """
+        Set a value (call save() to persist).
+
+        Args:
+            key: Entry key
+            value: JSON-serializable value
+        """
+        self.data[key] = value
+
+    def save(self) -> bool:
+        """
+        Write the store to disk atomically.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save {self.path}: {e}")
+            return False
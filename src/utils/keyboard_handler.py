@@ -1,10 +1,13 @@
 """
 Keyboard event handler for emergency stop (ESC key).
 """
-from pynput import keyboard
 from typing import Callable
 import threading
 
+from .lazy_import import lazy_import
+
+keyboard = lazy_import("pynput.keyboard")
+
 
 class KeyboardHandler:
     """Handles keyboard events for emergency stop."""
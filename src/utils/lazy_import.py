@@ -0,0 +1,77 @@
+"""
+Deferred imports for heavy third-party dependencies.
+
+OpenCV, scikit-image, NumPy, PyAutoGUI and pywin32 together take several
+hundred milliseconds to import. Modules that need them bind a LazyModule
+at import time and the real import happens on first attribute access,
+which is normally the first scan rather than application startup.
+"""
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Dict
+
+from .logger import logger
+
+
+# Seconds spent importing each lazily loaded module (filled on first use)
+IMPORT_TIMES: Dict[str, float] = {}
+
+_import_lock = threading.Lock()
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        """
+        Initialize lazy module proxy.
+
+        Args:
+            name: Fully qualified module name (e.g. "cv2", "skimage.metrics")
+        """
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> ModuleType:
+        """Import the wrapped module if it has not been imported yet."""
+        module = self.__dict__['_lazy_module']
+        if module is not None:
+            return module
+
+        with _import_lock:
+            module = self.__dict__['_lazy_module']
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                elapsed = time.perf_counter() - start
+                IMPORT_TIMES[self.__name__] = elapsed
+                logger.debug(f"Lazy import of {self.__name__} took {elapsed * 1000:.1f} ms")
+                self.__dict__['_lazy_module'] = module
+
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the wrapped module has been imported."""
+        return self.__dict__['_lazy_module'] is not None
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Return a proxy for a module that is imported on first use.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        LazyModule proxy
+    """
+    return LazyModule(name)
@@ -1,5 +1,8 @@
 """
 Logging configuration for the AK Auto-Scanner.
+
+Importing this module has no side effects: the shared ``logger`` has no
+handlers until ``setup_logger()`` is called by an entry point.
 """
 import logging
 import sys
@@ -7,13 +10,16 @@ from pathlib import Path
 from datetime import datetime
 
 
-def setup_logger(name: str = "kindle_scanner", log_dir: Path = None) -> logging.Logger:
+def setup_logger(name: str = "kindle_scanner", log_dir: Path = None,
+                 console_stream=None) -> logging.Logger:
     """
     Set up a logger with console and file handlers.
 
     Args:
         name: Logger name
         log_dir: Directory for log files (default: output/logs)
+        console_stream: Stream for console output (default: stdout; command
+            line tools that write results to stdout pass stderr)
 
     Returns:
         Configured logger instance
@@ -23,7 +29,7 @@ def setup_logger(name: str = "kindle_scanner", log_dir: Path = None) -> logging.
     logger.setLevel(logging.DEBUG)
 
     # Prevent duplicate handlers
-    if logger.handlers:
+    if any(not isinstance(h, logging.NullHandler) for h in logger.handlers):
         return logger
 
     # Create formatters
@@ -36,7 +42,7 @@ def setup_logger(name: str = "kindle_scanner", log_dir: Path = None) -> logging.
     )
 
     # Console handler (INFO and above)
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(console_stream or sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
@@ -57,5 +63,6 @@ def setup_logger(name: str = "kindle_scanner", log_dir: Path = None) -> logging.
     return logger
 
 
-# Default logger instance
-logger = setup_logger()
+# Default logger instance (configured by setup_logger at startup)
+logger = logging.getLogger("kindle_scanner")
+logger.addHandler(logging.NullHandler())
@@ -0,0 +1,31 @@
+"""
+Shared fixtures: scanners wired to a simulated Kindle window and book.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.scanner import Scanner
+from src.core.simulator import SimulatedBook, SimulatedWindowManager
+from src.models.config import Resolution, ScanConfig
+
+
+@pytest.fixture
+def make_scanner(tmp_path):
+    """Factory building a scanner for a simulated book, with all files under tmp_path."""
+
+    def make(book: SimulatedBook, clock, window_manager=None, **config_overrides) -> Scanner:
+        config = ScanConfig(
+            resolution=Resolution.LOW,
+            output_path=tmp_path / "output",
+            temp_dir=tmp_path / "temp",
+            state_dir=tmp_path / "state",
+            **config_overrides
+        )
+        return Scanner(config, window_manager=window_manager or SimulatedWindowManager(book),
+                       capture_source=book, clock=clock)
+
+    return make
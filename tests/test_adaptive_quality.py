@@ -0,0 +1,43 @@
+"""
+Per-page quality search: the class cache follows the quality pages need.
+"""
+import cv2
+import numpy as np
+
+from src.core import adaptive_quality
+from src.core.adaptive_quality import PROBE_EVERY, QualityCache, adaptive_jpeg, page_class
+
+FLOOR = 0.95
+
+
+def text_page() -> np.ndarray:
+    page = np.full((400, 300), 245, np.uint8)
+    for line in range(12):
+        cv2.putText(page, "lorem ipsum dolor", (20, 40 + line * 28), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.6, 20, 1, cv2.LINE_AA)
+    return page
+
+
+def test_class_quality_comes_back_down():
+    page = text_page()
+    key = page_class(page)
+
+    searched = QualityCache()
+    adaptive_jpeg(page, 95, FLOOR, searched)
+    needed = searched.get(key)
+
+    # A hard page of the class raised its quality to the maximum
+    cache = QualityCache()
+    cache.record(key, 95, searched=True)
+    for _ in range(PROBE_EVERY * 20):
+        adaptive_jpeg(page, 95, FLOOR, cache)
+
+    assert needed < 95
+    assert needed <= cache.get(key) < 95
+    assert cache.probes > 0
+
+
+def test_undecodable_encode_fails_cleanly(monkeypatch):
+    monkeypatch.setattr(adaptive_quality.cv2, "imdecode", lambda *args: None, raising=False)
+
+    assert adaptive_jpeg(text_page(), 95, FLOOR, QualityCache()) is None
@@ -0,0 +1,66 @@
+"""
+Auto-crop geometry: scaled crop rectangles and volatile regions of cropped pages.
+"""
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.auto_crop import AutoCropper
+from src.core.change_map import ChangeMap
+from src.models.config import KINDLE_LOCATION_BAR
+
+
+def locked_cropper(gray: np.ndarray) -> AutoCropper:
+    cropper = AutoCropper(sample_pages=1, padding=3)
+    assert cropper.observe(gray, Path("page_0001.png"))
+    return cropper
+
+
+@pytest.mark.parametrize("content", [(4, 100, 7, 93), (5, 102, 4, 100), (13, 131, 9, 101)])
+def test_scaled_samples_match_locked_pages(content):
+    top, bottom, left, right = content
+    gray = np.full((160, 120), 255, np.uint8)
+    gray[top:bottom, left:right] = 0
+    cropper = locked_cropper(gray)
+    scale = 1.5
+
+    # Sample pages: scaled whole frames cropped afterwards
+    scaled = cv2.resize(gray, (int(120 * scale), int(160 * scale)))
+    sample = cropper.crop(scaled, scale)
+    # Locked pages: cropped first, then scaled
+    height, width = cropper.crop(gray).shape
+    locked_shape = (int(height * scale), int(width * scale))
+
+    assert sample.shape == locked_shape
+
+
+def test_volatile_region_follows_crop():
+    change_map = ChangeMap(volatile_regions=[KINDLE_LOCATION_BAR])
+    frame_shape = (1000, 800)
+
+    # Crop keeping part of the location bar: it covers the same pixels as before
+    change_map.apply_crop((100, 950, 0, 800), frame_shape)
+    assert change_map.volatile_regions == [pytest.approx((830 / 850, 1.0, 0.0, 1.0))]
+
+    # Crop excluding the location bar: no page text is ignored any more
+    change_map.apply_crop((100, 900, 50, 750), frame_shape)
+    assert change_map.volatile_regions == []
+    assert change_map.stable_tiles == change_map.rows * change_map.cols
+
+
+def test_text_above_location_bar_is_not_ignored():
+    change_map = ChangeMap(volatile_regions=[KINDLE_LOCATION_BAR])
+    page = np.full((1000, 800), 255, np.uint8)
+    page[100:900, 100:700] = 0
+    changed = page.copy()
+    changed[860:900, 100:700] = 255  # Last line of text, inside the bottom 7% of the crop
+
+    crop = (90, 910, 90, 710)
+    change_map.apply_crop(crop, page.shape)
+    top, bottom, left, right = crop
+    fraction = change_map.changed_fraction(change_map.fingerprint(page[top:bottom, left:right]),
+                                           change_map.fingerprint(changed[top:bottom, left:right]))
+
+    assert fraction > 0.0
@@ -0,0 +1,95 @@
+"""
+Stop latency: stop_scan() must end the scan thread within about 100 ms,
+wherever the workflow is waiting.
+"""
+import threading
+import time
+
+from src.core.simulator import SimulatedBook
+from src.models.config import ScanState
+from src.utils.clock import VirtualClock
+
+STOP_LATENCY = 0.1     # Allowed seconds from stop_scan() until the scan thread exits
+CAPTURE_SPEED = 7.5    # Capture delay no other wait in the workflow uses
+GRAB_SECONDS = 0.02    # Real time a gated screenshot takes
+
+
+class GatedClock(VirtualClock):
+    """
+    Virtual time, except that the first wait of a given length blocks in real time.
+
+    The workflow runs instantly up to the wait under test, which then
+    waits for real so stop_scan() can interrupt it.
+    """
+
+    def __init__(self, block_seconds: float):
+        super().__init__()
+        self.block_seconds = block_seconds
+        self.blocked = threading.Event()
+
+    def wait(self, event: threading.Event, seconds: float) -> bool:
+        if seconds == self.block_seconds and not self.blocked.is_set():
+            self.blocked.set()
+            return event.wait(seconds)
+        return super().wait(event, seconds)
+
+
+class SlowGrabBook(SimulatedBook):
+    """Simulated book whose screenshots take real time once past the first page."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.grabbing = threading.Event()
+
+    def grab_into(self, region, pool):
+        if self.current_page >= 2:
+            self.grabbing.set()
+            time.sleep(GRAB_SECONDS)
+        return super().grab_into(region, pool)
+
+
+def stop_and_time(scanner, started: threading.Event) -> float:
+    """Wait until the workflow reaches the point under test, stop it and time the exit."""
+    assert started.wait(10), "scan never reached the point under test"
+    start = time.perf_counter()
+    scanner.stop_scan()
+    scanner.scan_thread.join(timeout=5)
+    latency = time.perf_counter() - start
+    assert not scanner.scan_thread.is_alive()
+    return latency
+
+
+def test_stop_during_countdown(make_scanner):
+    clock = GatedClock(block_seconds=1)  # Countdown steps are 1 second waits
+    scanner = make_scanner(SimulatedBook(100, clock=clock), clock)
+    scanner.start_scan()
+
+    latency = stop_and_time(scanner, clock.blocked)
+
+    assert latency < STOP_LATENCY
+    assert scanner.session.state == ScanState.CANCELLED
+    assert scanner.session.pages_captured == 0
+
+
+def test_stop_during_capture_delay(make_scanner):
+    clock = GatedClock(block_seconds=CAPTURE_SPEED)
+    scanner = make_scanner(SimulatedBook(100, clock=clock), clock, capture_speed=CAPTURE_SPEED)
+    scanner.start_scan()
+
+    latency = stop_and_time(scanner, clock.blocked)
+
+    assert latency < STOP_LATENCY
+    assert scanner.session.state == ScanState.CANCELLED
+
+
+def test_stop_during_capture(make_scanner):
+    clock = VirtualClock()
+    book = SlowGrabBook(100, clock=clock)
+    scanner = make_scanner(book, clock)
+    scanner.start_scan()
+
+    latency = stop_and_time(scanner, book.grabbing)
+
+    assert latency < STOP_LATENCY
+    assert scanner.session.state == ScanState.CANCELLED
+    assert scanner.session.pages_captured >= 1
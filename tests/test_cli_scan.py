@@ -0,0 +1,60 @@
+"""
+Headless scan runner: exit codes and the summary record.
+"""
+import json
+import time
+
+from src.cli.scan import EXIT_COMPLETE, EXIT_ERROR, run_scan
+from src.core.simulator import SimulatedBook, SimulatedWindowManager
+from src.models.config import ScanState
+from src.utils.clock import VirtualClock
+
+CLOSED_AT_PAGE = 5
+
+
+class ClosingBook(SimulatedBook):
+    """Simulated book whose screenshots take real time, so the focus monitor can poll."""
+
+    def grab_into(self, region, pool):
+        if self.current_page >= CLOSED_AT_PAGE:
+            time.sleep(0.01)
+        return super().grab_into(region, pool)
+
+
+class ClosingWindowManager(SimulatedWindowManager):
+    """Simulated Kindle window that is closed on reaching a page."""
+
+    def is_window_valid(self, hwnd: int = None) -> bool:
+        return self.book.current_page < CLOSED_AT_PAGE
+
+
+def records(capsys) -> list:
+    """NDJSON records written so far; the last one is the summary."""
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[-1]["type"] == "summary"
+    return lines
+
+
+def test_complete_scan_exits_zero(make_scanner, capsys):
+    clock = VirtualClock()
+    scanner = make_scanner(SimulatedBook(10, clock=clock), clock)
+
+    assert run_scan(scanner) == EXIT_COMPLETE
+    assert records(capsys)[-1]["state"] == "complete"
+
+
+def test_closed_window_exits_with_error(make_scanner, capsys):
+    clock = VirtualClock()
+    book = ClosingBook(10_000, clock=clock)
+    scanner = make_scanner(book, clock, window_manager=ClosingWindowManager(book))
+
+    assert run_scan(scanner) == EXIT_ERROR
+    assert scanner.session.state == ScanState.ERROR
+    assert scanner.session.output_pdf_path is None
+
+    *progress, summary = records(capsys)
+    assert summary["exit_code"] == EXIT_ERROR
+    assert summary["state"] == "error"
+    assert summary["error_message"] == "Kindle window was closed"
+    assert progress[-1]["stage"] == "error"
+    assert not any(record["message"].startswith("Scan complete") for record in progress)
@@ -0,0 +1,54 @@
+"""
+Quality gate: rejected frames are accepted once a recapture shows them unchanged.
+"""
+import numpy as np
+
+from src.core.quality_gate import QualityGate
+from src.core.simulator import SimulatedBook
+from src.models.config import ScanState
+from src.utils.clock import VirtualClock
+
+BLANK_PAGES = {4, 9}
+
+
+class BlankPagesBook(SimulatedBook):
+    """Simulated book with some genuinely blank pages."""
+
+    def _render(self, page_number: int):
+        image = super()._render(page_number)
+        if page_number in BLANK_PAGES:
+            image = image.copy()
+            image.paste((255, 255, 255), (0, 0) + image.size)
+        return image
+
+
+def test_blank_frame_accepted_when_unchanged():
+    gate = QualityGate()
+    blank = np.full((160, 120), 250, np.uint8)
+
+    assert gate.check(blank) == QualityGate.BLANK_FRAME
+    assert gate.check(blank) is None
+
+
+def test_blank_frame_rejected_while_page_draws():
+    gate = QualityGate()
+    blank = np.full((160, 120), 250, np.uint8)
+    drawn = blank.copy()
+    drawn[20:140:8, 15:105] = 20
+
+    assert gate.check(blank) == QualityGate.BLANK_FRAME
+    assert gate.check(drawn) is None
+
+
+def test_blank_pages_cost_one_recapture(make_scanner):
+    clock = VirtualClock()
+    book = BlankPagesBook(12, clock=clock)
+    scanner = make_scanner(book, clock, auto_tune_delay=True)
+    start_delay = scanner.delay_tuner.delay
+    scanner.start_scan()
+    scanner.scan_thread.join(timeout=60)
+
+    assert scanner.session.state == ScanState.COMPLETE
+    assert scanner.session.pages_captured == 12
+    assert scanner.session.recaptures == len(BLANK_PAGES)
+    assert scanner.delay_tuner.delay <= start_delay  # Blank pages did not back off the delay
@@ -0,0 +1,90 @@
+"""
+Full scans of simulated books on a virtual clock: page counts and the
+end-of-book rules.
+"""
+from src.core.simulator import SimulatedBook
+from src.models.config import ScanState
+from src.utils.clock import VirtualClock
+
+MAX_DUPLICATES = 5  # Consecutive duplicates that end a scan (see Scanner._capture_loop)
+
+
+class DuplicateTailBook(SimulatedBook):
+    """
+    Simulated book whose last pages repeat the last content page.
+
+    Each repeat adds a small mark in the margin, so a page turn visibly
+    changes the screen but the captured page is a duplicate.
+    """
+
+    def __init__(self, content_pages: int, tail_pages: int, **kwargs):
+        super().__init__(content_pages + tail_pages, **kwargs)
+        self.content_pages = content_pages
+
+    def _render(self, page_number: int):
+        if page_number <= self.content_pages:
+            return super()._render(page_number)
+        image = super()._render(self.content_pages).copy()
+        self._cached_page = None  # The cache holds the unmarked page
+        pixels = image.load()
+        top = 20 + 5 * (page_number - self.content_pages)
+        for y in range(top, top + 4):
+            for x in range(1, 5):
+                pixels[x, y] = (0, 0, 0)
+        return image
+
+
+def run_scan(scanner):
+    scanner.start_scan()
+    scanner.scan_thread.join(timeout=60)
+    assert not scanner.scan_thread.is_alive()
+    return scanner.session
+
+
+def test_scan_captures_every_page(make_scanner):
+    clock = VirtualClock()
+    book = SimulatedBook(30, clock=clock)
+    session = run_scan(make_scanner(book, clock))
+
+    assert session.state == ScanState.COMPLETE
+    assert session.pages_captured == 30
+    assert session.output_pdf_path is not None and session.output_pdf_path.exists()
+
+
+def test_noop_turns_end_the_scan(make_scanner):
+    clock = VirtualClock()
+    book = SimulatedBook(12, clock=clock)
+    scanner = make_scanner(book, clock, max_noop_turns=3)
+    session = run_scan(scanner)
+
+    assert session.state == ScanState.COMPLETE
+    assert session.pages_captured == 12
+    assert session.noop_turns == 3
+
+
+def test_exact_page_count(make_scanner):
+    clock = VirtualClock()
+    book = SimulatedBook(30, clock=clock)
+    session = run_scan(make_scanner(book, clock, max_pages=10))
+
+    assert session.state == ScanState.COMPLETE
+    assert session.pages_captured == 10
+    assert book.current_page == 11
+
+
+def test_duplicates_end_the_scan_and_are_removed(make_scanner):
+    clock = VirtualClock()
+    book = DuplicateTailBook(15, tail_pages=10, clock=clock)
+    scanner = make_scanner(book, clock, build_pdf=False, keep_spool=True)
+    session = run_scan(scanner)
+
+    assert session.state == ScanState.COMPLETE
+    assert book.current_page == 15 + MAX_DUPLICATES  # Stopped before the tail ran out
+    assert session.noop_turns == 0
+    assert session.pages_captured == 15
+
+    # Only the content pages are left, on disk and in the statistics
+    spooled = sorted(scanner.spool_dir.glob("page_*"))
+    assert spooled == sorted(session.captured_images)
+    assert session.total_bytes == sum(path.stat().st_size for path in spooled)
+    assert session.bytes_per_page == session.total_bytes / 15